@@ -0,0 +1,70 @@
+"""Cold import time of the client modules.
+
+Runs each import in a fresh interpreter with -X importtime and reports the
+cumulative time, the slowest modules and whether the wallet signing stack
+(web3, eth_account) was loaded.
+
+    python -m benchmarks.bench_import [--runs 5] [--top 10]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+TARGETS = (
+    "orderly_evm_connector.rest",
+    "orderly_evm_connector.websocket.websocket_api",
+)
+HEAVY = ("web3", "eth_account", "eth_utils", "cryptography")
+
+
+def importtime(module):
+    """Return {module: cumulative microseconds} for a cold import of module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def collect(runs=3):
+    """Median cold import time in milliseconds per client module"""
+    return {
+        f"{module}_ms": statistics.median(importtime(module)[module] for _ in range(runs)) / 1000
+        for module in TARGETS
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in TARGETS:
+        runs = [importtime(module) for _ in range(args.runs)]
+        total = statistics.median(run[module] for run in runs)
+        print(f"{module}: {total / 1000:,.1f} ms (median of {args.runs})")
+        last = runs[-1]
+        loaded = [name for name in HEAVY if name in last]
+        print(f"  signing stack loaded: {', '.join(loaded) or 'none'}")
+        slowest = sorted(
+            (item for item in last.items() if item[0] != module),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for name, micros in slowest[: args.top]:
+            print(f"  {micros / 1000:10,.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
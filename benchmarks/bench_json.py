@@ -0,0 +1,105 @@
+"""Websocket frame decoding throughput per JSON codec.
+
+Decodes BBO and orderbook frames in the shape pushed by the public stream
+with every codec that is installed.
+
+    python -m benchmarks.bench_json [--seconds 2]
+"""
+import argparse
+import json
+import random
+import time
+
+from orderly_evm_connector.lib.json_codec import CODEC_PREFERENCE, get_codec
+
+
+def bbo_frame(rng):
+    bid = round(rng.uniform(59000, 61000), 1)
+    return json.dumps(
+        {
+            "topic": "PERP_BTC_USDC@bbo",
+            "ts": 1718000000000 + rng.randint(0, 10**6),
+            "data": {
+                "symbol": "PERP_BTC_USDC",
+                "ask": round(bid + 0.1, 1),
+                "askSize": round(rng.uniform(0.001, 5), 5),
+                "bid": bid,
+                "bidSize": round(rng.uniform(0.001, 5), 5),
+            },
+        }
+    )
+
+
+def orderbook_frame(rng, levels=100):
+    mid = rng.uniform(59000, 61000)
+    ts = 1718000000000 + rng.randint(0, 10**6)
+    return json.dumps(
+        {
+            "topic": "PERP_BTC_USDC@orderbook",
+            "ts": ts,
+            "data": {
+                "symbol": "PERP_BTC_USDC",
+                "ts": ts,
+                "asks": [[round(mid + i * 0.1, 1), round(rng.uniform(0.001, 5), 5)] for i in range(1, levels + 1)],
+                "bids": [[round(mid - i * 0.1, 1), round(rng.uniform(0.001, 5), 5)] for i in range(1, levels + 1)],
+            },
+        }
+    )
+
+
+def measure(loads, frames, seconds):
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for frame in frames:
+            loads(frame)
+        count += len(frames)
+    return count / (time.perf_counter() - start)
+
+
+def payloads():
+    rng = random.Random(7)
+    return {
+        "bbo": [bbo_frame(rng) for _ in range(1000)],
+        "orderbook": [orderbook_frame(rng) for _ in range(50)],
+    }
+
+
+def collect(seconds=1.0):
+    """{codec: {frame kind: frames decoded per second}} of the installed codecs"""
+    frames = payloads()
+    results = {}
+    for name in CODEC_PREFERENCE:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            continue
+        results[name] = {kind: measure(codec.loads, frames[kind], seconds) for kind in frames}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    payloads_by_kind = payloads()
+    codecs = []
+    for name in CODEC_PREFERENCE:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print(f"{name:10}: not installed")
+    for kind, frames in payloads_by_kind.items():
+        size = sum(len(frame) for frame in frames) / len(frames)
+        print(f"{kind} frames, {size:,.0f} bytes each")
+        baseline = None
+        for codec in reversed(codecs):
+            rate = measure(codec.loads, frames, args.seconds)
+            baseline = baseline or rate
+            print(f"  {codec.name:10}: {rate:12,.0f} frames/s  {rate / baseline:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Per call overhead of the REST response pipeline on large responses.
+
+Serves a get_orders(size=500) sized response from a local server and times
+the client against a copy of the previous pipeline, which read and decoded
+the body three times and built the debug log line whether or not DEBUG was
+enabled.
+
+    python -m benchmarks.bench_response [--seconds 2] [--rows 500]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from orderly_evm_connector.rest import Rest as Client
+
+
+def orders_response(rows, rng):
+    return {
+        "success": True,
+        "data": {
+            "meta": {"total": rows, "records_per_page": rows, "current_page": 1},
+            "rows": [
+                {
+                    "symbol": "PERP_BTC_USDC",
+                    "status": "FILLED",
+                    "side": rng.choice(["BUY", "SELL"]),
+                    "order_id": 10_000_000 + i,
+                    "user_id": 12345,
+                    "price": round(rng.uniform(59000, 61000), 1),
+                    "type": "LIMIT",
+                    "quantity": round(rng.uniform(0.001, 1), 4),
+                    "amount": None,
+                    "visible": 1,
+                    "executed": 0.01,
+                    "total_fee": 0.36,
+                    "fee_asset": "USDC",
+                    "client_order_id": f"c-{i}",
+                    "average_executed_price": 60000.1,
+                    "created_time": 1718000000000 + i,
+                    "updated_time": 1718000000500 + i,
+                    "reduce_only": False,
+                }
+                for i in range(rows)
+            ],
+        },
+        "timestamp": 1718000000000,
+    }
+
+
+class PreviousPipelineClient(Client):
+    """The response handling before the body was read once"""
+
+    async def _perform_request(self, http_method, url_path, params):
+        response = await self._dispatch_request(http_method, params)
+        self.logger.debug("raw response from server:" + await response.text())
+        status_code = response.status
+        await response.text()
+        if status_code > 400:
+            raise RuntimeError(status_code)
+        try:
+            data = await response.json(loads=self.json_codec.loads)
+        except ValueError:
+            data = await response.text()
+        return response, data
+
+
+async def measure(client, seconds):
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        await client.get_orders(size=500)
+        count += 1
+    return (time.perf_counter() - start) / count
+
+
+async def run(seconds, rows):
+    body = json.dumps(orders_response(rows, random.Random(7))).encode()
+
+    async def orders(request):
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.add_routes([web.get("/v1/orders", orders)])
+    server = TestServer(app)
+    await server.start_server()
+    url = str(server.make_url("")).rstrip("/")
+    print(f"response: {rows} rows, {len(body):,} bytes")
+    try:
+        results = {}
+        for name, cls in [("previous", PreviousPipelineClient), ("current", Client)]:
+            client = cls(orderly_key="key", orderly_secret="ed25519:1", orderly_account_id="account")
+            client.orderly_endpoint = url
+            try:
+                await measure(client, 0.2)
+                results[name] = await measure(client, seconds)
+            finally:
+                await client.close()
+            print(f"  {name:9}: {results[name] * 1e6:10,.0f} us/call")
+        print(f"  saved    : {(results['previous'] - results['current']) * 1e6:10,.0f} us/call")
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.seconds, args.rows))
+
+
+if __name__ == "__main__":
+    main()
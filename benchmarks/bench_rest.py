@@ -0,0 +1,119 @@
+"""Signed REST requests per second through Rest at several concurrency levels.
+
+Every request is signed, sent to the local exchange simulator (running in its
+own process) and verified there. `concurrency` coroutines share one client
+and loop until the time is up; throughput, latency quantiles and errors are
+reported per request kind and concurrency level. The simulator runs one event
+loop, so at high concurrency the numbers are bounded by it as well; compare
+runs made on the same machine.
+
+    python -m benchmarks.bench_rest [--seconds 2] [--concurrency 1 8 32 128] [--latency 0]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from orderly_evm_connector.lib.transport import TransportConfig
+from orderly_evm_connector.rest import Rest as Client
+from benchmarks.simulator_process import SimulatorProcess
+
+CONCURRENCY = (1, 8, 32, 128)
+
+
+async def get_position(client):
+    await client.get_one_position_info("PERP_BTC_USDC")
+
+
+async def create_order(client):
+    # rests on the book, the simulator does not fill a bid below the mark price
+    await client.create_order(
+        "PERP_BTC_USDC", "LIMIT", "BUY", order_price=50000, order_quantity=0.001
+    )
+
+
+REQUESTS = {"get_position": get_position, "create_order": create_order}
+
+
+def quantile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def measure(client, request, concurrency, seconds):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await request(client)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_s": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) if latencies else None,
+        "p50_ms": quantile(latencies, 0.5),
+        "p99_ms": quantile(latencies, 0.99),
+        "errors": errors,
+    }
+
+
+async def run(server, seconds, concurrency_levels):
+    account_id, orderly_key, orderly_secret = await server.acall("add_account")
+    results = {}
+    for name, request in REQUESTS.items():
+        results[name] = {}
+        for concurrency in concurrency_levels:
+            client = Client(
+                orderly_key=orderly_key,
+                orderly_secret=orderly_secret,
+                orderly_account_id=account_id,
+                transport=TransportConfig(limit=max(100, concurrency)),
+            )
+            client.orderly_endpoint = server.rest_url
+            try:
+                await client.warmup(min(concurrency, 32))
+                await measure(client, request, concurrency, min(0.2, seconds))
+                results[name][str(concurrency)] = await measure(client, request, concurrency, seconds)
+            finally:
+                await client.close()
+    return results
+
+
+def collect(seconds=1.0, concurrency_levels=CONCURRENCY, latency=0.0):
+    """{request: {concurrency: {requests_per_s, mean_ms, p50_ms, p99_ms, errors}}}"""
+    with SimulatorProcess(latency=latency) as server:
+        return asyncio.run(run(server, seconds, concurrency_levels))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(CONCURRENCY))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added by the simulator")
+    args = parser.parse_args()
+
+    results = collect(args.seconds, args.concurrency, args.latency)
+    for name, rows in results.items():
+        print(name)
+        for concurrency, row in rows.items():
+            print(
+                f"  {concurrency:>4} concurrent: {row['requests_per_s']:10,.0f} requests/s"
+                f"  p50 {row['p50_ms']:7.2f} ms  p99 {row['p99_ms']:7.2f} ms  errors {row['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Ed25519 request signing throughput.
+
+Compares decoding the orderly secret on every call (the previous behaviour of
+`generate_signature`) against the cached `OrderlySigner`.
+
+    python -m benchmarks.bench_signing [--seconds 2]
+"""
+import argparse
+import base64
+import time
+
+import base58
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from orderly_evm_connector.lib.signer import get_signer
+from orderly_evm_connector.lib.utils import encode_key, get_timestamp
+
+MESSAGE = 'POST/v1/order{"symbol": "PERP_BTC_USDC", "order_type": "LIMIT", "side": "BUY", "order_price": 60000.1, "order_quantity": 0.01}'
+
+
+def sign_uncached(orderly_secret, message):
+    _orderly_private_key = Ed25519PrivateKey.from_private_bytes(
+        base58.b58decode(orderly_secret.split(":")[1])[0:32]
+    )
+    _timestamp = get_timestamp()
+    return str(_timestamp), base64.b64encode(
+        _orderly_private_key.sign(f"{_timestamp}{message}".encode("utf-8"))
+    ).decode("utf-8")
+
+
+def sign_cached(orderly_secret, message):
+    return get_signer(orderly_secret).sign_message(message)
+
+
+def measure(func, orderly_secret, seconds):
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            func(orderly_secret, MESSAGE)
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+def collect(seconds=1.0):
+    """Ed25519 signatures per second of the cached signer"""
+    orderly_secret = encode_key(Ed25519PrivateKey.generate().private_bytes_raw())
+    return {"ed25519_signatures_per_s": measure(sign_cached, orderly_secret, seconds)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    orderly_secret = encode_key(Ed25519PrivateKey.generate().private_bytes_raw())
+    before = measure(sign_uncached, orderly_secret, args.seconds)
+    after = measure(sign_cached, orderly_secret, args.seconds)
+    print(f"decode per call : {before:12,.0f} signatures/s")
+    print(f"cached signer   : {after:12,.0f} signatures/s")
+    print(f"speedup         : {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""EIP-712 wallet signing throughput.
+
+Compares building a Web3 instance and parsing the whole typed message on
+every call (the previous behaviour of `generate_wallet_signature`) against
+the cached `WalletSigner`, on a Withdraw message, then the EIP-712 hashing
+alone: eth_account parsing the types per message against the compiled
+Withdraw schema and cached domain separator.
+
+    python -m benchmarks.bench_wallet_signing [--seconds 2]
+"""
+import argparse
+import copy
+import os
+import time
+
+from eth_account._utils.structured_data import hashing
+from eth_account.messages import encode_structured_data
+from web3 import Web3
+
+from orderly_evm_connector.lib import eip712
+from orderly_evm_connector.lib.typed_messages import WITHDRAW, orderly_domain
+from orderly_evm_connector.lib.utils import generate_wallet_signature
+
+
+def withdraw_message(nonce):
+    return WITHDRAW.typed_message(
+        orderly_domain(421614, "0x1826B75e2ef249173FC735149AE4B8e9ea10abff"),
+        {
+            "brokerId": "woofi_pro",
+            "chainId": 421614,
+            "receiver": "0x1563915e194D8CfBA1943570603F7606A3115508",
+            "token": "USDC",
+            "amount": 1000000,
+            "withdrawNonce": nonce,
+            "timestamp": 1718000000000 + nonce,
+        },
+    )
+
+
+def generic(message):
+    """The same message with its own types dict, hashed through eth_account"""
+    return dict(message, types=copy.deepcopy(message["types"]))
+
+
+def sign_uncached(wallet_secret, message):
+    encoded_message = encode_structured_data(message)
+    return Web3().eth.account.sign_message(
+        encoded_message, private_key=f"0x{wallet_secret}"
+    ).signature.hex()
+
+
+def sign_cached(wallet_secret, message):
+    return generate_wallet_signature(wallet_secret, message=message)
+
+
+def hash_generic(_, message):
+    return hashing.hash_domain(message), hashing.hash_message(message)
+
+
+def hash_compiled(_, message):
+    return eip712.domain_separator(message), eip712.struct_hash(message)
+
+
+def measure(func, wallet_secret, messages, seconds):
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for message in messages:
+            func(wallet_secret, message)
+        count += len(messages)
+    return count / (time.perf_counter() - start)
+
+
+def collect(seconds=1.0):
+    """EIP-712 signatures and message hashes per second on Withdraw messages"""
+    wallet_secret = os.urandom(32).hex()
+    messages = [withdraw_message(nonce) for nonce in range(20)]
+    return {
+        "eip712_signatures_per_s": measure(sign_cached, wallet_secret, messages, seconds),
+        "eip712_hashes_per_s": measure(hash_compiled, None, messages, seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    wallet_secret = os.urandom(32).hex()
+    messages = [withdraw_message(nonce) for nonce in range(20)]
+    generic_messages = [generic(message) for message in messages]
+    before = measure(sign_uncached, wallet_secret, generic_messages, args.seconds)
+    after = measure(sign_cached, wallet_secret, messages, args.seconds)
+    print(f"Web3() per call : {before:12,.0f} signatures/s")
+    print(f"cached signer   : {after:12,.0f} signatures/s")
+    print(f"speedup         : {after / before:12.2f}x")
+    before = measure(hash_generic, None, generic_messages, args.seconds)
+    after = measure(hash_compiled, None, messages, args.seconds)
+    print(f"eth_account hash: {before:12,.0f} messages/s")
+    print(f"compiled schema : {after:12,.0f} messages/s")
+    print(f"speedup         : {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Websocket frames per second and memory per subscribed symbol.
+
+The exchange simulator (in its own process) pushes pre-serialized bbo and
+100 level orderbook frames as fast as it can to one subscriber, which is
+either an AsyncWebsocketManager or the threaded OrderlySocketManager. The rate
+is measured from the first to the last frame handed to on_message.
+
+Memory per symbol is the growth traced by tracemalloc while an
+OrderBookManager subscribes to the orderbookupdate topic of `symbols`
+symbols and builds their books from the requested snapshots, divided by the
+number of symbols.
+
+    python -m benchmarks.bench_websocket [--frames 20000] [--symbols 100]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import threading
+import time
+import tracemalloc
+
+from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
+from orderly_evm_connector.websocket.orderbook import OrderBookManager
+from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
+from orderly_evm_connector.websocket.websocket_api import WebsocketPublicAPIClient
+from benchmarks.bench_json import bbo_frame, orderbook_frame
+from benchmarks.simulator_process import SimulatorProcess
+
+ACCOUNT_ID = "benchmark"
+TIMEOUT = 60
+
+
+def frames():
+    rng = random.Random(7)
+    return {
+        "bbo": bbo_frame(rng),
+        "orderbook": orderbook_frame(rng),
+    }
+
+
+def subscribe_message(topic):
+    return json.dumps({"id": "benchmark", "event": "subscribe", "topic": topic})
+
+
+class FrameCounter(object):
+    """Counts topic frames and remembers when the first and the last arrived"""
+
+    def __init__(self, count):
+        self.count = count
+        self.received = 0
+        self.first = None
+        self.last = None
+
+    def add(self):
+        now = time.perf_counter()
+        if self.first is None:
+            self.first = now
+        self.received += 1
+        self.last = now
+        return self.received >= self.count
+
+    @property
+    def rate(self):
+        if self.received < 2:
+            return None
+        return (self.received - 1) / (self.last - self.first)
+
+
+async def async_manager_rate(server, topic, frame, count):
+    counter = FrameCounter(count)
+    done = asyncio.Event()
+
+    async def on_message(manager, message):
+        if "topic" in message and counter.add():
+            done.set()
+
+    manager = AsyncWebsocketManager(
+        f"{server.public_ws_url}/{ACCOUNT_ID}",
+        on_message=on_message,
+        on_open=lambda manager: manager.send_message(subscribe_message(topic)),
+    )
+    task = asyncio.create_task(manager.run())
+    try:
+        await server.acall("stream", topic, frame, count, 1)
+        await asyncio.wait_for(done.wait(), TIMEOUT)
+    finally:
+        await manager.close()
+        task.cancel()
+    return counter.rate
+
+
+def socket_manager_rate(server, topic, frame, count):
+    counter = FrameCounter(count)
+    done = threading.Event()
+
+    def on_message(manager, message):
+        if message.startswith('{"topic"') and counter.add():
+            done.set()
+
+    manager = OrderlySocketManager(
+        f"{server.public_ws_url}/{ACCOUNT_ID}",
+        on_message=on_message,
+        on_open=lambda manager: manager.send_message(subscribe_message(topic)),
+    )
+    manager.daemon = True
+    manager.start()
+    try:
+        server.call("stream", topic, frame, count, 1)
+        done.wait(TIMEOUT)
+    finally:
+        manager.close()
+        manager.join(5)
+    return counter.rate
+
+
+async def memory_per_symbol(server, symbols):
+    async def ignore(manager, message):
+        pass
+
+    books = OrderBookManager()
+    client = WebsocketPublicAPIClient(orderly_account_id=ACCOUNT_ID, on_message=ignore)
+    client.websocket_url = f"{server.public_ws_url}/{ACCOUNT_ID}"
+    books.attach(client)
+    await asyncio.wait_for(client.run(), TIMEOUT)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for symbol in symbols:
+            books.subscribe(symbol)
+        deadline = time.monotonic() + TIMEOUT
+        while sum(1 for book in books.books.values() if book.best_bid()) < len(symbols):
+            if time.monotonic() > deadline:
+                raise TimeoutError("order book snapshots did not arrive")
+            await asyncio.sleep(0.01)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+        await client.stop_async()
+    return used / len(symbols)
+
+
+def collect(frames_per_run=20000, symbols=100):
+    """{frames_per_s: {manager: {frame kind: rate}}, memory: {symbols, bytes_per_symbol}}"""
+    results = {"frames_per_s": {"AsyncWebsocketManager": {}, "OrderlySocketManager": {}}}
+    # no server pings while streaming, the subscription is sent from on_open
+    with SimulatorProcess(ping_interval=3600) as server:
+        for kind, frame in frames().items():
+            topic = f"PERP_BTC_USDC@{kind}"
+            results["frames_per_s"]["AsyncWebsocketManager"][kind] = asyncio.run(
+                async_manager_rate(server, topic, frame, frames_per_run)
+            )
+            results["frames_per_s"]["OrderlySocketManager"][kind] = socket_manager_rate(
+                server, topic, frame, frames_per_run
+            )
+    names = [f"PERP_SYM{i}_USDC" for i in range(symbols)]
+    table = {
+        name: {"mark_price": 100.0 + i, "quote_tick": 0.01, "base_tick": 0.01, "base_min": 0.01}
+        for i, name in enumerate(names)
+    }
+    # the first ping lets the client's run() return
+    with SimulatorProcess(symbols=table, ping_interval=0.2) as server:
+        results["memory"] = {
+            "symbols": symbols,
+            "bytes_per_symbol": asyncio.run(memory_per_symbol(server, names)),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--symbols", type=int, default=100)
+    args = parser.parse_args()
+
+    results = collect(args.frames, args.symbols)
+    for manager, rates in results["frames_per_s"].items():
+        print(manager)
+        for kind, rate in rates.items():
+            print(f"  {kind:10}: {rate:12,.0f} frames/s")
+    memory = results["memory"]
+    print(f"memory: {memory['bytes_per_symbol']:,.0f} bytes per symbol ({memory['symbols']} symbols)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Run tests.simulator.ExchangeSimulator in a child process.
+
+The benchmarks measure the client, so the simulator gets its own interpreter
+and event loop instead of sharing the CPU of the process being measured.
+The child is driven over a pipe:
+
+    with SimulatorProcess(ping_interval=0.2) as server:
+        account_id, orderly_key, orderly_secret = server.call("add_account")
+        await server.acall("stream", "PERP_BTC_USDC@bbo", frame, 10_000, 1)
+"""
+import asyncio
+import multiprocessing
+
+STARTUP_TIMEOUT = 30
+
+
+class SimulatorProcess(object):
+    """Context manager starting the simulator with options in a child process.
+
+    Commands:
+        add_account                     -> (account_id, orderly_key, orderly_secret)
+        stream(topic, frame, count, n)  -> waits until n connections subscribed
+                                           topic, then sends frame count times to
+                                           each of them, returns the frames sent
+        requests                        -> {"METHOD /path": count}
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self.process = None
+        self._conn = None
+        self.rest_url = self.public_ws_url = self.private_ws_url = None
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        self._conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, self.options), daemon=True)
+        self.process.start()
+        if not self._conn.poll(STARTUP_TIMEOUT):
+            self.process.kill()
+            raise RuntimeError("simulator process did not start")
+        self.rest_url, self.public_ws_url, self.private_ws_url = self._conn.recv()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self._conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+
+    def call(self, command, *args):
+        self._conn.send((command,) + args)
+        result = self._conn.recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def acall(self, command, *args):
+        return await asyncio.to_thread(self.call, command, *args)
+
+
+def _serve(conn, options):
+    asyncio.run(_serve_async(conn, options))
+
+
+async def _serve_async(conn, options):
+    from tests.simulator import ExchangeSimulator
+
+    loop = asyncio.get_running_loop()
+    async with ExchangeSimulator(**options) as exchange:
+        conn.send((exchange.rest_url, exchange.public_ws_url, exchange.private_ws_url))
+        while True:
+            command, *args = await loop.run_in_executor(None, conn.recv)
+            if command == "stop":
+                return
+            try:
+                result = await _COMMANDS[command](exchange, *args)
+            except Exception as e:
+                result = e
+            conn.send(result)
+
+
+async def _add_account(exchange):
+    account = exchange.add_account()
+    return account.account_id, account.orderly_key, account.orderly_secret
+
+
+async def _stream(exchange, topic, frame, count, subscribers=1, timeout=30):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while len(exchange.subscribers(topic)) < subscribers:
+        if asyncio.get_running_loop().time() > deadline:
+            raise TimeoutError(f"{subscribers} subscribers of {topic} expected")
+        await asyncio.sleep(0.01)
+    connections = exchange.subscribers(topic)
+    for _ in range(count):
+        for connection in connections:
+            await connection.send_str(frame)
+    return count * len(connections)
+
+
+async def _requests(exchange):
+    return dict(exchange.requests)
+
+
+_COMMANDS = {
+    "add_account": _add_account,
+    "stream": _stream,
+    "requests": _requests,
+}
@@ -0,0 +1,118 @@
+"""Run the benchmark suite and write the results to JSON.
+
+Collects signed REST requests/s per concurrency level, Ed25519 and EIP-712
+signatures/s, websocket frames/s per manager, memory per subscribed symbol,
+JSON decode rates and cold import times, together with the connector and
+Python versions. Passing the file of an earlier run as --baseline prints the
+change of every metric and flags the ones that got worse by more than
+--threshold.
+
+    python -m benchmarks.suite [--seconds 1] [--output results.json] [--baseline previous.json]
+                               [--only rest signing websocket json import]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from orderly_evm_connector.__version__ import __version__
+
+BENCHMARKS = ("rest", "signing", "websocket", "json", "import")
+
+# metrics ending in these are better when lower, every other number is a rate
+LOWER_IS_BETTER = ("_ms", "_bytes", "bytes_per_symbol", "errors")
+# counts describing the run rather than measuring it
+NOT_COMPARED = ("symbols",)
+
+
+def run_benchmarks(names, seconds):
+    results = {}
+    for name in names:
+        print(f"running {name}...", file=sys.stderr)
+        if name == "rest":
+            from benchmarks import bench_rest
+
+            results[name] = bench_rest.collect(seconds)
+        elif name == "signing":
+            from benchmarks import bench_signing, bench_wallet_signing
+
+            results[name] = {**bench_signing.collect(seconds), **bench_wallet_signing.collect(seconds)}
+        elif name == "websocket":
+            from benchmarks import bench_websocket
+
+            results[name] = bench_websocket.collect()
+        elif name == "json":
+            from benchmarks import bench_json
+
+            results[name] = bench_json.collect(seconds)
+        elif name == "import":
+            from benchmarks import bench_import
+
+            results[name] = bench_import.collect()
+    return results
+
+
+def flatten(results, prefix=""):
+    """{"a.b.c": number} of the numeric leaves of nested results"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(results, baseline, threshold):
+    """[(metric, baseline, current, change, regressed)] of the metrics in both runs"""
+    current, previous = flatten(results), flatten(baseline)
+    rows = []
+    for metric, value in current.items():
+        before = previous.get(metric)
+        if before is None or metric.endswith(NOT_COMPARED):
+            continue
+        change = (value - before) / before if before else 0.0
+        worse = change > threshold if metric.endswith(LOWER_IS_BETTER) else change < -threshold
+        rows.append((metric, before, value, change, worse))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change flagged as a regression")
+    args = parser.parse_args()
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": int(time.time()),
+        "seconds": args.seconds,
+        "results": run_benchmarks(args.only, args.seconds),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report["results"], baseline["results"], args.threshold)
+        print(f"compared with {args.baseline} ({baseline.get('version')})")
+        for metric, before, value, change, worse in rows:
+            flag = "  REGRESSION" if worse else ""
+            print(f"  {metric:60} {before:14,.2f} -> {value:14,.2f}  {change:+7.1%}{flag}")
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,26 @@
-import json
-from json import JSONDecodeError
-from typing import Callable, Coroutine
+import asyncio
+import copy
+import logging
+import time
 from aiohttp import ClientResponse, ClientSession
 
 from orderly_evm_connector.lib.hsm import HSMSigner
 from .__version__ import __version__
-from eth_utils.curried import keccak
-from eth_utils.conversions import to_bytes
-from eth_account.messages import encode_structured_data
-from eth_account._utils.signing import to_eth_v, to_bytes32
-from orderly_evm_connector.error import ClientError, ServerError
+from orderly_evm_connector.error import ClientError, RateLimitError, ServerError
+from orderly_evm_connector.lib.cache import ResponseCache
+from orderly_evm_connector.lib.clock import ClockSync
 from orderly_evm_connector.lib.constants import CHAIN_ID, TESTNET_CHAIN_ID
-from orderly_evm_connector.lib.utils import (
-    generate_signature,
-    generate_wallet_signature,
-)
-from orderly_evm_connector.lib.utils import cleanNoneValue
-from orderly_evm_connector.lib.utils import orderlyLog, get_endpoints
+from orderly_evm_connector.lib.eip712 import typed_data_hash
+from orderly_evm_connector.lib.instrumentation import Instrumentation
+from orderly_evm_connector.lib.json_codec import JsonCodec, get_codec
+from orderly_evm_connector.lib.rate_limit import RateLimiter
+from orderly_evm_connector.lib.retry import RetryPolicy
+from orderly_evm_connector.lib.signer import get_signer
+from orderly_evm_connector.lib.symbols import SymbolRegistry
+from orderly_evm_connector.lib.transport import TransportConfig
+from orderly_evm_connector.lib.utils import generate_wallet_signature
+from orderly_evm_connector.lib.utils import cleanNoneValue, check_required_parameter
+from orderly_evm_connector.lib.utils import orderlyLog, get_endpoints, get_timestamp
 
 class API(object):
     def __init__(
@@ -29,33 +33,102 @@ class API(object):
         orderly_account_id=None,
         proxies=None,
         timeout=None,
-        debug=False
+        debug=False,
+        transport: TransportConfig = None,
+        rate_limiter: RateLimiter = None,
+        response_cache: ResponseCache = None,
+        symbol_registry: SymbolRegistry = None,
+        json_codec: JsonCodec = None,
+        clock_sync: ClockSync = None,
+        instrumentation: Instrumentation = None,
+        retry_policy: RetryPolicy = None,
     ):
         self.orderly_key = orderly_key
         self.orderly_secret = orderly_secret
+        self._signer = self._load_signer(orderly_secret)
         self.wallet_secret = wallet_secret
         self.orderly_endpoint, _, _ = get_endpoints(orderly_testnet)
         self.orderly_account_id = orderly_account_id
         self.hsm_instance = hsm_instance
-        self.timeout = timeout
         self.show_header = False
-        self.proxies = proxies
         self.logger = orderlyLog(debug=debug)
-        self.session = ClientSession()
-        self.session.headers.update(
-            {
-                "Content-Type": "application/json;charset=utf-8",
-                "User-Agent": "orderly-connector-python/" + __version__,
-            }
-        )
+        if transport is None:
+            transport = TransportConfig(timeout=timeout, proxies=proxies)
+        elif timeout is not None or proxies is not None:
+            # timeout and proxies given next to a transport override its own
+            transport = copy.copy(transport)
+            if timeout is not None:
+                transport.timeout = timeout
+            if proxies is not None:
+                transport.proxies = proxies
+        self.transport = transport
+        self.timeout = transport.timeout
+        self.proxies = transport.proxies
+        self._session = None
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.symbol_registry = symbol_registry
+        self.json_codec = json_codec if json_codec is not None else get_codec()
+        self.clock_sync = clock_sync
+        self.instrumentation = instrumentation
+        self.retry_policy = retry_policy
+        # spaces bulk_create_order batches when there is no rate_limiter
+        self._batch_order_bucket = None
         return
+
+    @property
+    def session(self) -> ClientSession:
+        # aiohttp connectors need a running loop, so the session is created on first use
+        if self._session is None:
+            self._session = self.transport.create_session(
+                headers={"User-Agent": "orderly-connector-python/" + __version__},
+                trace_configs=(
+                    [self.instrumentation.trace_config()]
+                    if self.instrumentation is not None
+                    else None
+                ),
+            )
+        return self._session
+
+    async def warmup(self, connections: int = None, url_path="/v1/public/system_info"):
+        """Open `connections` keep-alive connections to orderly_endpoint ahead of time
+
+        The first requests after startup then reuse pooled connections instead
+        of paying for DNS, TCP and TLS setup. Returns the number of requests
+        that completed.
+        """
+        if connections is None:
+            connections = self.transport.warmup_connections
+        url = self.orderly_endpoint + url_path
+
+        async def _open():
+            async with self.session.get(url, proxy=self.transport.proxy) as response:
+                await response.read()
+
+        results = await asyncio.gather(
+            *[_open() for _ in range(connections)], return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        for error in errors:
+            self.logger.warning(f"Failed to warm up connection to {url}: {error}")
+        return len(results) - len(errors)
     
     def set_account_keys(self, account_id, secret, key):
         """ Set Account Keys """
         self.orderly_account_id = account_id
         self.orderly_secret = secret
+        self._signer = self._load_signer(secret)
         self.orderly_key = key
 
+    @staticmethod
+    def _load_signer(orderly_secret):
+        if not orderly_secret:
+            return None
+        try:
+            return get_signer(orderly_secret)
+        except ValueError:
+            return None
+
     async def _request(self, http_method, url_path, payload=None):
         if payload:
             _payload = cleanNoneValue(payload)
@@ -70,26 +143,91 @@ class API(object):
 
         if payload is None:
             payload = ""
+        if self.response_cache is not None:
+            return await self.response_cache.get_or_fetch(
+                http_method,
+                url_path,
+                lambda: self._send_public_request_with_retry(http_method, url_path, payload),
+                base_url=self.orderly_endpoint,
+            )
+        return await self._send_public_request_with_retry(http_method, url_path, payload)
+
+    def _send_public_request_with_retry(self, http_method, url_path, payload):
+        if self.retry_policy is None:
+            return self._send_public_request(http_method, url_path, payload)
+        return self.retry_policy.call(
+            lambda: self._send_public_request(http_method, url_path, payload),
+            http_method,
+            url_path,
+            payload,
+        )
+
+    async def _send_public_request(self, http_method, url_path, payload):
+        if self.rate_limiter is not None:
+            await self._acquire_rate_limit(http_method, url_path)
         url = self.orderly_endpoint + url_path
-        self.logger.debug("url: " + url)
+        self.logger.debug("url: %s", url)
         params = cleanNoneValue(
             {
                 "url": url,
                 "params": payload,
-                "timeout": self.timeout,
-                "proxies": self.proxies,
             }
         )
-        response: ClientResponse = await self._dispatch_request(http_method, params)
-        self.logger.debug("raw response from server:" + await response.text())
-        await self._handle_rest_exception(response)
+        _, data = await self._perform_request(http_method, url_path, params)
+        return data
 
+    async def _acquire_rate_limit(self, http_method, url_path, orderly_key=None):
         try:
-            data = await response.json()
-        except ValueError:
-            data = await response.text()
+            await self.rate_limiter.acquire(http_method, url_path, orderly_key)
+        except RateLimitError as e:
+            if self.instrumentation is not None:
+                self.instrumentation.rate_limited(e.endpoint, retry_after=e.retry_after)
+            raise
 
-        return data
+    async def _perform_request(self, http_method, url_path, params):
+        """Send a request and decode the response, returns (response, data)"""
+        record = None
+        if self.instrumentation is not None:
+            body = params.get("params")
+            record = self.instrumentation.start(
+                http_method,
+                url_path,
+                len(body) if isinstance(body, (bytes, bytearray)) else 0,
+            )
+        response = None
+        body = b""
+        try:
+            sent_at = time.time()
+            response: ClientResponse = await self._dispatch_request(
+                http_method, params, trace_request_ctx=record
+            )
+            # the body is read and decoded once, the log line is only built
+            # when it is going to be emitted
+            body = await response.read()
+            received_at = time.time()
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("raw response from server:%s", _text(body))
+            await self._handle_rest_exception(response, body)
+
+            try:
+                data = self.json_codec.loads(body)
+            except ValueError:
+                data = _text(body)
+        except Exception as e:
+            if record is not None:
+                self._finish_record(record, response, body, e)
+            raise
+        if record is not None:
+            self._finish_record(record, response, body)
+        if self.clock_sync is not None:
+            self.clock_sync.observe_response(data, sent_at, received_at)
+        return response, data
+
+    def _finish_record(self, record, response, body, error=None):
+        if response is None:
+            self.instrumentation.finish(record, error=error)
+        else:
+            self.instrumentation.finish(record, response.status, len(body), error)
 
     async def get_wallet_signature(self, message=None):
         if self.hsm_instance is None:
@@ -98,15 +236,21 @@ class API(object):
             await self._get_hsm_signature(message=message)
 
     async def _get_hsm_signature(self, message=None):
-        _message = message
-        encoded_message = encode_structured_data(_message)
-        joined = b"\x19" + encoded_message.version + encoded_message.header + encoded_message.body
-        message_hash = keccak(joined)
+        from eth_utils.conversions import to_bytes
+        from eth_account._utils.signing import to_eth_v, to_bytes32
+
+        message_hash = typed_data_hash(message)
         raw_signature = await self.hsm_instance.sign(message_hash)
         _, _, vrs = self.hsm_instance.adjust_and_recover_signature(message_hash, raw_signature)
         processed_v = to_eth_v(vrs[0])
         return (to_bytes32(vrs[1]) + to_bytes32(vrs[2]) + to_bytes(processed_v)).hex()
 
+    def _server_timestamp(self) -> int:
+        """Milliseconds for signatures and messages, corrected by clock_sync"""
+        if self.clock_sync is not None and self.clock_sync.apply:
+            return self.clock_sync.now()
+        return get_timestamp()
+
     async def _sign_request(self, http_method, url_path, payload=None):
         _payload = ""
         if payload:
@@ -117,20 +261,33 @@ class API(object):
                         [f"{k}={v}" for k, v in _payload.items()]
                     )
                     _payload = ""
-        params = {}
-        payload = _payload if _payload else ""
-        params["url_path"] = url_path
-        params["payload"] = payload
-        params["http_method"] = http_method
-        query_string = self._prepare_params(params)
-        try:
-            _timestamp, _signature = generate_signature(
-                self.orderly_secret, message=query_string
+        # the body is serialized once, the signed bytes are the bytes sent
+        body = self._serialize_body(_payload)
+        check_required_parameter(self.orderly_secret, "orderly_secret")
+        if self.retry_policy is None:
+            return await self._send_signed_request(http_method, url_path, body)
+        # every attempt is signed again and carries a fresh timestamp
+        return await self.retry_policy.call(
+            lambda: self._send_signed_request(http_method, url_path, body),
+            http_method,
+            url_path,
+            _payload,
+        )
+
+    async def _send_signed_request(self, http_method, url_path, body):
+        # wait for the limiter before signing so queued requests carry a fresh timestamp
+        if self.rate_limiter is not None:
+            await self._acquire_rate_limit(http_method, url_path, self.orderly_key)
+        if self._signer is not None:
+            _timestamp, _signature = self._signer.sign(
+                http_method, url_path, body, timestamp=self._server_timestamp()
             )
-        except ValueError:
+        else:
             _timestamp, _signature = "mock_timestamp", "mock_signature"
 
-        self.session.headers.update(
+        # Signed headers are built per call and never written to the shared
+        # session, so concurrent requests cannot overwrite each other.
+        headers = cleanNoneValue(
             {
                 "orderly-timestamp": _timestamp,
                 "orderly-account-id": self.orderly_account_id,
@@ -138,30 +295,22 @@ class API(object):
                 "orderly-signature": _signature,
             }
         )
-        self.logger.debug(f"Sign Request Headers: {self.session.headers}")
-        return await self.send_request(http_method, url_path, payload)
+        self.logger.debug("Sign Request Headers: %s", headers)
+        return await self.send_request(http_method, url_path, body, headers=headers)
 
-    async def send_request(self, http_method, url_path, payload=None):
+    async def send_request(self, http_method, url_path, payload=None, headers=None):
         if payload is None:
             payload = {}
         url = self.orderly_endpoint + url_path
-        self.logger.debug("url: " + url)
+        self.logger.debug("url: %s", url)
         params = cleanNoneValue(
             {
                 "url": url,
                 "params": payload,
-                "timeout": self.timeout,
-                "proxies": self.proxies,
+                "headers": headers,
             }
         )
-        response: ClientResponse = await self._dispatch_request(http_method, params)
-        self.logger.debug("raw response from server:" + await response.text())
-        await self._handle_rest_exception(response)
-
-        try:
-            data = await response.json()
-        except ValueError:
-            data = await response.text()
+        response, data = await self._perform_request(http_method, url_path, params)
         result = {}
 
         if self.show_header:
@@ -172,52 +321,59 @@ class API(object):
             return result
         return data
 
-    def _prepare_params(self, params: dict):
-        _http_method = params["http_method"]
-        _url_path = params["url_path"]
-        _payload = (
-            json.dumps(params["payload"]) if params["payload"] else params["payload"]
-        )
-        _params = "{0}{1}{2}".format(_http_method, _url_path, _payload)
-        return _params
-
-    def _dispatch_request(self, http_method, params):
-        method_func: Callable[..., Coroutine[ClientResponse]] = {
-            "GET": self.session.get,
-            "DELETE": self.session.delete,
-            "PUT": self.session.put,
-            "POST": self.session.post,
-        }.get(http_method, "GET")
+    def _serialize_body(self, payload) -> bytes:
+        if isinstance(payload, (bytes, bytearray)):
+            return payload
+        return self.json_codec.dumps_bytes(payload) if payload else b""
+
+    def _dispatch_request(self, http_method, params, trace_request_ctx=None):
+        headers = dict(params.get("headers", {}))
+        proxy = self.transport.proxy
         if http_method == "POST" or http_method == "PUT":
-            self.session.headers.update({"Content-Type": "application/json"})
-            return method_func(url=params["url"], json=params["params"])
+            headers["Content-Type"] = "application/json"
+            return self.session.request(
+                http_method,
+                params["url"],
+                headers=headers,
+                data=self._serialize_body(params["params"]),
+                proxy=proxy,
+                trace_request_ctx=trace_request_ctx,
+            )
         else:
-            self.session.headers.update(
-                {
-                    "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
-                }
+            headers["Content-Type"] = "application/x-www-form-urlencoded;charset=utf-8"
+            return self.session.request(
+                http_method,
+                params["url"],
+                headers=headers,
+                proxy=proxy,
+                trace_request_ctx=trace_request_ctx,
             )
-            return method_func(url=params["url"])
 
-    async def _handle_rest_exception(self, response: ClientResponse):
+    async def _handle_rest_exception(self, response: ClientResponse, body: bytes = None):
         status_code = response.status
-        text_response = await response.text()
         if status_code <= 400:
             return
+        if body is None:
+            body = await response.read()
+        text_response = _text(body)
         if 400 < status_code < 500:
             try:
-                err = json.loads(text_response)
-            except JSONDecodeError:
-                raise ClientError(
-                    status_code, None, text_response, None, response.headers
-                )
+                err = self.json_codec.loads(body)
+            except ValueError:
+                raise ClientError(status_code, None, text_response, response.headers)
             error_data = None
             if "data" in err:
                 error_data = err["data"]
             raise ClientError(
                 status_code, err["code"], err["message"], response.headers, error_data
             )
-        raise ServerError(status_code, text_response)
+        raise ServerError(status_code, text_response, response.headers)
 
     async def close(self):
-        await self.session.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def _text(body: bytes) -> str:
+    return body.decode("utf-8", errors="replace")
@@ -17,9 +17,11 @@ class ClientError(Error):
 
 
 class ServerError(Error):
-    def __init__(self, status_code, message):
+    def __init__(self, status_code, message, header=None):
         self.status_code = status_code
         self.message = message
+        # the whole response header returned from server
+        self.header = header
 
 
 class ParameterRequiredError(Error):
@@ -60,3 +62,14 @@ class WebsocketClientError(Error):
 
     def __str__(self):
         return self.error_message
+
+
+class RateLimitError(Error):
+    def __init__(self, endpoint, retry_after):
+        # endpoint whose client side limit was hit, e.g. "POST /v1/order"
+        self.endpoint = endpoint
+        # seconds until the request would have been allowed
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return f"rate limit of {self.endpoint} exceeded, retry after {self.retry_after:.3f}s"
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from orderly_evm_connector.lib.endpoints import EndpointResolver
+
+# Public reference data that changes a few times a day: "METHOD path" -> seconds.
+# /v1/public/futures carries mark and index prices, so it is only kept briefly.
+DEFAULT_CACHE_TTLS = {
+    "GET /v1/public/info": 300,
+    "GET /v1/public/info/{symbol}": 300,
+    "GET /v1/public/token": 300,
+    "GET /v1/public/config": 300,
+    "GET /v1/public/fee_futures/program": 300,
+    "GET /v1/public/futures": 1,
+}
+
+
+class ResponseCache(object):
+    """TTL cache for public REST responses.
+
+    Args:
+        ttls(dict): overrides or additions to DEFAULT_CACHE_TTLS, a ttl of None
+                    or 0 disables caching for that endpoint
+        maxsize(number): entries kept before the least recently used is evicted
+
+    Concurrent misses on the same url share one request. Cached responses are
+    returned as is and must be treated as read-only by the caller.
+
+        cache = ResponseCache(ttls={"GET /v1/public/token": 60})
+        client = Client(..., response_cache=cache)
+    """
+
+    def __init__(self, ttls: dict = None, maxsize: int = 256):
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.resolve = EndpointResolver(self.ttls).resolve
+
+    def ttl(self, http_method: str, url_path: str):
+        """Seconds a response of the endpoint is kept, None if it is not cached"""
+        endpoint = self.resolve(http_method, url_path)
+        if endpoint is None:
+            return None
+        return self.ttls[endpoint] or None
+
+    async def get_or_fetch(self, http_method: str, url_path: str, fetch, base_url: str = ""):
+        """Return the cached response for the request, calling fetch() on a miss"""
+        ttl = self.ttl(http_method, url_path)
+        if ttl is None:
+            return await fetch()
+        key = (http_method, base_url, url_path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await fetch()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # mark the exception retrieved when nobody else was waiting
+                future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+        self._store(key, data, ttl)
+        future.set_result(data)
+        return data
+
+    def _store(self, key, data, ttl):
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, url_path: str = None, http_method: str = "GET"):
+        """Drop cached responses, all of them when url_path is None.
+
+        url_path may be a concrete path such as /v1/public/info/PERP_BTC_USDC or
+        a key template such as /v1/public/info/{symbol}.
+        """
+        if url_path is None:
+            self._entries.clear()
+            return
+        endpoint = f"{http_method} {url_path}"
+        for key in list(self._entries):
+            method, _, path = key
+            if method == http_method and (
+                path == url_path or self.resolve(method, path) == endpoint
+            ):
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,131 @@
+import asyncio
+import math
+import time
+from collections import deque
+
+from orderly_evm_connector.lib.utils import orderlyLog
+
+
+class ClockSync(object):
+    """Estimate the offset between the local clock and the Orderly server clock.
+
+    Every sample is a server `timestamp` together with the local send and
+    receive times of the response carrying it. The offset of a sample is the
+    server time minus the local midpoint of the round trip, its error is at
+    most half the round trip. Of the last `window` samples the one with the
+    shortest round trip is trusted most, and the estimate moves towards it by
+    `alpha` per sample so one slow response cannot step the clock.
+
+    With apply=True the clients created with clock_sync= take their
+    timestamps from now(): request signatures, the websocket login and wallet
+    messages. The offset belongs to this clock only, so clients talking to
+    different servers keep separate estimates.
+
+    Samples come from sync(), run in the background by start(), and from any
+    response of a client created with clock_sync=.
+    """
+
+    def __init__(self, window: int = 8, alpha: float = 0.3, apply: bool = True):
+        self.alpha = alpha
+        self.apply = apply
+        self._samples = deque(maxlen=window)
+        self._offset = None
+        self._task = None
+        self.sample_count = 0
+        self.last_sample_time = None
+        self.logger = orderlyLog()
+
+    @property
+    def offset_ms(self) -> float:
+        """Server time minus local time, 0 until the first sample"""
+        return self._offset or 0.0
+
+    @property
+    def rtt_ms(self) -> float:
+        """Shortest round trip of the current window"""
+        return min(rtt for rtt, _ in self._samples) if self._samples else 0.0
+
+    @property
+    def jitter_ms(self) -> float:
+        """RMS deviation of the sampled offsets in the window from the estimate"""
+        if not self._samples:
+            return 0.0
+        return math.sqrt(
+            sum((offset - self._offset) ** 2 for _, offset in self._samples)
+            / len(self._samples)
+        )
+
+    def now(self) -> int:
+        """Estimated server time in milliseconds"""
+        return int(time.time() * 1000 + self.offset_ms)
+
+    def observe(self, server_timestamp, sent_at: float, received_at: float) -> bool:
+        """Add a sample, sent_at and received_at are local time.time() seconds"""
+        try:
+            server_timestamp = float(server_timestamp)
+        except (TypeError, ValueError):
+            return False
+        rtt = (received_at - sent_at) * 1000
+        if rtt < 0:
+            return False
+        self._samples.append((rtt, server_timestamp - (sent_at + received_at) * 500))
+        _, best = min(self._samples)
+        if self._offset is None:
+            self._offset = best
+        else:
+            self._offset += self.alpha * (best - self._offset)
+        self.sample_count += 1
+        self.last_sample_time = received_at
+        return True
+
+    def observe_response(self, data, sent_at: float, received_at: float) -> bool:
+        """Add the sample of a decoded REST response, if it carries a timestamp"""
+        if isinstance(data, dict):
+            if "header" in data and "data" in data:
+                data = data["data"]
+            if isinstance(data, dict) and "timestamp" in data:
+                return self.observe(data["timestamp"], sent_at, received_at)
+        return False
+
+    async def sync(self, client, samples: int = 1):
+        """Sample the clock with get_system_maintenance_status, returns offset_ms"""
+        for _ in range(samples):
+            sent_at = time.time()
+            response = await client.get_system_maintenance_status()
+            # a client created with this clock has recorded the sample already
+            if getattr(client, "clock_sync", None) is not self:
+                self.observe_response(response, sent_at, time.time())
+        return self.offset_ms
+
+    def start(self, client, interval: float = 30, samples: int = 3):
+        """Resynchronize every interval seconds in a background task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(client, interval, samples))
+        return self._task
+
+    async def _run(self, client, interval, samples):
+        while True:
+            try:
+                await self.sync(client, samples)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Clock sync failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "offset_ms": self.offset_ms,
+            "jitter_ms": self.jitter_ms,
+            "rtt_ms": self.rtt_ms,
+            "samples": self.sample_count,
+        }
@@ -1,6 +1,18 @@
 WEBSOCKET_TIMEOUT_IN_SECONDS = 11
 WEBSOCKET_FAILED_MAX_RETRIES = 30
 WEBSOCKET_RETRY_SLEEP_TIME = 5
+WEBSOCKET_READY_TIMEOUT_IN_SECONDS = 30
+WEBSOCKET_REPLAY_BATCH_SIZE = 50
+WEBSOCKET_REPLAY_BATCH_INTERVAL = 0.05
+WEBSOCKET_POOL_SIZE = 4
+WEBSOCKET_POOL_MAX_IMBALANCE = 8
 
 TESTNET_CHAIN_ID = 421614
 CHAIN_ID = 8453
+
+BATCH_ORDER_MAX_SIZE = 10
+
+ORDERBOOK_MAX_LEVELS = 500
+ORDERBOOK_MAX_BUFFERED_UPDATES = 1000
+
+WEBSOCKET_RECEIVE_QUEUE_SIZE = 1000
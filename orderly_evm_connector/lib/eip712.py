@@ -0,0 +1,176 @@
+"""EIP-712 hashing for the typed messages signed with the wallet key.
+
+The eth_account/eth_utils imports are deferred to first use, like the wallet
+signer itself.
+"""
+
+# domain separators by domain fields and values, a process only ever sees a
+# handful of (chainId, verifyingContract) pairs
+_domain_separators = {}
+
+EIP712_DOMAIN_FIELDS = (
+    {"name": "name", "type": "string"},
+    {"name": "version", "type": "string"},
+    {"name": "chainId", "type": "uint256"},
+    {"name": "verifyingContract", "type": "address"},
+)
+
+# compiled schemas by primary type, see TypedSchema
+_schemas = {}
+
+
+def _keccak(data: bytes) -> bytes:
+    from eth_utils import keccak
+
+    return keccak(data)
+
+
+def domain_separator(message) -> bytes:
+    """Return hashStruct(domain) of message, computed once per distinct domain"""
+    fields = message["types"]["EIP712Domain"]
+    domain = message["domain"]
+    key = tuple((field["name"], field["type"], domain.get(field["name"])) for field in fields)
+    separator = _domain_separators.get(key)
+    if separator is None:
+        from eth_account._utils.structured_data.hashing import hash_domain
+
+        separator = _domain_separators[key] = hash_domain(message)
+    return separator
+
+
+def struct_hash(message) -> bytes:
+    """Return hashStruct(message) of the primaryType of message
+
+    Messages built by a TypedSchema are hashed with its compiled encoders,
+    any other message goes through eth_account.
+    """
+    schema = _schemas.get(message["primaryType"])
+    if schema is not None and message["types"] is schema.types:
+        return schema.struct_hash(message["message"])
+    from eth_account._utils.structured_data.hashing import encode_data
+
+    return _keccak(encode_data(message["primaryType"], message["types"], message["message"]))
+
+
+def typed_data_hash(message) -> bytes:
+    """Return keccak256("\\x19\\x01" || domainSeparator || hashStruct(message))"""
+    return _keccak(b"\x19\x01" + domain_separator(message) + struct_hash(message))
+
+
+def _not_encodable(name, field_type, value):
+    return TypeError(
+        f"Value of `{name}` ({value}) is not encodable as type `{field_type}`"
+    )
+
+
+def _uint_encoder(name, field_type):
+    bound = 1 << int(field_type[4:] or 256)
+
+    def encode(value) -> bytes:
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value < bound:
+            raise _not_encodable(name, field_type, value)
+        return value.to_bytes(32, "big")
+
+    return encode
+
+
+def _bytes_encoder(name, field_type):
+    size = int(field_type[5:])
+
+    def encode(value) -> bytes:
+        if not isinstance(value, (bytes, bytearray)) or len(value) > size:
+            raise _not_encodable(name, field_type, value)
+        return bytes(value).ljust(32, b"\0")
+
+    return encode
+
+
+def _field_encoder(name, field_type):
+    """Return a function encoding one value of field_type to its 32 byte word"""
+    from eth_utils import is_address, to_canonical_address
+
+    if field_type == "string":
+
+        def encode(value) -> bytes:
+            if not isinstance(value, str):
+                raise _not_encodable(name, field_type, value)
+            return _keccak(value.encode("utf-8"))
+
+    elif field_type == "bytes":
+
+        def encode(value) -> bytes:
+            if not isinstance(value, (bytes, bytearray)):
+                raise _not_encodable(name, field_type, value)
+            return _keccak(bytes(value))
+
+    elif field_type == "address":
+
+        def encode(value) -> bytes:
+            if not is_address(value):
+                raise _not_encodable(name, field_type, value)
+            return to_canonical_address(value).rjust(32, b"\0")
+
+    elif field_type == "bool":
+
+        def encode(value) -> bytes:
+            if not isinstance(value, bool):
+                raise _not_encodable(name, field_type, value)
+            return int(value).to_bytes(32, "big")
+
+    elif field_type.startswith("uint"):
+        encode = _uint_encoder(name, field_type)
+    elif field_type.startswith("bytes"):
+        encode = _bytes_encoder(name, field_type)
+    else:
+        raise TypeError(f"Field `{name}` has unsupported type `{field_type}`")
+    return encode
+
+
+class TypedSchema(object):
+    """One flat EIP-712 struct type, compiled once to its type hash and field encoders.
+
+    Hashing a message then only encodes its values. Messages are built with
+    typed_message, which shares the schema's types dict, so struct_hash and
+    the wallet signers recognise them.
+    """
+
+    def __init__(self, primary_type: str, fields, domain_fields=None):
+        self.primary_type = primary_type
+        self.fields = tuple(fields)
+        self.types = {
+            "EIP712Domain": list(domain_fields or EIP712_DOMAIN_FIELDS),
+            primary_type: [{"name": name, "type": type_} for name, type_ in self.fields],
+        }
+        self._type_hash = None
+        self._encoders = None
+        _schemas[primary_type] = self
+
+    @property
+    def encode_type(self) -> str:
+        return f"{self.primary_type}({','.join(f'{type_} {name}' for name, type_ in self.fields)})"
+
+    def _compile(self):
+        self._encoders = tuple(
+            (name, _field_encoder(name, type_)) for name, type_ in self.fields
+        )
+        self._type_hash = _keccak(self.encode_type.encode("utf-8"))
+
+    def struct_hash(self, values) -> bytes:
+        if self._encoders is None:
+            self._compile()
+        words = [self._type_hash]
+        for name, encode in self._encoders:
+            value = values.get(name)
+            if value is None:
+                raise ValueError(f"Missing value for field {name} of type {self.primary_type}")
+            words.append(encode(value))
+        return _keccak(b"".join(words))
+
+    def typed_message(self, domain, values) -> dict:
+        """Return the {types, primaryType, domain, message} dict to sign"""
+        return {
+            "domain": domain,
+            "message": values,
+            "primaryType": self.primary_type,
+            "types": self.types,
+        }
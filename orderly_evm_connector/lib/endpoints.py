@@ -0,0 +1,32 @@
+import re
+from functools import lru_cache
+
+
+class EndpointResolver(object):
+    """Map a request to the "METHOD /path/{param}" key it was registered under.
+
+    Keys without path parameters are looked up directly, the others are
+    matched with a regex in which every {name} stands for one path segment.
+    The query string is ignored and results are memoized.
+    """
+
+    def __init__(self, endpoints):
+        self._static = {}
+        self._templates = []
+        for endpoint in endpoints:
+            if "{" in endpoint:
+                parts = re.split(r"\{[^/]+?\}", endpoint)
+                pattern = "[^/]+".join(re.escape(part) for part in parts)
+                self._templates.append((re.compile(pattern + "$"), endpoint))
+            else:
+                self._static[endpoint] = endpoint
+        self.resolve = lru_cache(maxsize=1024)(self._resolve)
+
+    def _resolve(self, http_method: str, url_path: str):
+        key = f"{http_method} {url_path.split('?', 1)[0]}"
+        endpoint = self._static.get(key)
+        if endpoint is None:
+            for pattern, template in self._templates:
+                if pattern.match(key):
+                    return template
+        return endpoint
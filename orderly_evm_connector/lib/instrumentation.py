@@ -0,0 +1,281 @@
+import bisect
+import time
+from collections import Counter, deque
+
+from aiohttp import TraceConfig
+
+from orderly_evm_connector.lib.endpoints import EndpointResolver
+from orderly_evm_connector.lib.rate_limit import ENDPOINT_RATE_LIMITS
+
+DNS = "dns"
+CONNECT = "connect"
+TTFB = "ttfb"
+TOTAL = "total"
+PHASES = (DNS, CONNECT, TTFB, TOTAL)
+
+# rate limit rejections are either raised by the client side RateLimiter or
+# returned by the server as HTTP 429
+CLIENT = "client"
+SERVER = "server"
+
+# upper bounds of the latency histogram buckets in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class RequestRecord(object):
+    """Timings and sizes of one REST request, latencies are in milliseconds.
+
+    dns and connect are None when a pooled connection was reused, connect is
+    the TCP and TLS setup without the DNS lookup. ttfb is measured until the
+    response headers arrived, total until the body was read.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "started",
+        "dns",
+        "connect",
+        "ttfb",
+        "total",
+        "status",
+        "request_bytes",
+        "response_bytes",
+        "error",
+        "_dns_started",
+        "_connect_started",
+    )
+
+    def __init__(self, endpoint: str, request_bytes: int = 0):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.dns = None
+        self.connect = None
+        self.ttfb = None
+        self.total = None
+        self.status = None
+        self.request_bytes = request_bytes
+        self.response_bytes = 0
+        self.error = None
+        self._dns_started = None
+        self._connect_started = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def latency(self, phase: str):
+        return getattr(self, phase)
+
+    def __repr__(self):
+        return f"RequestRecord({self.endpoint!r}, status={self.status}, total={self.total})"
+
+
+class LatencyHistogram(object):
+    """Fixed bucket latency histogram, see LATENCY_BUCKETS_MS"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float):
+        """Upper bound of the bucket holding the q quantile, max for the last bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+
+class MetricsExporter(object):
+    """Receives the measurements of an Instrumentation, override what is needed"""
+
+    def export_request(self, record: RequestRecord):
+        pass
+
+    def export_rate_limited(self, endpoint: str, source: str, retry_after: float = None):
+        pass
+
+
+class InMemoryExporter(MetricsExporter):
+    """Keep latency histograms, status and rate limit counters in memory.
+
+    The last `max_records` RequestRecords are kept as well, to be asserted on
+    in tests.
+    """
+
+    def __init__(self, max_records: int = 1000):
+        self.records = deque(maxlen=max_records)
+        self.histograms = {}
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.rate_limited = Counter()
+        self.request_bytes = Counter()
+        self.response_bytes = Counter()
+
+    def export_request(self, record: RequestRecord):
+        self.records.append(record)
+        endpoint = record.endpoint
+        for phase in PHASES:
+            value = record.latency(phase)
+            if value is not None:
+                self.histogram(endpoint, phase).observe(value)
+        if record.status is not None:
+            self.statuses[(endpoint, record.status)] += 1
+        if record.error is not None:
+            self.errors[(endpoint, record.error)] += 1
+        self.request_bytes[endpoint] += record.request_bytes
+        self.response_bytes[endpoint] += record.response_bytes
+
+    def export_rate_limited(self, endpoint: str, source: str, retry_after: float = None):
+        self.rate_limited[(endpoint, source)] += 1
+
+    def histogram(self, endpoint: str, phase: str = TOTAL) -> LatencyHistogram:
+        histogram = self.histograms.get((endpoint, phase))
+        if histogram is None:
+            histogram = self.histograms[(endpoint, phase)] = LatencyHistogram()
+        return histogram
+
+    def status_counts(self, endpoint: str = None) -> dict:
+        """{status: count} of one endpoint, or of all endpoints together"""
+        counts = Counter()
+        for (_endpoint, status), count in self.statuses.items():
+            if endpoint is None or _endpoint == endpoint:
+                counts[status] += count
+        return dict(counts)
+
+    def snapshot(self) -> dict:
+        """Summary per endpoint: request count, statuses, bytes and latency quantiles"""
+        summary = {}
+        for (endpoint, phase), histogram in self.histograms.items():
+            entry = summary.setdefault(endpoint, {"latency_ms": {}})
+            entry["latency_ms"][phase] = {
+                "count": histogram.count,
+                "mean": histogram.mean,
+                "p50": histogram.quantile(0.5),
+                "p99": histogram.quantile(0.99),
+                "max": histogram.max,
+            }
+        for endpoint, entry in summary.items():
+            entry["statuses"] = self.status_counts(endpoint)
+            entry["request_bytes"] = self.request_bytes[endpoint]
+            entry["response_bytes"] = self.response_bytes[endpoint]
+        for (endpoint, source), count in self.rate_limited.items():
+            summary.setdefault(endpoint, {}).setdefault("rate_limited", {})[source] = count
+        return summary
+
+    def reset(self):
+        self.records.clear()
+        self.histograms.clear()
+        for counter in (
+            self.statuses,
+            self.errors,
+            self.rate_limited,
+            self.request_bytes,
+            self.response_bytes,
+        ):
+            counter.clear()
+
+
+class Instrumentation(object):
+    """Per endpoint instrumentation of the REST client.
+
+    Pass it to the client with instrumentation=, measurements are handed to
+    every exporter:
+
+        metrics = InMemoryExporter()
+        client = Client(..., instrumentation=Instrumentation(metrics))
+
+    Requests are grouped by their "METHOD /path/{param}" endpoint. A client
+    without instrumentation creates no records and attaches no trace config.
+    """
+
+    def __init__(self, *exporters: MetricsExporter, endpoints=None):
+        self.exporters = list(exporters)
+        resolver = EndpointResolver(endpoints if endpoints is not None else ENDPOINT_RATE_LIMITS)
+        self._resolve = resolver.resolve
+
+    def add_exporter(self, exporter: MetricsExporter):
+        self.exporters.append(exporter)
+
+    def endpoint(self, http_method: str, url_path: str) -> str:
+        endpoint = self._resolve(http_method, url_path)
+        if endpoint is None:
+            endpoint = f"{http_method} {url_path.split('?', 1)[0]}"
+        return endpoint
+
+    def start(self, http_method: str, url_path: str, request_bytes: int = 0) -> RequestRecord:
+        return RequestRecord(self.endpoint(http_method, url_path), request_bytes)
+
+    def finish(self, record: RequestRecord, status=None, response_bytes: int = 0, error=None):
+        record.total = record.elapsed_ms()
+        record.status = status
+        record.response_bytes = response_bytes
+        if error is not None:
+            record.error = type(error).__name__
+        for exporter in self.exporters:
+            exporter.export_request(record)
+        if status == 429:
+            self.rate_limited(record.endpoint, SERVER)
+
+    def rate_limited(self, endpoint: str, source: str = CLIENT, retry_after: float = None):
+        for exporter in self.exporters:
+            exporter.export_rate_limited(endpoint, source, retry_after)
+
+    def trace_config(self) -> TraceConfig:
+        """aiohttp TraceConfig filling the DNS, connect and TTFB phases of a record"""
+        trace_config = TraceConfig()
+        trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+        trace_config.on_connection_create_start.append(_on_connect_start)
+        trace_config.on_connection_create_end.append(_on_connect_end)
+        trace_config.on_request_end.append(_on_headers_received)
+        return trace_config
+
+
+# trace_request_ctx is the RequestRecord of the request, or None for requests
+# the client does not instrument such as warmup()
+
+
+async def _on_dns_start(session, context, params):
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx._dns_started = time.perf_counter()
+
+
+async def _on_dns_end(session, context, params):
+    record = context.trace_request_ctx
+    if record is not None and record._dns_started is not None:
+        record.dns = (time.perf_counter() - record._dns_started) * 1000
+
+
+async def _on_connect_start(session, context, params):
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx._connect_started = time.perf_counter()
+
+
+async def _on_connect_end(session, context, params):
+    record = context.trace_request_ctx
+    if record is not None and record._connect_started is not None:
+        record.connect = (time.perf_counter() - record._connect_started) * 1000 - (record.dns or 0)
+
+
+async def _on_headers_received(session, context, params):
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx.ttfb = context.trace_request_ctx.elapsed_ms()
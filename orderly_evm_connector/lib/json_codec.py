@@ -0,0 +1,90 @@
+import json
+
+from orderly_evm_connector.error import ParameterValueError
+
+ORJSON = "orjson"
+UJSON = "ujson"
+STDLIB = "json"
+
+# preferred order when no codec is named
+CODEC_PREFERENCE = (ORJSON, UJSON, STDLIB)
+
+
+class JsonCodec(object):
+    """JSON encoder/decoder used for request bodies, responses and websocket frames.
+
+    dumps returns compact str output, dumps_bytes the same document as utf-8
+    bytes. All codecs raise a ValueError subclass on invalid input.
+    """
+
+    def __init__(self, name: str, dumps, dumps_bytes, loads):
+        self.name = name
+        self.dumps = dumps
+        self.dumps_bytes = dumps_bytes
+        self.loads = loads
+
+    def __repr__(self):
+        return f"JsonCodec({self.name!r})"
+
+
+def _orjson_codec():
+    import orjson
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    return JsonCodec(ORJSON, dumps, orjson.dumps, orjson.loads)
+
+
+def _ujson_codec():
+    import ujson
+
+    def dumps(obj) -> str:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+    def dumps_bytes(obj) -> bytes:
+        return dumps(obj).encode("utf-8")
+
+    return JsonCodec(UJSON, dumps, dumps_bytes, ujson.loads)
+
+
+def _stdlib_codec():
+    def dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def dumps_bytes(obj) -> bytes:
+        return dumps(obj).encode("utf-8")
+
+    return JsonCodec(STDLIB, dumps, dumps_bytes, json.loads)
+
+
+_FACTORIES = {ORJSON: _orjson_codec, UJSON: _ujson_codec, STDLIB: _stdlib_codec}
+_codecs = {}
+_default = None
+
+
+def get_codec(name: str = None) -> JsonCodec:
+    """Return the named codec, or the default one: orjson, then ujson, then json"""
+    if name is None:
+        global _default
+        if _default is None:
+            for candidate in CODEC_PREFERENCE:
+                try:
+                    _default = get_codec(candidate)
+                    break
+                except ImportError:
+                    continue
+        return _default
+    if name not in _FACTORIES:
+        raise ParameterValueError([name])
+    codec = _codecs.get(name)
+    if codec is None:
+        codec = _codecs[name] = _FACTORIES[name]()
+    return codec
+
+
+def set_default_codec(name: str) -> JsonCodec:
+    """Use the named codec wherever no codec is passed explicitly"""
+    global _default
+    _default = get_codec(name)
+    return _default
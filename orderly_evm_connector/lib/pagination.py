@@ -0,0 +1,71 @@
+import asyncio
+import math
+from collections import deque
+
+
+def _unwrap(response):
+    if isinstance(response, dict) and "header" in response:
+        response = response["data"]
+    data = response.get("data") if isinstance(response, dict) else None
+    if not isinstance(data, dict):
+        return [], {}
+    return data.get("rows") or [], data.get("meta") or {}
+
+
+def _last_page(meta, size, page, rows):
+    total = meta.get("total")
+    if total is None:
+        return None
+    per_page = meta.get("records_per_page") or size or len(rows)
+    if not per_page:
+        return page
+    return max(page, math.ceil(total / per_page))
+
+
+async def paginate(fetch_page, size: int = None, page: int = 1, max_parallel: int = 1, prefetch: bool = True):
+    """Yield the rows of a page/size endpoint one by one.
+
+    Args:
+        fetch_page(callable): fetch_page(page, size) returning the response coroutine
+        size(number): page size, None for the server default
+        page(number): first page to fetch
+        max_parallel(number): pages requested concurrently once the total is known
+        prefetch(bool): request the following pages while the current one is consumed
+
+    Until the first response tells how many pages there are, only one page is
+    requested at a time. Only the pages in flight are held in memory. Pending
+    requests are cancelled when the iteration stops early.
+    """
+    pending = deque()
+    next_page = page
+    last_page = None
+    current_page = page - 1
+
+    def schedule():
+        nonlocal next_page
+        limit = max(1, max_parallel) if last_page is not None else 1
+        while len(pending) < limit and (last_page is None or next_page <= last_page):
+            pending.append(asyncio.ensure_future(fetch_page(next_page, size)))
+            next_page += 1
+
+    try:
+        while True:
+            schedule()
+            if not pending:
+                return
+            rows, meta = _unwrap(await pending.popleft())
+            current_page += 1
+            if last_page is None:
+                last_page = _last_page(meta, size, current_page, rows)
+            if not rows or (size and len(rows) < size):
+                last_page = current_page
+            if last_page is not None and last_page <= current_page:
+                while pending:
+                    pending.pop().cancel()
+            elif prefetch:
+                schedule()
+            for row in rows:
+                yield row
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,234 @@
+import asyncio
+import time
+
+from orderly_evm_connector.error import ParameterValueError, RateLimitError
+from orderly_evm_connector.lib.endpoints import EndpointResolver
+
+IP_SCOPE = "ip"
+KEY_SCOPE = "key"
+
+QUEUE = "queue"
+FAIL_FAST = "fail_fast"
+
+# Limits documented on the REST mixins: "METHOD path" -> (requests, seconds, scope).
+# Path parameters are written as {name}. Limits documented per IP address are
+# shared by every client of the process, the others are counted per orderly key.
+ENDPOINT_RATE_LIMITS = {
+    # account
+    "GET /v1/public/account": (10, 1, IP_SCOPE),
+    "GET /v1/get_account": (10, 1, IP_SCOPE),
+    "POST /v1/register_account": (10, 1, IP_SCOPE),
+    "GET /v1/get_orderly_key": (10, 1, IP_SCOPE),
+    "POST /v1/orderly_key": (10, 1, IP_SCOPE),
+    "POST /v1/client/leverage": (5, 60, KEY_SCOPE),
+    "GET /v1/client/holding": (10, 1, KEY_SCOPE),
+    "GET /v1/client/info": (10, 60, KEY_SCOPE),
+    "POST /v1/client/maintenance_config": (10, 60, KEY_SCOPE),
+    "GET /v1/client/statistics/daily": (10, 60, KEY_SCOPE),
+    "GET /v1/volume/user/daily": (10, 60, KEY_SCOPE),
+    "GET /v1/volume/user/stats": (10, 60, KEY_SCOPE),
+    "GET /v1/client/key_info": (10, 60, KEY_SCOPE),
+    "GET /v1/client/orderly_key_ip_restriction": (10, 60, KEY_SCOPE),
+    "POST /v1/client/set_orderly_key_ip_restriction": (10, 60, KEY_SCOPE),
+    "POST /v1/client/reset_orderly_key_ip_restriction": (10, 60, KEY_SCOPE),
+    # delegation
+    "POST /v1/delegate_signer": (1, 1, IP_SCOPE),
+    "POST /v1/delegate_orderly_key": (1, 1, IP_SCOPE),
+    "POST /v1/delegate_withdraw_request": (1, 1, KEY_SCOPE),
+    "POST /v1/delegate_settle_pnl": (1, 1, KEY_SCOPE),
+    # broker
+    "GET /v1/public/broker/name": (10, 1, IP_SCOPE),
+    "GET /v1/broker/user_info": (10, 60, KEY_SCOPE),
+    "GET /v1/volume/broker/daily": (10, 60, KEY_SCOPE),
+    # general
+    "GET /v1/public/system_info": (10, 1, IP_SCOPE),
+    "GET /v1/public/info/{symbol}": (10, 1, IP_SCOPE),
+    "GET /v1/public/token": (10, 1, IP_SCOPE),
+    "GET /v1/public/info": (10, 1, IP_SCOPE),
+    "GET /v1/public/fee_futures/program": (10, 1, IP_SCOPE),
+    "GET /v1/public/config": (10, 1, IP_SCOPE),
+    "GET /v1/client/statistics": (10, 60, KEY_SCOPE),
+    # liquidation
+    "GET /v1/public/liquidation": (10, 1, IP_SCOPE),
+    "GET /v1/public/liquidated_positions": (10, 1, IP_SCOPE),
+    "GET /v1/public/insurancefund": (10, 1, IP_SCOPE),
+    "GET /v1/client/liquidator_liquidations": (10, 1, IP_SCOPE),
+    "GET /v1/liquidations": (10, 1, IP_SCOPE),
+    "POST /v1/liquidation": (5, 1, IP_SCOPE),
+    "POST /v1/claim_insurance_fund": (5, 1, KEY_SCOPE),
+    # market
+    "GET /v1/public/market_trades": (10, 1, IP_SCOPE),
+    "GET /v1/public/volume/stats": (10, 1, IP_SCOPE),
+    "GET /v1/public/funding_rates": (10, 1, IP_SCOPE),
+    "GET /v1/public/funding_rate/{symbol}": (10, 1, IP_SCOPE),
+    "GET /v1/public/funding_rate_history": (10, 1, IP_SCOPE),
+    "GET /v1/public/futures": (10, 1, IP_SCOPE),
+    "GET /v1/public/futures/{symbol}": (10, 1, IP_SCOPE),
+    "GET /v1/tv/config": (10, 1, IP_SCOPE),
+    "GET /v1/tv/history": (10, 1, IP_SCOPE),
+    "GET /v1/tv/symbol_info": (10, 1, IP_SCOPE),
+    "GET /v1/orderbook/{symbol}": (10, 1, KEY_SCOPE),
+    "GET /v1/kline": (10, 1, KEY_SCOPE),
+    # notifications
+    "GET /v1/notification/inbox/notifications": (10, 60, KEY_SCOPE),
+    "GET /v1/notification/inbox/unread": (10, 60, KEY_SCOPE),
+    "POST /v1/notification/inbox/mark_read": (10, 60, KEY_SCOPE),
+    "POST /v1/notification/inbox/mark_read_all": (10, 60, KEY_SCOPE),
+    # system
+    "GET /v1/public/vault_balance": (10, 1, IP_SCOPE),
+    "GET /v1/public/chain_info": (10, 1, IP_SCOPE),
+    # settlement
+    "GET /v1/settle_nonce": (10, 1, KEY_SCOPE),
+    "POST /v1/settle_pnl": (1, 1, KEY_SCOPE),
+    "GET /v1/pnl_settlement/history": (20, 1, KEY_SCOPE),
+    # trade
+    "POST /v1/order": (10, 1, KEY_SCOPE),
+    "POST /v1/algo/order": (10, 1, KEY_SCOPE),
+    "POST /v1/batch-order": (1, 1, KEY_SCOPE),
+    "PUT /v1/order": (10, 1, KEY_SCOPE),
+    "PUT /v1/algo/order": (10, 1, KEY_SCOPE),
+    "DELETE /v1/order": (10, 1, KEY_SCOPE),
+    "DELETE /v1/algo/order": (10, 1, KEY_SCOPE),
+    "DELETE /v1/algo/orders": (10, 1, KEY_SCOPE),
+    "DELETE /v1/client/order": (10, 1, KEY_SCOPE),
+    "DELETE /v1/algo/client/order": (10, 1, KEY_SCOPE),
+    "DELETE /v1/orders": (10, 1, KEY_SCOPE),
+    "DELETE /v1/batch-order": (10, 1, KEY_SCOPE),
+    "DELETE /v1/client/batch-order": (10, 1, KEY_SCOPE),
+    "GET /v1/order/{order_id}": (10, 1, KEY_SCOPE),
+    "GET /v1/algo/order/{order_id}": (10, 1, KEY_SCOPE),
+    "GET /v1/client/order/{client_order_id}": (10, 1, KEY_SCOPE),
+    "GET /v1/algo/client/order/{client_order_id}": (10, 1, KEY_SCOPE),
+    "GET /v1/orders": (10, 1, KEY_SCOPE),
+    "GET /v1/algo/orders": (10, 1, KEY_SCOPE),
+    "GET /v1/order/{order_id}/trades": (10, 1, KEY_SCOPE),
+    "GET /v1/trades": (10, 1, KEY_SCOPE),
+    "GET /v1/trade/{trade_id}": (10, 1, KEY_SCOPE),
+    "GET /v1/positions": (30, 10, KEY_SCOPE),
+    "GET /v1/position/{symbol}": (30, 10, KEY_SCOPE),
+    "GET /v1/funding_fee/history": (20, 60, KEY_SCOPE),
+    # wallet
+    "GET /v1/asset/history": (10, 60, KEY_SCOPE),
+    "GET /v1/withdraw_nonce": (10, 1, KEY_SCOPE),
+    "POST /v1/withdraw_request": (10, 1, IP_SCOPE),
+    # campaign
+    "GET /v1/public/points/epoch_dates": (10, 1, IP_SCOPE),
+    "GET /v1/client/points": (10, 1, IP_SCOPE),
+    "GET /v1/public/points/leaderboard": (10, 1, IP_SCOPE),
+    # referral
+    "POST /v1/referral/create": (1, 1, KEY_SCOPE),
+    "POST /v1/referral/update": (1, 1, KEY_SCOPE),
+    "POST /v1/referral/bind": (1, 1, KEY_SCOPE),
+    "GET /v1/referral/admin_info": (10, 1, KEY_SCOPE),
+    "GET /v1/referral/info": (10, 1, KEY_SCOPE),
+    "GET /v1/referral/referral_history": (10, 1, KEY_SCOPE),
+    "GET /v1/referral/rebate_summary": (10, 1, KEY_SCOPE),
+    "GET /v1/referral/referee_history": (10, 1, KEY_SCOPE),
+    "GET /v1/referral/referee_info": (10, 1, KEY_SCOPE),
+    "GET /v1/client/distribution_history": (1, 1, KEY_SCOPE),
+}
+
+
+class TokenBucket(object):
+    """Token bucket holding `capacity` tokens, refilled evenly over `period` seconds.
+
+    Tokens may be reserved ahead of time, in which case the level goes negative
+    and later callers wait proportionally longer. This keeps queued requests
+    in arrival order without a lock.
+    """
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    @property
+    def level(self) -> float:
+        """Tokens currently available, negative while requests are queued"""
+        self._refill()
+        return self.tokens
+
+    def wait_time(self, cost: float = 1) -> float:
+        """Seconds until `cost` tokens are available"""
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def try_acquire(self, cost: float = 1) -> bool:
+        self._refill()
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def reserve(self, cost: float = 1) -> float:
+        """Take `cost` tokens now and return the seconds to wait before using them"""
+        delay = self.wait_time(cost)
+        self.tokens -= cost
+        return delay
+
+
+class RateLimiter(object):
+    """Client side rate limiter for the REST endpoints.
+
+    Args:
+        policy(string): queue - wait until a token is available
+                        fail_fast - raise RateLimitError immediately
+        limits(dict): overrides or additions to ENDPOINT_RATE_LIMITS
+
+    One limiter can be shared by several clients so per-IP limits are counted
+    for the whole process:
+
+        limiter = RateLimiter()
+        client = Client(..., rate_limiter=limiter)
+    """
+
+    def __init__(self, policy: str = QUEUE, limits: dict = None):
+        if policy not in (QUEUE, FAIL_FAST):
+            raise ParameterValueError([policy])
+        self.policy = policy
+        self.limits = {**ENDPOINT_RATE_LIMITS, **(limits or {})}
+        self._buckets = {}
+        self.resolve = EndpointResolver(self.limits).resolve
+
+    def _bucket(self, endpoint: str, scope_id: str) -> TokenBucket:
+        bucket = self._buckets.get((endpoint, scope_id))
+        if bucket is None:
+            count, seconds, _ = self.limits[endpoint]
+            bucket = self._buckets[(endpoint, scope_id)] = TokenBucket(count, seconds)
+        return bucket
+
+    def _scope_id(self, endpoint: str, orderly_key: str = None) -> str:
+        return IP_SCOPE if self.limits[endpoint][2] == IP_SCOPE else (orderly_key or "")
+
+    async def acquire(self, http_method: str, url_path: str, orderly_key: str = None, cost: float = 1) -> float:
+        """Take `cost` tokens for the endpoint, returns the seconds spent waiting"""
+        endpoint = self.resolve(http_method, url_path)
+        if endpoint is None:
+            return 0.0
+        bucket = self._bucket(endpoint, self._scope_id(endpoint, orderly_key))
+        if self.policy == FAIL_FAST:
+            if not bucket.try_acquire(cost):
+                raise RateLimitError(endpoint, bucket.wait_time(cost))
+            return 0.0
+        delay = bucket.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def level(self, http_method: str, url_path: str, orderly_key: str = None):
+        """Tokens currently available for the endpoint, None if it is not limited"""
+        endpoint = self.resolve(http_method, url_path)
+        if endpoint is None:
+            return None
+        return self._bucket(endpoint, self._scope_id(endpoint, orderly_key)).level
+
+    def levels(self) -> dict:
+        """Current level of every bucket in use: {(endpoint, scope_id): tokens}"""
+        return {key: bucket.level for key, bucket in self._buckets.items()}
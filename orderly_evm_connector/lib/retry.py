@@ -0,0 +1,188 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+from aiohttp import ClientConnectionError
+
+from orderly_evm_connector.error import ClientError, ParameterValueError, ServerError
+from orderly_evm_connector.lib.rate_limit import TokenBucket
+from orderly_evm_connector.lib.utils import orderlyLog
+
+# endpoint classes, see RetryPolicy.classify
+READ = "read"
+CANCEL = "cancel"
+CREATE = "create"
+OTHER = "other"
+
+# order creation endpoints, retried only when every order has a client_order_id
+CREATE_ENDPOINTS = ("/v1/order", "/v1/algo/order", "/v1/batch-order")
+
+DEFAULT_MAX_ATTEMPTS = {READ: 3, CANCEL: 3, CREATE: 3, OTHER: 1}
+
+RETRY_AFTER_HEADERS = ("Retry-After",)
+
+
+class RetryBudget(object):
+    """Retry tokens shared by every client of a RetryPolicy.
+
+    Each request deposits `ratio` tokens and each retry takes one, so retries
+    stay below that fraction of the traffic when the exchange degrades.
+    `min_per_second` tokens are added over time as well so a quiet client
+    can still retry, up to `max_tokens`.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1, max_tokens: float = 10):
+        self.ratio = ratio
+        self._bucket = TokenBucket(max_tokens, max_tokens / min_per_second)
+        self.exhausted = 0
+
+    @property
+    def tokens(self) -> float:
+        return self._bucket.level
+
+    def deposit(self):
+        bucket = self._bucket
+        bucket.tokens = min(bucket.capacity, bucket.level + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self._bucket.try_acquire():
+            return True
+        self.exhausted += 1
+        return False
+
+
+class RetryPolicy(object):
+    """Retry REST requests that failed in a way that is safe to repeat.
+
+    Args:
+        max_attempts(dict): attempts per endpoint class, merged into DEFAULT_MAX_ATTEMPTS
+                            read   - GET requests
+                            cancel - DELETE requests
+                            create - order creation, only retried when the orders
+                                     carry a client_order_id, which makes them idempotent
+                            other  - everything else, not retried by default
+        base_delay(float): backoff before the first retry in seconds, doubled per retry
+        max_delay(float): cap of the exponential backoff
+        max_retry_after(float): give up when the server asks to wait longer than this
+        budget(RetryBudget): shared retry budget, one is created when not given
+
+    Connection errors, timeouts, 5xx responses and 429 responses are retried
+    after a fully jittered exponential backoff, or after the Retry-After the
+    server sent if that is longer. Signed requests are signed again for
+    every attempt, so each one carries a fresh timestamp.
+
+    One policy, and its budget, can be shared by several clients:
+
+        policy = RetryPolicy(max_attempts={"create": 2})
+        client = Client(..., retry_policy=policy)
+    """
+
+    def __init__(
+        self,
+        max_attempts: dict = None,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        max_retry_after: float = 10.0,
+        budget: RetryBudget = None,
+        retry_after_headers=RETRY_AFTER_HEADERS,
+    ):
+        self.max_attempts = {**DEFAULT_MAX_ATTEMPTS, **(max_attempts or {})}
+        for endpoint_class in self.max_attempts:
+            if endpoint_class not in DEFAULT_MAX_ATTEMPTS:
+                raise ParameterValueError([endpoint_class])
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+        self.retry_after_headers = retry_after_headers
+        self.retries = 0
+        self.logger = orderlyLog()
+
+    @staticmethod
+    def classify(http_method: str, url_path: str) -> str:
+        if http_method == "GET":
+            return READ
+        if http_method == "DELETE":
+            return CANCEL
+        if http_method == "POST" and url_path.split("?", 1)[0] in CREATE_ENDPOINTS:
+            return CREATE
+        return OTHER
+
+    @staticmethod
+    def is_idempotent_create(payload) -> bool:
+        if not isinstance(payload, dict):
+            return False
+        orders = payload.get("orders")
+        if orders is None:
+            return bool(payload.get("client_order_id"))
+        return bool(orders) and all(order.get("client_order_id") for order in orders)
+
+    def attempts(self, http_method: str, url_path: str, payload=None) -> int:
+        """Number of attempts allowed for one request"""
+        endpoint_class = self.classify(http_method, url_path)
+        if endpoint_class == CREATE and not self.is_idempotent_create(payload):
+            return 1
+        return max(1, self.max_attempts[endpoint_class])
+
+    def backoff(self, retry: int) -> float:
+        """Full jitter backoff before retry number `retry`, counting from 1"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    def retry_after(self, headers) -> float:
+        """Seconds the server asked to wait, None if it did not say"""
+        if not headers:
+            return None
+        for name in self.retry_after_headers:
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                pass
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+        return None
+
+    def should_retry(self, error) -> bool:
+        if isinstance(error, ServerError):
+            return True
+        if isinstance(error, ClientError):
+            return error.status_code == 429
+        return isinstance(error, (ClientConnectionError, asyncio.TimeoutError))
+
+    def delay(self, error, retry: int):
+        """Seconds to wait before retrying after error, None to give up"""
+        if not self.should_retry(error):
+            return None
+        delay = self.backoff(retry)
+        retry_after = self.retry_after(getattr(error, "header", None))
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    async def call(self, send, http_method: str, url_path: str, payload=None):
+        """Await send() until it succeeds, fails for good or the attempts run out"""
+        attempts = self.attempts(http_method, url_path, payload)
+        self.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                return await send()
+            except Exception as e:
+                if attempt >= attempts:
+                    raise
+                delay = self.delay(e, attempt)
+                if delay is None or not self.budget.withdraw():
+                    raise
+                self.retries += 1
+                self.logger.debug(
+                    "Retrying %s %s in %.3fs after %r", http_method, url_path, delay, e
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,86 @@
+import base64
+from functools import lru_cache
+
+import base58
+
+from orderly_evm_connector.lib.eip712 import typed_data_hash
+from orderly_evm_connector.lib.utils import get_timestamp
+
+
+class OrderlySigner(object):
+    """Ed25519 request signer for one orderly secret.
+
+    The secret is decoded once on construction, so signing a request only
+    costs the Ed25519 signature itself.
+    """
+
+    def __init__(self, orderly_secret: str):
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+        self.orderly_secret = orderly_secret
+        _orderly_secret = orderly_secret.split(":")[-1]
+        self._private_key = Ed25519PrivateKey.from_private_bytes(
+            base58.b58decode(_orderly_secret)[0:32]
+        )
+
+    def sign_bytes(self, message: bytes) -> str:
+        return base64.b64encode(self._private_key.sign(message)).decode("utf-8")
+
+    def sign_message(self, message="", timestamp: int = None):
+        """Sign `{timestamp}{message}` and return (timestamp, signature) as strings"""
+        _timestamp = get_timestamp() if timestamp is None else timestamp
+        _signature = self.sign_bytes(f"{_timestamp}{message}".encode("utf-8"))
+        return str(_timestamp), _signature
+
+    def sign(self, method: str, path: str, body=b"", timestamp: int = None):
+        """Sign a REST request, see the Authentication section of the Orderly API docs
+
+        body may be the serialized bytes that are sent, they are signed as is.
+        """
+        if not isinstance(body, (bytes, bytearray)):
+            return self.sign_message(f"{method}{path}{body}", timestamp)
+        _timestamp = get_timestamp() if timestamp is None else timestamp
+        _signature = self.sign_bytes(f"{_timestamp}{method}{path}".encode("utf-8") + body)
+        return str(_timestamp), _signature
+
+
+class WalletSigner(object):
+    """EIP-712 signer for one wallet secret.
+
+    The private key and its public key are derived once on construction and
+    the domain separator is cached per domain, so signing a message only
+    hashes the message struct and computes the ECDSA signature.
+    """
+
+    def __init__(self, wallet_secret: str):
+        from eth_keys import keys
+
+        self.wallet_secret = wallet_secret
+        self._private_key = keys.PrivateKey(bytes.fromhex(wallet_secret.removeprefix("0x")))
+
+    @property
+    def address(self) -> str:
+        return self._private_key.public_key.to_checksum_address()
+
+    def sign_hash(self, message_hash: bytes) -> str:
+        """Sign a 32 byte hash, returns the 0x prefixed r || s || v signature"""
+        from eth_account._utils.signing import sign_message_hash
+
+        _, _, _, signature = sign_message_hash(self._private_key, message_hash)
+        return "0x" + signature.hex()
+
+    def sign_typed_data(self, message) -> str:
+        """Sign a typed message, the {types, primaryType, domain, message} dict"""
+        return self.sign_hash(typed_data_hash(message))
+
+
+@lru_cache(maxsize=128)
+def get_signer(orderly_secret: str) -> OrderlySigner:
+    """Return the cached signer for `orderly_secret`"""
+    return OrderlySigner(orderly_secret)
+
+
+@lru_cache(maxsize=128)
+def get_wallet_signer(wallet_secret: str) -> WalletSigner:
+    """Return the cached wallet signer for `wallet_secret`"""
+    return WalletSigner(wallet_secret)
@@ -0,0 +1,183 @@
+import math
+from decimal import Decimal
+
+from orderly_evm_connector.error import ParameterArgumentError
+
+NEAREST = "nearest"
+DOWN = "down"
+UP = "up"
+
+# tolerance, in ticks, for float prices that are meant to sit on a tick
+_TICK_EPSILON = 1e-6
+
+
+def _decimals(tick: float) -> int:
+    return max(0, -Decimal(repr(float(tick))).as_tuple().exponent)
+
+
+def _snap(value: float, tick: float, decimals: int, mode: str) -> float:
+    # the tick grid starts at 0, *_min and *_max are checked separately
+    steps = value / tick
+    if mode == NEAREST:
+        steps = round(steps)
+    elif mode == DOWN:
+        steps = math.floor(steps + _TICK_EPSILON)
+    elif mode == UP:
+        steps = math.ceil(steps - _TICK_EPSILON)
+    else:
+        raise ParameterArgumentError(f"rounding mode has to be one of {NEAREST}, {DOWN}, {UP}")
+    return round(steps * tick, decimals)
+
+
+def _on_tick(value: float, tick: float) -> bool:
+    steps = value / tick
+    return abs(steps - round(steps)) < _TICK_EPSILON
+
+
+class SymbolRules(object):
+    """Order rules of one symbol, as returned by /v1/public/info"""
+
+    __slots__ = (
+        "symbol",
+        "quote_min",
+        "quote_max",
+        "quote_tick",
+        "base_min",
+        "base_max",
+        "base_tick",
+        "min_notional",
+        "price_range",
+        "price_scope",
+        "price_decimals",
+        "size_decimals",
+    )
+
+    def __init__(self, row: dict):
+        self.symbol = row["symbol"]
+        self.quote_min = float(row.get("quote_min") or 0)
+        self.quote_max = float(row.get("quote_max") or 0)
+        self.quote_tick = float(row["quote_tick"])
+        self.base_min = float(row.get("base_min") or 0)
+        self.base_max = float(row.get("base_max") or 0)
+        self.base_tick = float(row["base_tick"])
+        self.min_notional = float(row.get("min_notional") or 0)
+        self.price_range = row.get("price_range")
+        self.price_scope = row.get("price_scope")
+        self.price_decimals = _decimals(self.quote_tick)
+        self.size_decimals = _decimals(self.base_tick)
+
+    def round_price(self, price: float, mode: str = NEAREST) -> float:
+        return _snap(price, self.quote_tick, self.price_decimals, mode)
+
+    def round_size(self, quantity: float, mode: str = DOWN) -> float:
+        return _snap(quantity, self.base_tick, self.size_decimals, mode)
+
+    def violations(self, price: float = None, quantity: float = None, side: str = None, reference_price: float = None) -> list:
+        """Return the rules an order with this price and quantity breaks, empty if none"""
+        errors = []
+        if price is not None:
+            if price < self.quote_min or (self.quote_max and price > self.quote_max):
+                errors.append(f"price {price} is outside [{self.quote_min}, {self.quote_max}]")
+            if not _on_tick(price, self.quote_tick):
+                errors.append(f"price {price} is not a multiple of quote_tick {self.quote_tick}")
+            if reference_price is not None and self.price_range is not None:
+                if side == "BUY" and price > reference_price * (1 + self.price_range):
+                    errors.append(f"price {price} is above the price range of {reference_price}")
+                elif side == "SELL" and price < reference_price * (1 - self.price_range):
+                    errors.append(f"price {price} is below the price range of {reference_price}")
+        if quantity is not None:
+            if quantity < self.base_min or (self.base_max and quantity > self.base_max):
+                errors.append(f"quantity {quantity} is outside [{self.base_min}, {self.base_max}]")
+            if not _on_tick(quantity, self.base_tick):
+                errors.append(f"quantity {quantity} is not a multiple of base_tick {self.base_tick}")
+        if price is not None and quantity is not None and price * quantity < self.min_notional:
+            errors.append(f"notional {price * quantity} is below min_notional {self.min_notional}")
+        return errors
+
+
+class SymbolRegistry(object):
+    """Symbol rules indexed by symbol name.
+
+    Load it once from get_available_symbols and attach it to the client so
+    create_order, batch_create_order and bulk_create_order reject orders that
+    break the rules before they are signed and sent:
+
+        registry = SymbolRegistry.from_response(await client.get_available_symbols())
+        client.symbol_registry = registry
+        price = registry.round_price("PERP_BTC_USDC", 60000.123)
+    """
+
+    def __init__(self, rows: list = None):
+        self._rules = {}
+        if rows:
+            self.update(rows)
+
+    @classmethod
+    def from_response(cls, response: dict):
+        if "header" in response:
+            response = response["data"]
+        return cls(response["data"]["rows"])
+
+    @classmethod
+    async def load(cls, client):
+        """Build a registry from client.get_available_symbols()"""
+        return cls.from_response(await client.get_available_symbols())
+
+    def update(self, rows: list):
+        """Add or replace the rules of the given /v1/public/info rows"""
+        for row in rows:
+            self._rules[row["symbol"]] = SymbolRules(row)
+
+    def get(self, symbol: str) -> SymbolRules:
+        rules = self._rules.get(symbol)
+        if rules is None:
+            raise ParameterArgumentError(f"unknown symbol {symbol}")
+        return rules
+
+    def __getitem__(self, symbol: str) -> SymbolRules:
+        return self.get(symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rules
+
+    def __len__(self):
+        return len(self._rules)
+
+    @property
+    def symbols(self) -> list:
+        return list(self._rules)
+
+    def round_price(self, symbol: str, price: float, mode: str = NEAREST) -> float:
+        return self.get(symbol).round_price(price, mode)
+
+    def round_size(self, symbol: str, quantity: float, mode: str = DOWN) -> float:
+        return self.get(symbol).round_size(quantity, mode)
+
+    def round_prices(self, symbol: str, prices, mode: str = NEAREST) -> list:
+        """Round many prices of one symbol, looking the rules up once"""
+        rules = self.get(symbol)
+        tick, decimals = rules.quote_tick, rules.price_decimals
+        return [_snap(price, tick, decimals, mode) for price in prices]
+
+    def round_sizes(self, symbol: str, quantities, mode: str = DOWN) -> list:
+        """Round many quantities of one symbol, looking the rules up once"""
+        rules = self.get(symbol)
+        tick, decimals = rules.base_tick, rules.size_decimals
+        return [_snap(quantity, tick, decimals, mode) for quantity in quantities]
+
+    def check_min_notional(self, symbol: str, price: float, quantity: float) -> bool:
+        return price * quantity >= self.get(symbol).min_notional
+
+    def validate_order(self, order: dict, reference_price: float = None):
+        """Raise ParameterArgumentError if the order breaks the rules of its symbol
+
+        Market orders without order_price only get their quantity checked.
+        """
+        errors = self.get(order["symbol"]).violations(
+            price=order.get("order_price"),
+            quantity=order.get("order_quantity"),
+            side=order.get("side"),
+            reference_price=reference_price,
+        )
+        if errors:
+            raise ParameterArgumentError(f"{order['symbol']}: " + "; ".join(errors))
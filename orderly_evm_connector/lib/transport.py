@@ -0,0 +1,77 @@
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from aiohttp.client import DEFAULT_TIMEOUT
+
+
+class TransportConfig(object):
+    """Connection pool settings for the aiohttp session used by the REST client.
+
+    Args:
+        limit(int): total number of simultaneous connections (0 for unlimited)
+        limit_per_host(int): simultaneous connections to one host (0 for unlimited)
+        ttl_dns_cache(int): seconds a resolved address is reused, None to cache forever
+        use_dns_cache(bool): cache DNS lookups at all
+        keepalive_timeout(float): seconds an idle connection is kept in the pool
+        enable_cleanup_closed(bool): abort SSL transports that were not closed cleanly
+        timeout(float): total timeout of one request in seconds, aiohttp's default (300) when None
+        connect_timeout(float): timeout for acquiring a connection, including the TLS handshake,
+            when None only aiohttp's socket connect timeout (30) applies
+        proxies(dict): {"https": "http://host:port"}, the same format as `API(proxies=...)`
+        warmup_connections(int): connections opened by `API.warmup()` when not given explicitly
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        ttl_dns_cache: int = 300,
+        use_dns_cache: bool = True,
+        keepalive_timeout: float = 30,
+        enable_cleanup_closed: bool = False,
+        timeout: float = None,
+        connect_timeout: float = None,
+        proxies: dict = None,
+        warmup_connections: int = 4,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.use_dns_cache = use_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.enable_cleanup_closed = enable_cleanup_closed
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.proxies = proxies
+        self.warmup_connections = warmup_connections
+
+    @property
+    def proxy(self):
+        """Proxy url passed to aiohttp, https takes precedence over http"""
+        if not isinstance(self.proxies, dict):
+            return None
+        return self.proxies.get("https") or self.proxies.get("http")
+
+    def client_timeout(self) -> ClientTimeout:
+        return ClientTimeout(
+            total=DEFAULT_TIMEOUT.total if self.timeout is None else self.timeout,
+            connect=self.connect_timeout,
+            sock_connect=DEFAULT_TIMEOUT.sock_connect,
+        )
+
+    def create_connector(self) -> TCPConnector:
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.use_dns_cache,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=self.enable_cleanup_closed,
+        )
+
+    def create_session(self, headers=None, trace_configs=None) -> ClientSession:
+        """Create a session, must be called from within a running event loop"""
+        return ClientSession(
+            connector=self.create_connector(),
+            timeout=self.client_timeout(),
+            headers=headers,
+            trace_configs=trace_configs,
+        )
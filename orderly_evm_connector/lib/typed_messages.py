@@ -0,0 +1,113 @@
+"""EIP-712 schemas of the messages signed with the wallet key.
+
+Each schema is compiled to its type hash and field encoders on first use, see
+eip712.TypedSchema.
+"""
+from orderly_evm_connector.lib.eip712 import TypedSchema
+
+# verifying contract of the domain of messages that are only checked off chain
+OFF_CHAIN_VERIFYING_CONTRACT = "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC"
+
+REGISTRATION = TypedSchema(
+    "Registration",
+    [
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("timestamp", "uint64"),
+        ("registrationNonce", "uint256"),
+    ],
+)
+
+ADD_ORDERLY_KEY = TypedSchema(
+    "AddOrderlyKey",
+    [
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("orderlyKey", "string"),
+        ("scope", "string"),
+        ("timestamp", "uint64"),
+        ("expiration", "uint64"),
+    ],
+)
+
+WITHDRAW = TypedSchema(
+    "Withdraw",
+    [
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("receiver", "address"),
+        ("token", "string"),
+        ("amount", "uint256"),
+        ("withdrawNonce", "uint64"),
+        ("timestamp", "uint64"),
+    ],
+)
+
+SETTLE_PNL = TypedSchema(
+    "SettlePnl",
+    [
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("settleNonce", "uint64"),
+        ("timestamp", "uint64"),
+    ],
+)
+
+DELEGATE_SIGNER = TypedSchema(
+    "DelegateSigner",
+    [
+        ("delegateContract", "address"),
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("timestamp", "uint64"),
+        ("registrationNonce", "uint256"),
+        ("txHash", "bytes32"),
+    ],
+)
+
+DELEGATE_ADD_ORDERLY_KEY = TypedSchema(
+    "DelegateAddOrderlyKey",
+    [
+        ("delegateContract", "address"),
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("orderlyKey", "string"),
+        ("scope", "string"),
+        ("timestamp", "uint64"),
+        ("expiration", "uint64"),
+    ],
+)
+
+DELEGATE_WITHDRAW = TypedSchema(
+    "DelegateWithdraw",
+    [
+        ("delegateContract", "address"),
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("receiver", "address"),
+        ("token", "string"),
+        ("amount", "uint256"),
+        ("withdrawNonce", "uint64"),
+        ("timestamp", "uint64"),
+    ],
+)
+
+DELEGATE_SETTLE_PNL = TypedSchema(
+    "DelegateSettlePnl",
+    [
+        ("delegateContract", "address"),
+        ("brokerId", "string"),
+        ("chainId", "uint256"),
+        ("settleNonce", "uint64"),
+        ("timestamp", "uint64"),
+    ],
+)
+
+
+def orderly_domain(chain_id: int, verifying_contract: str = OFF_CHAIN_VERIFYING_CONTRACT) -> dict:
+    return {
+        "name": "Orderly",
+        "version": "1",
+        "chainId": chain_id,
+        "verifyingContract": verifying_contract,
+    }
@@ -5,10 +5,7 @@ import uuid
 from urllib.parse import urlparse
 from collections import OrderedDict
 from urllib.parse import urlencode
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-from eth_account.messages import encode_structured_data
-from web3 import Web3
-import base58,base64
+import base58
 import logging
 from orderly_evm_connector.error import (
     ParameterRequiredError,
@@ -102,32 +99,23 @@ def parse_proxies(proxies: dict):
     }
 
 
-def generate_signature(orderly_secret, message=None):
+def generate_signature(orderly_secret, message=None, timestamp=None):
     if not orderly_secret:
         raise "Please configure orderly secret in the configuration file config.ini"
-    _orderly_secret = orderly_secret.split(":")[1]
-    _orderly_private_key = Ed25519PrivateKey.from_private_bytes(
-        base58.b58decode(_orderly_secret)[0:32]
-    )
-    _timestamp = get_timestamp()
+    from orderly_evm_connector.lib.signer import get_signer
+
+    _timestamp = get_timestamp() if timestamp is None else timestamp
     if message and isinstance(message, dict):
         message["timestamp"] = _timestamp
     else:
         message = f"{_timestamp}{message}" if message else _timestamp
-    _signature = base64.b64encode(
-        _orderly_private_key.sign(bytes(str(message), "utf-8"))
-    ).decode("utf-8")
+    _signature = get_signer(orderly_secret).sign_bytes(bytes(str(message), "utf-8"))
     return str(_timestamp), _signature
 
 def generate_wallet_signature(wallet_secret, message=None):
-    private_key = f"0x{wallet_secret}"
-    _message = message
-    encoded_message = encode_structured_data(_message)
-    w3 = Web3()
-    signed_message = w3.eth.account.sign_message(
-        encoded_message, private_key=private_key
-    )
-    return signed_message.signature.hex()
+    from orderly_evm_connector.lib.signer import get_wallet_signer
+
+    return get_wallet_signer(wallet_secret).sign_typed_data(message)
 
 def get_endpoints(orderly_testnet):
     # True: Testnet, False: Mainnet
@@ -119,6 +119,7 @@ class Rest(API):
     from orderly_evm_connector.rest._trade import create_algo_order
     from orderly_evm_connector.rest._trade import create_order
     from orderly_evm_connector.rest._trade import batch_create_order
+    from orderly_evm_connector.rest._trade import bulk_create_order
     from orderly_evm_connector.rest._trade import edit_algo_order
     from orderly_evm_connector.rest._trade import edit_order
     from orderly_evm_connector.rest._trade import cancel_algo_order
@@ -152,4 +153,26 @@ class Rest(API):
     from orderly_evm_connector.rest._campaign import get_user_points
     from orderly_evm_connector.rest._campaign import get_points_leaderboard
     #referral
-    from orderly_evm_connector.rest._referral import get_referral_code_info
\ No newline at end of file
+    from orderly_evm_connector.rest._referral import get_referral_code_info
+    from orderly_evm_connector.rest._referral import get_referral_history
+    from orderly_evm_connector.rest._referral import get_referral_rebate_summary
+    from orderly_evm_connector.rest._referral import get_referee_history
+    from orderly_evm_connector.rest._referral import get_referee_info
+    from orderly_evm_connector.rest._referral import get_distribution_history
+
+    # pagination
+    from orderly_evm_connector.rest._pagination import iter_orders
+    from orderly_evm_connector.rest._pagination import iter_algo_orders
+    from orderly_evm_connector.rest._pagination import iter_trades
+    from orderly_evm_connector.rest._pagination import iter_funding_fee_history
+    from orderly_evm_connector.rest._pagination import iter_asset_history
+    from orderly_evm_connector.rest._pagination import iter_pnl_settlement_history
+    from orderly_evm_connector.rest._pagination import iter_venue_rebalance_history
+    from orderly_evm_connector.rest._pagination import iter_mirrorx_history
+    from orderly_evm_connector.rest._pagination import iter_user_fee_tier
+    from orderly_evm_connector.rest._pagination import iter_referral_code_info
+    from orderly_evm_connector.rest._pagination import iter_referral_history
+    from orderly_evm_connector.rest._pagination import iter_referral_rebate_summary
+    from orderly_evm_connector.rest._pagination import iter_referee_history
+    from orderly_evm_connector.rest._pagination import iter_referee_info
+    from orderly_evm_connector.rest._pagination import iter_distribution_history
\ No newline at end of file
@@ -1,4 +1,5 @@
-from orderly_evm_connector.lib.utils import check_required_parameters, get_timestamp
+from orderly_evm_connector.lib.utils import check_required_parameters
+from orderly_evm_connector.lib.typed_messages import orderly_domain, REGISTRATION, ADD_ORDERLY_KEY
 
 
 def get_registration_nonce(self):
@@ -75,33 +76,10 @@ async def register_account(
     _message = {
         "brokerId": brokerId,
         "chainId": chainId,
-        "timestamp": int(get_timestamp()),
+        "timestamp": self._server_timestamp(),
         "registrationNonce": registrationNonce,
     }
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
-        },
-        "message": _message,
-        "primaryType": "Registration",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "Registration": [
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "timestamp", "type": "uint64"},
-                {"name": "registrationNonce", "type": "uint256"},
-            ],
-        },
-    }
+    message = REGISTRATION.typed_message(orderly_domain(chainId), _message)
 
     _signature = await self.get_wallet_signature(message=message)
     payload = {"message": _message, "signature": _signature, "userAddress": userAddress}
@@ -176,35 +154,10 @@ async def add_orderly_key(
         "chainId": chainId,
         "orderlyKey": orderlyKey,
         "scope": scope,
-        "timestamp": int(get_timestamp()),
+        "timestamp": self._server_timestamp(),
         "expiration": expiration,
     }
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
-        },
-        "message": _message,
-        "primaryType": "AddOrderlyKey",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "AddOrderlyKey": [
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "orderlyKey", "type": "string"},
-                {"name": "scope", "type": "string"},
-                {"name": "timestamp", "type": "uint64"},
-                {"name": "expiration", "type": "uint64"},
-            ],
-        },
-    }
+    message = ADD_ORDERLY_KEY.typed_message(orderly_domain(chainId), _message)
     _signature = await self.get_wallet_signature(message=message)
     payload = {
         "message": _message,
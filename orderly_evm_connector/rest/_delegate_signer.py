@@ -1,6 +1,8 @@
 from orderly_evm_connector.lib.utils import check_required_parameters, get_timestamp
 from orderly_evm_connector.lib.utils import check_enum_parameter,get_withdraw_settle_verifyingcontract
 from orderly_evm_connector.lib.enums import WalletSide, AssetStatus
+from orderly_evm_connector.lib.typed_messages import orderly_domain, DELEGATE_SIGNER
+from orderly_evm_connector.lib.typed_messages import DELEGATE_ADD_ORDERLY_KEY, DELEGATE_WITHDRAW, DELEGATE_SETTLE_PNL
 
 
 async def delegate_signer(
@@ -24,35 +26,9 @@ async def delegate_signer(
         "timestamp": timestamp
     }
 
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
-        },
-        "message": {
-            **_message,
-            "txHash": bytes.fromhex(txHash),
-        },
-        "primaryType": "DelegateSigner",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "DelegateSigner": [
-                {"name": "delegateContract", "type": "address"},
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "timestamp", "type": "uint64"},
-                {"name": "registrationNonce", "type": "uint256"},
-                {"name": "txHash", "type": "bytes32"},
-            ],
-        },
-    }
+    message = DELEGATE_SIGNER.typed_message(
+        orderly_domain(chainId), {**_message, "txHash": bytes.fromhex(txHash)}
+    )
 
     print(message)
 
@@ -99,33 +75,7 @@ async def delegate_add_orderly_key(
         "timestamp": timestamp,
         "expiration": expiration,
     }
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
-        },
-        "message": _message,
-        "primaryType": "DelegateAddOrderlyKey",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "DelegateAddOrderlyKey": [
-                {"name": "delegateContract", "type": "address"},
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "orderlyKey", "type": "string"},
-                {"name": "scope", "type": "string"},
-                {"name": "timestamp", "type": "uint64"},
-                {"name": "expiration", "type": "uint64"},
-            ],
-        },
-    }
+    message = DELEGATE_ADD_ORDERLY_KEY.typed_message(orderly_domain(chainId), _message)
     _signature = await self.get_wallet_signature(message=message)
     payload = {
         "message": _message,
@@ -191,34 +141,7 @@ async def delegate_withdraw_request(
         "delegateContract": delegateContract,
     }
     verifyingContract = get_withdraw_settle_verifyingcontract(self.orderly_testnet)
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": verifyingContract,
-        },
-        "message": _message,
-        "primaryType": "DelegateWithdraw",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "DelegateWithdraw": [
-                {"name": "delegateContract", "type": "address"},
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "receiver", "type": "address"},
-                {"name": "token", "type": "string"},
-                {"name": "amount", "type": "uint256"},
-                {"name": "withdrawNonce", "type": "uint64"},
-                {"name": "timestamp", "type": "uint64"},
-            ],
-        },
-    }
+    message = DELEGATE_WITHDRAW.typed_message(orderly_domain(chainId, verifyingContract), _message)
     _signature = await self.get_wallet_signature(message=message)
     payload = {
         "message": _message,
@@ -265,31 +188,7 @@ async def delegate_request_pnl_settlement(
         "settleNonce": settleNonce,
         "timestamp": timestamp,
     }
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": verifyingContract,
-        },
-        "message": _message,
-        "primaryType": "DelegateSettlePnl",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "DelegateSettlePnl": [
-                {"name": "delegateContract", "type": "address"},
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "settleNonce", "type": "uint64"},
-                {"name": "timestamp", "type": "uint64"},
-            ],
-        },
-    }
+    message = DELEGATE_SETTLE_PNL.typed_message(orderly_domain(chainId, verifyingContract), _message)
 
     _signature = await self.get_wallet_signature(message=message)
     payload = {
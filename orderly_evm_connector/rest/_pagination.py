@@ -0,0 +1,96 @@
+from orderly_evm_connector.lib.pagination import paginate
+
+
+def _iterate(method, size, max_parallel, prefetch, *args, **kwargs):
+    return paginate(
+        lambda page, size: method(*args, page=page, size=size, **kwargs),
+        size=size,
+        max_parallel=max_parallel,
+        prefetch=prefetch,
+    )
+
+
+def iter_orders(self, size: int = 500, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over all orders matching the get_orders filters
+
+    Usage:
+        async for order in client.iter_orders(symbol="PERP_BTC_USDC", status="COMPLETED"):
+            ...
+
+    Optional Args:
+        size(number): page size (max: 500)
+        max_parallel(number): pages requested concurrently once the total is known
+        prefetch(bool): request the next page while the current one is consumed
+        filters of get_orders, except page
+    """
+    return _iterate(self.get_orders, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_algo_orders(self, algo_type: str, size: int = 500, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over all algo orders matching the get_algo_orders filters"""
+    return _iterate(self.get_algo_orders, size, max_parallel, prefetch, algo_type, **kwargs)
+
+
+def iter_trades(self, size: int = 500, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over all trades matching the get_trades filters"""
+    return _iterate(self.get_trades, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_funding_fee_history(self, symbol: str, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the funding fee history of a symbol"""
+    return _iterate(self.get_funding_fee_history, size, max_parallel, prefetch, symbol, **kwargs)
+
+
+def iter_asset_history(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the asset history matching the get_asset_history filters"""
+    return _iterate(self.get_asset_history, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_pnl_settlement_history(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the PnL settlement history"""
+    return _iterate(self.get_pnl_settlement_history, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_venue_rebalance_history(self, from_venue: str, to_venue: str, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the venue rebalance history"""
+    return _iterate(self.get_venue_rebalance_history, size, max_parallel, prefetch, from_venue, to_venue, **kwargs)
+
+
+def iter_mirrorx_history(self, delegation_type: str, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the MirrorX delegation history"""
+    return _iterate(self.get_mirrorx_history, size, max_parallel, prefetch, delegation_type, **kwargs)
+
+
+def iter_user_fee_tier(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the user fee tiers of the broker"""
+    return _iterate(self.get_user_fee_tier, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_referral_code_info(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the referral codes of the broker"""
+    return _iterate(self.get_referral_code_info, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_referral_history(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the referral history"""
+    return _iterate(self.get_referral_history, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_referral_rebate_summary(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the referral rebate summary"""
+    return _iterate(self.get_referral_rebate_summary, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_referee_history(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the referee history"""
+    return _iterate(self.get_referee_history, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_referee_info(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the referees"""
+    return _iterate(self.get_referee_info, size, max_parallel, prefetch, **kwargs)
+
+
+def iter_distribution_history(self, size: int = None, max_parallel: int = 1, prefetch: bool = True, **kwargs):
+    """[Private] Iterate over the distribution history"""
+    return _iterate(self.get_distribution_history, size, max_parallel, prefetch, **kwargs)
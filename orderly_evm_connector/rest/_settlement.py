@@ -1,5 +1,6 @@
-from orderly_evm_connector.lib.utils import check_required_parameters, get_timestamp
+from orderly_evm_connector.lib.utils import check_required_parameters
 from orderly_evm_connector.lib.utils import get_withdraw_settle_verifyingcontract
+from orderly_evm_connector.lib.typed_messages import orderly_domain, SETTLE_PNL
 
 
 def get_settle_pnl_nonce(self):
@@ -57,32 +58,9 @@ async def request_pnl_settlement(
         "chainId": chainId,
         "settleNonce": settleNonce,
         "userAddress": userAddress,
-        "timestamp": int(get_timestamp()),
-    }
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": verifyingContract,
-        },
-        "message": _message,
-        "primaryType": "SettlePnl",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "SettlePnl": [
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "settleNonce", "type": "uint64"},
-                {"name": "timestamp", "type": "uint64"},
-            ],
-        },
+        "timestamp": self._server_timestamp(),
     }
+    message = SETTLE_PNL.typed_message(orderly_domain(chainId, verifyingContract), _message)
     _signature = await self.get_wallet_signature(message=message)
     payload = {
         "message": _message,
@@ -1,3 +1,8 @@
+import asyncio
+
+from orderly_evm_connector.error import ClientError, ParameterArgumentError
+from orderly_evm_connector.lib.constants import BATCH_ORDER_MAX_SIZE
+from orderly_evm_connector.lib.rate_limit import ENDPOINT_RATE_LIMITS, TokenBucket
 from orderly_evm_connector.lib.utils import check_required_parameters
 from orderly_evm_connector.lib.utils import check_enum_parameter
 from orderly_evm_connector.lib.enums import OrderType, OrderStatus, OrderSide
@@ -50,6 +55,8 @@ def create_order(
         "reduce_only": reduce_only,
         "visible_quantity": visible_quantity,
     }
+    if self.symbol_registry is not None:
+        self.symbol_registry.validate_order(payload)
     return self._sign_request("POST", "/v1/order", payload=payload)
 
 def create_algo_order(
@@ -138,6 +145,10 @@ def batch_create_order(self, orders: list):
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/batch-create-order
     """
+    if len(orders) > BATCH_ORDER_MAX_SIZE:
+        raise ParameterArgumentError(
+            f"batch_create_order accepts at most {BATCH_ORDER_MAX_SIZE} orders, use bulk_create_order for more"
+        )
     for order in orders:
         check_required_parameters(
             [
@@ -147,10 +158,129 @@ def batch_create_order(self, orders: list):
             ]
         )
         check_enum_parameter(order["order_type"], OrderType)
+        if self.symbol_registry is not None:
+            self.symbol_registry.validate_order(order)
 
     payload = {"orders": orders}
     return self._sign_request("POST", "/v1/batch-order", payload=payload)
 
+async def bulk_create_order(self, orders: list, batch_size: int = BATCH_ORDER_MAX_SIZE):
+    """[Private] Create any number of orders through batch create order
+
+    Splits `orders` into batches of at most 10, dispatches them concurrently
+    and spaces them to the batch order limit of 1 request per 1 second. With a
+    `rate_limiter` on the client, the limiter is used instead and each batch
+    also takes one create order token per order.
+
+    Args:
+        orders(list): orders in the batch_create_order format, each with a unique client_order_id
+    Optional Args:
+        batch_size(number): orders per batch request, at most 10
+
+    Returns a dict keyed by client_order_id:
+        {"success": True, "data": <row from the batch order response>}
+        {"success": False, "error_code": ..., "error_message": ..., "data": <row or None>}
+
+    Rows of the batch response are matched to the orders by client_order_id.
+    A failed batch request, including one refused by a fail_fast rate_limiter,
+    is reported on each of its orders instead of being raised.
+    With a `symbol_registry` on the client, orders breaking the symbol rules are
+    reported as failed without being sent.
+    """
+    if not 0 < batch_size <= BATCH_ORDER_MAX_SIZE:
+        raise ParameterArgumentError(
+            f"batch_size has to be between 1 and {BATCH_ORDER_MAX_SIZE}"
+        )
+    client_order_ids = set()
+    for order in orders:
+        check_required_parameters(
+            [
+                [order.get("symbol"), "symbol"],
+                [order.get("order_type"), "order_type"],
+                [order.get("side"), "side"],
+                [order.get("client_order_id"), "client_order_id"],
+            ]
+        )
+        check_enum_parameter(order["order_type"], OrderType)
+        if order["client_order_id"] in client_order_ids:
+            raise ParameterArgumentError(
+                f"duplicate client_order_id {order['client_order_id']}"
+            )
+        client_order_ids.add(order["client_order_id"])
+
+    # orders breaking the symbol rules are reported without being sent
+    rejected = {}
+    if self.symbol_registry is not None:
+        accepted = []
+        for order in orders:
+            try:
+                self.symbol_registry.validate_order(order)
+                accepted.append(order)
+            except ParameterArgumentError as e:
+                rejected[order["client_order_id"]] = {
+                    "success": False,
+                    "error_code": None,
+                    "error_message": str(e),
+                    "data": None,
+                }
+        orders = accepted
+
+    bucket = None
+    if self.rate_limiter is None:
+        # one bucket per client, so concurrent calls share the batch order limit
+        if self._batch_order_bucket is None:
+            count, seconds, _ = ENDPOINT_RATE_LIMITS["POST /v1/batch-order"]
+            self._batch_order_bucket = TokenBucket(count, seconds)
+        bucket = self._batch_order_bucket
+
+    async def _place(batch):
+        try:
+            if bucket is not None:
+                await asyncio.sleep(bucket.reserve())
+            else:
+                await self.rate_limiter.acquire(
+                    "POST", "/v1/order", self.orderly_key, cost=len(batch)
+                )
+            response = await self.batch_create_order(batch)
+            if "header" in response:
+                response = response["data"]
+            rows = response["data"]["rows"]
+        except Exception as e:
+            failure = {
+                "success": False,
+                "error_code": e.error_code if isinstance(e, ClientError) else None,
+                "error_message": getattr(e, "error_message", None) or str(e),
+                "data": None,
+            }
+            return [(order["client_order_id"], dict(failure)) for order in batch]
+
+        rows = {row.get("client_order_id"): row for row in rows}
+        results = []
+        for order in batch:
+            row = rows.get(order["client_order_id"]) or {"error_message": "missing from batch response"}
+            error_message = row.get("error_message")
+            if error_message and error_message != "none":
+                results.append(
+                    (
+                        order["client_order_id"],
+                        {
+                            "success": False,
+                            "error_code": row.get("error_code"),
+                            "error_message": error_message,
+                            "data": row,
+                        },
+                    )
+                )
+            else:
+                results.append((order["client_order_id"], {"success": True, "data": row}))
+        return results
+
+    batches = [orders[i : i + batch_size] for i in range(0, len(orders), batch_size)]
+    placed = await asyncio.gather(*[_place(batch) for batch in batches])
+    results = {client_order_id: result for batch in placed for client_order_id, result in batch}
+    results.update(rejected)
+    return results
+
 def edit_algo_order(
     self,
     order_id: str,
@@ -264,11 +394,6 @@ def cancel_algo_order(self, order_id: int, symbol: str):
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/cancel-algo-order
     """
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
     check_required_parameters([[order_id, "order_id"], [symbol, "symbol"]])
     return self._sign_request("DELETE", f"/v1/algo/order?order_id={order_id}&symbol={symbol}")
 
@@ -286,11 +411,6 @@ def cancel_algo_all_pending_order(self, symbol: str):
 
     https://orderly.network/docs/build-on-evm/evm-api/restful-api/private/cancel-all-pending-algo-orders
     """
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
     check_required_parameters([[symbol, "symbol"]])
     return self._sign_request("DELETE", f"/v1/algo/orders?symbol={symbol}")
 
@@ -330,11 +450,6 @@ def cancel_algo_order_by_client_order_id(self, client_order_id: int, symbol: str
     check_required_parameters(
         [[client_order_id, "client_order_id"], [symbol, "symbol"]]
     )
-    self.session.headers.update(
-            {
-                "Content-Type": "application/x-www-form-urlencoded"
-            }
-        )
     return self._sign_request("DELETE", f"/v1/algo/client/order?client_order_id={client_order_id}&symbol={symbol}")
 
 
@@ -1,6 +1,7 @@
-from orderly_evm_connector.lib.utils import check_required_parameters, get_timestamp
+from orderly_evm_connector.lib.utils import check_required_parameters
 from orderly_evm_connector.lib.utils import check_enum_parameter,get_withdraw_settle_verifyingcontract
 from orderly_evm_connector.lib.enums import WalletSide, AssetStatus
+from orderly_evm_connector.lib.typed_messages import orderly_domain, WITHDRAW
 
 
 def get_asset_history(
@@ -119,37 +120,11 @@ async def withdraw_request(
         "token": token,
         "amount": amount,
         "withdrawNonce": withdrawNonce,
-        "timestamp": int(get_timestamp()),
+        "timestamp": self._server_timestamp(),
         "type": "Withdraw",
     }
     verifyingContract = get_withdraw_settle_verifyingcontract(self.orderly_testnet)
-    message = {
-        "domain": {
-            "name": "Orderly",
-            "version": "1",
-            "chainId": chainId,
-            "verifyingContract": verifyingContract,
-        },
-        "message": _message,
-        "primaryType": "Withdraw",
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "Withdraw": [
-                {"name": "brokerId", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "receiver", "type": "address"},
-                {"name": "token", "type": "string"},
-                {"name": "amount", "type": "uint256"},
-                {"name": "withdrawNonce", "type": "uint64"},
-                {"name": "timestamp", "type": "uint64"},
-            ],
-        },
-    }
+    message = WITHDRAW.typed_message(orderly_domain(chainId, verifyingContract), _message)
     _signature = await self.get_wallet_signature(message=message)
     payload = {
         "message": _message,
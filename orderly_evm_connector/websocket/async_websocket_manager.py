@@ -1,6 +1,5 @@
 import asyncio
 import contextlib
-import json
 import time
 import websockets
 from websockets.exceptions import (
@@ -13,7 +12,15 @@ from orderly_evm_connector.lib.constants import (
     WEBSOCKET_TIMEOUT_IN_SECONDS,
     WEBSOCKET_FAILED_MAX_RETRIES,
     WEBSOCKET_RETRY_SLEEP_TIME,
+    WEBSOCKET_RECEIVE_QUEUE_SIZE,
+    WEBSOCKET_READY_TIMEOUT_IN_SECONDS,
+    WEBSOCKET_REPLAY_BATCH_SIZE,
+    WEBSOCKET_REPLAY_BATCH_INTERVAL,
 )
+from orderly_evm_connector.lib.json_codec import get_codec
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
+from orderly_evm_connector.websocket.readiness import Readiness
+from orderly_evm_connector.websocket.receive_queue import ReceiveQueue, BLOCK
 
 class AsyncWebsocketManager:
     def __init__(
@@ -29,8 +36,14 @@ class AsyncWebsocketManager:
         debug=False,
         proxies=None,
         max_retries=WEBSOCKET_FAILED_MAX_RETRIES,
+        receive_queue_size=WEBSOCKET_RECEIVE_QUEUE_SIZE,
+        overflow_policy=BLOCK,
+        consumers=1,
+        json_codec=None,
+        subscriptions=None,
     ):
         self.websocket_url = websocket_url
+        self.json_codec = json_codec if json_codec is not None else get_codec()
         self.on_message = on_message
         self.on_open = on_open
         self.on_close = on_close
@@ -41,7 +54,8 @@ class AsyncWebsocketManager:
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
         self._proxy_params = parse_proxies(proxies) if proxies else {}
-        self.subscriptions = []
+        # subscribe responses are observed by the read loop, ahead of any queue
+        self.subscriptions = subscriptions if subscriptions is not None else SubscriptionRegistry(debug=debug)
         self._login = False
         self.max_retries = max_retries
         self.ws = None
@@ -50,6 +64,14 @@ class AsyncWebsocketManager:
         self._read_task = None
         self._last_heartbeat = 0
         self._last_message_time = time.time()
+        # frames are queued by the read loop and handed to on_message by
+        # consumer tasks, so a slow callback cannot stall recv and pings.
+        # Each consumer owns a shard of the topics, keeping every topic in order.
+        self.receive_queue = ReceiveQueue(receive_queue_size, overflow_policy, shards=consumers)
+        self.consumers = consumers
+        self._consumer_tasks = []
+        # connected, logged in and subscriptions acknowledged, see ensure_init
+        self.readiness = Readiness()
 
     def start(self):
         pass
@@ -75,9 +97,13 @@ class AsyncWebsocketManager:
                     f"WebSocket connection has been established: {self.websocket_url}, proxies: {self._proxy_params}"
                 )
 
-                # Reset connection state
+                # Reset connection state, the login and subscriptions sent
+                # from on_open are tracked for the new connection
                 self.init = False
+                self._login = False
                 self._last_message_time = time.time()
+                self.readiness.reset()
+                self.readiness.set_connected()
 
                 if self.on_open:
                     self.on_open(self)
@@ -112,6 +138,33 @@ class AsyncWebsocketManager:
                 self.logger.error("Failed to send message: %s; error: %s", message, e)
         asyncio.create_task(_safe_send())
 
+    def send_messages(
+        self,
+        messages,
+        batch_size=WEBSOCKET_REPLAY_BATCH_SIZE,
+        interval=WEBSOCKET_REPLAY_BATCH_INTERVAL,
+    ):
+        """Send messages in order from one task, batch_size at a time with interval seconds between batches"""
+        if not messages:
+            return
+        if not self.ws or self.ws.closed or self._stopping:
+            self.logger.warning("Tried to send %d msgs on a closed/stopping WebSocket. Dropping.", len(messages))
+            return
+        ws = self.ws
+
+        async def _send_batches():
+            try:
+                for start in range(0, len(messages), batch_size):
+                    if start:
+                        await asyncio.sleep(interval)
+                    if ws is not self.ws or ws.closed:
+                        return
+                    for message in messages[start:start + batch_size]:
+                        await ws.send(message)
+            except Exception as e:
+                self.logger.error("Failed to send %d messages; error: %s", len(messages), e)
+        asyncio.create_task(_send_batches())
+
     async def run(self):
         await self.create_ws_connection()
 
@@ -125,75 +178,117 @@ class AsyncWebsocketManager:
         except Exception as e:
             self.logger.error(f"Error in WebSocket run: {e}")
 
-    async def ensure_init(self):
-        while True:
-            if self.init:
-                break
-            await asyncio.sleep(1)
+    async def ensure_init(self, timeout=WEBSOCKET_READY_TIMEOUT_IN_SECONDS):
+        """Wait until the connection is usable, see Readiness
+
+        Returns as soon as the socket is open, the login (if one was sent) is
+        accepted and the subscriptions sent on the connection are answered.
+        Raises WebsocketClientError on a rejected login or after timeout
+        seconds, None waits forever.
+        """
+        await self.readiness.wait(timeout)
 
     async def _handle_heartbeat(self):
         try:
             _payload = {"event": "pong"}
-            await self.ws.send(json.dumps(_payload))
+            await self.ws.send(self.json_codec.dumps(_payload))
             self.logger.debug(f"Sent Ping frame: {_payload}")
             self._last_heartbeat = time.time()
         except Exception as e:
             self.logger.error("Failed to send Ping: {}".format(e))
 
-    async def read_data(self):
-        try:
-            while not self._stopping:
-                try:
-                    message = await self.ws.recv()
-                    self.init = True
-                    self._last_message_time = time.time()
-                    _message = json.loads(message)
-                except json.JSONDecodeError:
-                    err_code = decode_ws_error_code(message)
-                    self.logger.warning(f"Websocket error code received: {err_code}")
-                    continue
+    def _start_consumers(self):
+        if not self._consumer_tasks:
+            self._consumer_tasks = [None] * self.consumers
+        for shard, task in enumerate(self._consumer_tasks):
+            if task is None or task.done():
+                self._consumer_tasks[shard] = asyncio.create_task(self._consume(shard))
 
-                if "event" in _message and _message["event"] == "ping":
-                    await self._handle_heartbeat()
+    async def _consume(self, shard):
+        while True:
+            message = await self.receive_queue.get(shard)
+            try:
+                await self._callback(self.on_message, message)
+            finally:
+                self.receive_queue.task_done(shard)
+
+    async def _stop_consumers(self):
+        # close() may be called from a callback running in a consumer task
+        current = asyncio.current_task()
+        tasks = [task for task in self._consumer_tasks if task is not current]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._consumer_tasks = []
+
+    async def read_data(self):
+        # a reconnect continues reading from the new connection
+        while not self._stopping:
+            self._start_consumers()
+            try:
+                await self._read_connection()
+            except (ConnectionClosedOK, ConnectionClosedError) as e:
+                # If we’re stopping, a close is expected. Don’t reconnect.
+                if self._stopping:
+                    self.logger.info("WebSocket closed intentionally (code=%s).", getattr(e, "code", None))
+                    return
+                # If it’s a normal 1000 from the peer, also don’t call it “abnormal”.
+                if getattr(e, "code", None) == 1000:
+                    self.logger.info("WebSocket closed normally by peer.")
                 else:
-                    await self._callback(self.on_message, _message)
-        except (ConnectionClosedOK, ConnectionClosedError) as e:
-            # If we’re stopping, a close is expected. Don’t reconnect.
-            if self._stopping:
-                self.logger.info("WebSocket closed intentionally (code=%s).", getattr(e, "code", None))
-                return
-            # If it’s a normal 1000 from the peer, also don’t call it “abnormal”.
-            if getattr(e, "code", None) == 1000:
-                self.logger.info("WebSocket closed normally by peer.")
-                # Still attempt to reconnect unless we're stopping
-                if not self._stopping:
-                    await self.reconnect()
-                return
-            self.logger.warning("WebSocket connection closed unexpectedly (code=%s). Reconnecting...",
-                                getattr(e, "code", None))
-            if not self._stopping:
+                    self.logger.warning("WebSocket connection closed unexpectedly (code=%s). Reconnecting...",
+                                        getattr(e, "code", None))
                 await self.reconnect()
-        except WebSocketException as e:
-            if self._stopping:
-                self.logger.info("Stopping; not reconnecting after exception.")
-                return
-            self.logger.error(f"WebSocket exception: {e}")
-            await self.reconnect()
-        except Exception as e:
-            if self._stopping:
-                self.logger.info("Stopping; not reconnecting after exception.")
-                return
-            self.logger.error(f"Exception in read_data: {e}")
-            await self.reconnect()
+            except WebSocketException as e:
+                if self._stopping:
+                    self.logger.info("Stopping; not reconnecting after exception.")
+                    return
+                self.logger.error(f"WebSocket exception: {e}")
+                await self.reconnect()
+            except Exception as e:
+                if self._stopping:
+                    self.logger.info("Stopping; not reconnecting after exception.")
+                    return
+                self.logger.error(f"Exception in read_data: {e}")
+                await self.reconnect()
+
+    async def _read_connection(self):
+        while not self._stopping:
+            try:
+                message = await self.ws.recv()
+                self.init = True
+                self._last_message_time = time.time()
+                _message = self.json_codec.loads(message)
+            except ValueError:
+                err_code = decode_ws_error_code(message)
+                self.logger.warning(f"Websocket error code received: {err_code}")
+                continue
+
+            if "event" in _message:
+                if _message["event"] == "ping":
+                    await self._handle_heartbeat()
+                    continue
+                self.readiness.observe(_message)
+                if _message["event"] == "subscribe":
+                    self.subscriptions.observe(_message)
+            await self.receive_queue.put(_message)
 
     async def close(self):
         self._stopping = True
+        self.readiness.reset()
         if self.ws and not self.ws.closed:
             try:
                 # Initiate close and WAIT for peer's close frame
                 await self.ws.close(code=1000, reason="")
             finally:
-                if self._read_task and not self._read_task.done():
+                # reconnect() closes the socket from inside the read task
+                if (
+                    self._read_task
+                    and not self._read_task.done()
+                    and self._read_task is not asyncio.current_task()
+                ):
                     try:
                         await asyncio.wait_for(self._read_task, timeout=5)
                     except asyncio.TimeoutError:
@@ -201,6 +296,8 @@ class AsyncWebsocketManager:
                         self._read_task.cancel()
                         with contextlib.suppress(asyncio.CancelledError):
                             await self._read_task
+        # also when the peer already closed the socket
+        await self._stop_consumers()
 
     async def _callback(self, callback, *args):
         if callback:
@@ -0,0 +1,88 @@
+import inspect
+
+WILDCARD = "*"
+
+
+def _split(topic: str):
+    symbol, sep, stream = topic.partition("@")
+    return (symbol, stream) if sep else (None, topic)
+
+
+class TopicRouter(object):
+    """Route websocket messages to handlers by topic.
+
+    Patterns are exact topics (PERP_BTC_USDC@bbo, executionreport) or use * for
+    the symbol or the stream of a {symbol}@{stream} topic (*@bbo, *@kline_1m,
+    PERP_BTC_USDC@*). A lone * matches every topic. The handlers of a topic are
+    resolved once and cached, so dispatch is a dict lookup per message.
+
+    Handlers are called like on_message, with (manager, message), and may be
+    coroutine functions or plain functions.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._resolved = {}
+
+    def add(self, pattern: str, handler):
+        handlers = self._handlers.setdefault(pattern, [])
+        if handler not in handlers:
+            handlers.append(handler)
+        self._resolved.clear()
+
+    def remove(self, pattern: str, handler=None):
+        """Remove one handler of pattern, or all of them when handler is None"""
+        handlers = self._handlers.get(pattern)
+        if handlers is None:
+            return
+        if handler is None:
+            del self._handlers[pattern]
+        elif handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self._handlers[pattern]
+        self._resolved.clear()
+
+    def handlers(self, topic: str) -> tuple:
+        resolved = self._resolved.get(topic)
+        if resolved is None:
+            resolved = self._resolved[topic] = self._resolve(topic)
+        return resolved
+
+    def _resolve(self, topic: str) -> tuple:
+        symbol, stream = _split(topic)
+        patterns = [topic]
+        if symbol is not None:
+            patterns += [f"{WILDCARD}@{stream}", f"{symbol}@{WILDCARD}"]
+        patterns.append(WILDCARD)
+        resolved = []
+        for pattern in patterns:
+            for handler in self._handlers.get(pattern, ()):
+                if handler not in resolved:
+                    resolved.append(handler)
+        return tuple(resolved)
+
+    async def dispatch(self, manager, message) -> bool:
+        """Call the handlers of the message topic, returns False if there are none"""
+        topic = message.get("topic") if isinstance(message, dict) else None
+        if not topic:
+            return False
+        handlers = self.handlers(topic)
+        for handler in handlers:
+            result = handler(manager, message)
+            if inspect.isawaitable(result):
+                await result
+        return bool(handlers)
+
+    def dispatch_sync(self, manager, message) -> bool:
+        """dispatch for the threaded socket manager, handlers have to be plain functions"""
+        topic = message.get("topic") if isinstance(message, dict) else None
+        if not topic:
+            return False
+        handlers = self.handlers(topic)
+        for handler in handlers:
+            handler(manager, message)
+        return bool(handlers)
+
+    def __len__(self):
+        return len(self._handlers)
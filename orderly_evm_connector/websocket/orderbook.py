@@ -0,0 +1,263 @@
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+from orderly_evm_connector.lib.constants import (
+    ORDERBOOK_MAX_LEVELS,
+    ORDERBOOK_MAX_BUFFERED_UPDATES,
+)
+from orderly_evm_connector.lib.utils import orderlyLog
+
+
+def _levels(rows):
+    """Normalize [[price, quantity]] and [{"price", "quantity"}] rows"""
+    for row in rows or []:
+        if isinstance(row, dict):
+            yield float(row["price"]), float(row["quantity"])
+        else:
+            yield float(row[0]), float(row[1])
+
+
+class PriceLevels(object):
+    """One side of a book, best price first.
+
+    Prices are kept in a sorted list located with bisect, quantities in a dict.
+    Levels beyond max_levels from the best price are dropped.
+    """
+
+    def __init__(self, descending: bool = False, max_levels: int = ORDERBOOK_MAX_LEVELS):
+        self._sign = -1.0 if descending else 1.0
+        self._keys = []
+        self._quantities = {}
+        self.max_levels = max_levels
+
+    def update(self, price: float, quantity: float):
+        """Set the quantity of a level, 0 removes it"""
+        key = self._sign * price
+        if quantity <= 0:
+            if self._quantities.pop(price, None) is not None:
+                del self._keys[bisect_left(self._keys, key)]
+            return
+        if price not in self._quantities:
+            insort(self._keys, key)
+        self._quantities[price] = quantity
+        if len(self._keys) > self.max_levels:
+            del self._quantities[self._sign * self._keys.pop()]
+
+    def clear(self):
+        self._keys.clear()
+        self._quantities.clear()
+
+    def top(self, n: int = 1) -> list:
+        """[(price, quantity)] of the n best levels"""
+        sign = self._sign
+        return [(sign * key, self._quantities[sign * key]) for key in self._keys[:n]]
+
+    def best(self):
+        if not self._keys:
+            return None
+        price = self._sign * self._keys[0]
+        return price, self._quantities[price]
+
+    def quantity_at(self, price: float) -> float:
+        return self._quantities.get(price, 0.0)
+
+    def cumulative_quantity(self, price: float) -> float:
+        """Total quantity of the levels at or better than price"""
+        sign = self._sign
+        index = bisect_right(self._keys, sign * price)
+        return sum(self._quantities[sign * key] for key in self._keys[:index])
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class OrderBook(object):
+    """Local L2 book of one symbol.
+
+    Snapshots replace the book. Updates carry their own ts and the ts of the
+    previous update (prevTs); a break in that chain marks the book out of sync
+    until the next snapshot, and the updates received meanwhile are buffered
+    and replayed on top of it.
+    """
+
+    def __init__(self, symbol: str, max_levels: int = ORDERBOOK_MAX_LEVELS,
+                 max_buffered_updates: int = ORDERBOOK_MAX_BUFFERED_UPDATES):
+        self.symbol = symbol
+        self.asks = PriceLevels(descending=False, max_levels=max_levels)
+        self.bids = PriceLevels(descending=True, max_levels=max_levels)
+        self.ts = None
+        self.synced = False
+        self.gaps = 0
+        self._snapshot_ts = None
+        self._buffer = deque(maxlen=max_buffered_updates)
+
+    def apply_snapshot(self, asks, bids, ts=None):
+        self.asks.clear()
+        self.bids.clear()
+        for price, quantity in _levels(asks):
+            self.asks.update(price, quantity)
+        for price, quantity in _levels(bids):
+            self.bids.update(price, quantity)
+        self.ts = ts
+        self._snapshot_ts = ts
+        self.synced = True
+        buffered, self._buffer = list(self._buffer), deque(maxlen=self._buffer.maxlen)
+        for update in buffered:
+            if not self.apply_update(*update):
+                break
+
+    def apply_update(self, asks, bids, ts=None, prev_ts=None) -> bool:
+        """Apply a delta, returns False if it revealed a gap or the book is out of sync"""
+        if not self.synced:
+            self._buffer.append((asks, bids, ts, prev_ts))
+            return False
+        if ts is not None and self.ts is not None and ts <= self.ts:
+            # already contained in the snapshot
+            return True
+        if prev_ts is not None and self.ts is not None:
+            if self.ts == self._snapshot_ts:
+                in_sequence = prev_ts <= self.ts
+            else:
+                in_sequence = prev_ts == self.ts
+            if not in_sequence:
+                self.synced = False
+                self.gaps += 1
+                self._buffer.append((asks, bids, ts, prev_ts))
+                return False
+        for price, quantity in _levels(asks):
+            self.asks.update(price, quantity)
+        for price, quantity in _levels(bids):
+            self.bids.update(price, quantity)
+        if ts is not None:
+            self.ts = ts
+        return True
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def mid_price(self):
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def top(self, n: int = 10) -> dict:
+        return {"asks": self.asks.top(n), "bids": self.bids.top(n)}
+
+    def quantity_at(self, side: str, price: float) -> float:
+        """Quantity resting at price, side is BUY for bids and SELL for asks"""
+        return (self.bids if side == "BUY" else self.asks).quantity_at(price)
+
+    def cumulative_quantity(self, side: str, price: float) -> float:
+        """Quantity resting at or better than price on one side"""
+        return (self.bids if side == "BUY" else self.asks).cumulative_quantity(price)
+
+
+class OrderBookManager(object):
+    """Maintain an OrderBook per symbol from a WebsocketPublicAPIClient.
+
+    Args:
+        rest_client(Rest): resync from get_orderbook_snapshot instead of request_orderbook
+        on_update(coroutine function): awaited with (book) after every applied message
+        on_message(coroutine function): messages that are not order book data are forwarded here
+        max_levels(number): price levels kept per side
+
+    Usage:
+        books = OrderBookManager()
+        wss_client = WebsocketPublicAPIClient(on_message=books.on_message)
+        books.attach(wss_client)
+        await wss_client.run()
+        books.subscribe("PERP_BTC_USDC")
+        books.book("PERP_BTC_USDC").top(5)
+    """
+
+    def __init__(self, client=None, rest_client=None, on_update=None, on_message=None,
+                 max_levels: int = ORDERBOOK_MAX_LEVELS, debug=False):
+        self.client = client
+        self.rest_client = rest_client
+        self.on_update = on_update
+        self.forward = on_message
+        self.max_levels = max_levels
+        self.logger = orderlyLog(debug=debug)
+        self.books = {}
+        self._resyncs = {}
+
+    def attach(self, client):
+        """Use client for resync requests and route its messages through the manager"""
+        self.client = client
+        if client.on_message is not self.on_message:
+            self.forward = client.on_message
+            client.on_message = self.on_message
+
+    def book(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol, max_levels=self.max_levels)
+        return book
+
+    def subscribe(self, symbol: str):
+        """Subscribe to the updates of symbol and request the snapshot they build on"""
+        self.book(symbol)
+        self.client.get_orderbookupdate(f"{symbol}@orderbookupdate")
+        self.resync(symbol)
+
+    def resync(self, symbol: str):
+        if self.rest_client is None:
+            self.client.request_orderbook("orderbook", symbol)
+            return
+        task = self._resyncs.get(symbol)
+        if task is None or task.done():
+            self._resyncs[symbol] = asyncio.ensure_future(self._rest_resync(symbol))
+
+    async def _rest_resync(self, symbol: str):
+        try:
+            response = await self.rest_client.get_orderbook_snapshot(symbol, max_level=self.max_levels)
+            if "header" in response:
+                response = response["data"]
+            data = response["data"]
+            await self._snapshot(symbol, data.get("asks"), data.get("bids"), data.get("timestamp"))
+        except Exception as e:
+            self.logger.error(f"Failed to resync order book of {symbol}: {e}")
+
+    async def _snapshot(self, symbol, asks, bids, ts):
+        book = self.book(symbol)
+        book.apply_snapshot(asks, bids, ts)
+        if not book.synced:
+            self.resync(symbol)
+        if self.on_update:
+            await self.on_update(book)
+
+    async def on_message(self, manager, message):
+        topic = message.get("topic") or ""
+        data = message.get("data")
+        if topic.endswith("@orderbookupdate"):
+            symbol = data.get("symbol") or topic.split("@", 1)[0]
+            book = self.book(symbol)
+            was_synced = book.synced
+            if book.apply_update(data.get("asks"), data.get("bids"), message.get("ts"), data.get("prevTs")):
+                if self.on_update:
+                    await self.on_update(book)
+            elif was_synced:
+                self.logger.warning(f"Order book of {symbol} out of sequence, resyncing")
+                self.resync(symbol)
+            return
+        if topic.endswith("@orderbook"):
+            symbol = data.get("symbol") or topic.split("@", 1)[0]
+            await self._snapshot(symbol, data.get("asks"), data.get("bids"), data.get("ts") or message.get("ts"))
+            return
+        if message.get("event") == "request" and isinstance(data, dict) and "asks" in data:
+            if message.get("success", True):
+                await self._snapshot(data["symbol"], data.get("asks"), data.get("bids"), data.get("ts") or message.get("ts"))
+            return
+        if self.forward:
+            await self.forward(manager, message)
@@ -1,5 +1,4 @@
 import threading
-import json
 import time
 from websocket import (
     create_connection,
@@ -13,7 +12,11 @@ from orderly_evm_connector.lib.constants import (
     WEBSOCKET_TIMEOUT_IN_SECONDS,
     WEBSOCKET_FAILED_MAX_RETRIES,
     WEBSOCKET_RETRY_SLEEP_TIME,
+    WEBSOCKET_REPLAY_BATCH_SIZE,
+    WEBSOCKET_REPLAY_BATCH_INTERVAL,
 )
+from orderly_evm_connector.lib.json_codec import get_codec
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
 
 class OrderlySocketManager(threading.Thread):
     def __init__(
@@ -29,8 +32,12 @@ class OrderlySocketManager(threading.Thread):
         debug=False,
         proxies=None,
         max_retries=WEBSOCKET_FAILED_MAX_RETRIES,
+        json_codec=None,
+        subscriptions=None,
+        router=None,
     ):
         threading.Thread.__init__(self)
+        self.json_codec = json_codec if json_codec is not None else get_codec()
         self.websocket_url = websocket_url
         self.on_message = on_message
         self.on_open = on_open
@@ -38,10 +45,13 @@ class OrderlySocketManager(threading.Thread):
         self.on_error = on_error
         self.on_ping = on_ping
         self.on_pong = on_pong
+        # TopicRouter taking the decoded frames of topics with a handler
+        self.router = router
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
         self._proxy_params = parse_proxies(proxies) if proxies else {}
-        self.subscriptions = []
+        # subscribe responses are observed by the read loop, ahead of any queue
+        self.subscriptions = subscriptions if subscriptions is not None else SubscriptionRegistry(debug=debug)
         self._login = False
         self.create_ws_connection()
 
@@ -93,13 +103,20 @@ class OrderlySocketManager(threading.Thread):
         self.logger.debug("Sending message to Orderly WebSocket Server: %s", message)
         self.ws.send(message)
 
+    def send_messages(self, messages, batch_size=WEBSOCKET_REPLAY_BATCH_SIZE, interval=WEBSOCKET_REPLAY_BATCH_INTERVAL):
+        for start in range(0, len(messages), batch_size):
+            if start:
+                time.sleep(interval)
+            for message in messages[start:start + batch_size]:
+                self.send_message(message)
+
     def run(self):
         self.read_data()
 
     def _handle_heartbeat(self):
         try:
             _payload = {"event": "pong"}
-            self.ws.send(json.dumps(_payload))
+            self.ws.send(self.json_codec.dumps(_payload))
             self.logger.debug(f"Sent Ping frame:{_payload}")
         except Exception as e:
             self.logger.error("Failed to send Ping: {}".format(e))
@@ -107,13 +124,16 @@ class OrderlySocketManager(threading.Thread):
     def read_data(self):
         data = ""
         while True:
+            _message = None
             try:
                 op_code, frame = self.ws.recv_data_frame(True)
                 try:
-                    _message = json.loads(frame.data)
+                    _message = self.json_codec.loads(frame.data)
                     if "event" in _message:
                         if _message["event"] == "ping":
                             self._handle_heartbeat()
+                        elif _message["event"] == "subscribe":
+                            self.subscriptions.observe(_message)
                 except Exception:
                     err_code = decode_ws_error_code(frame.data)
                     self.logger.warning(f"Websocket error code received: {err_code}")
@@ -133,17 +153,27 @@ class OrderlySocketManager(threading.Thread):
                 self.logger.warning("Reconnecting...")
                 self.reconnect()
                 continue
-            self._handle_data(op_code, frame, data)
+            self._handle_data(op_code, frame, data, _message)
 
             if op_code == ABNF.OPCODE_CLOSE:
                 self.logger.warning("CLOSE frame received, closing websocket connection")
                 self._callback(self.on_close)
                 break
 
-    def _handle_data(self, op_code, frame, data):
+    def _handle_data(self, op_code, frame, data, message=None):
         if op_code == ABNF.OPCODE_TEXT:
             data = frame.data.decode()
-            self._callback(self.on_message, data)
+            if self.router is not None and len(self.router):
+                self._callback(self._dispatch, data, message)
+            else:
+                self._callback(self.on_message, data)
+
+    def _dispatch(self, manager, data, message):
+        # handlers get the frame decoded once in read_data, on_message still gets the raw frame
+        if self.router.dispatch_sync(manager, message):
+            return
+        if self.on_message:
+            self.on_message(manager, data)
 
     def close(self):
         if not self.ws.connected:
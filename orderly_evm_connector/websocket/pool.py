@@ -0,0 +1,345 @@
+import asyncio
+import functools
+import time
+import zlib
+from typing import Optional
+
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.constants import (
+    WEBSOCKET_POOL_SIZE,
+    WEBSOCKET_POOL_MAX_IMBALANCE,
+    WEBSOCKET_READY_TIMEOUT_IN_SECONDS,
+    WEBSOCKET_RECEIVE_QUEUE_SIZE,
+)
+from orderly_evm_connector.lib.utils import orderlyLog, get_endpoints, get_uuid
+from orderly_evm_connector.websocket.dispatch import TopicRouter
+from orderly_evm_connector.websocket.receive_queue import BLOCK
+from orderly_evm_connector.websocket.subscriptions import ACKED, FAILED
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+
+
+def shard_key(topic: str) -> str:
+    """The symbol of a {symbol}@{stream} topic, other topics are their own key"""
+    symbol, sep, _ = topic.partition("@")
+    return symbol if sep else topic
+
+
+class WebsocketPublicPoolClient(object):
+    """Public websocket streams spread over several connections.
+
+    Every symbol is owned by one shard, a connection with its own read loop
+    and receive queue, so all topics of a symbol arrive in order on the same
+    connection. A new symbol goes to the shard picked by a stable hash of the
+    symbol unless that shard already carries max_imbalance topics more than
+    the lightest one. When the shards drift further apart than that, e.g.
+    after unsubscribes, the next subscribe moves whole symbols from the
+    heaviest to the lightest shard. A moved symbol is subscribed on its new
+    shard and keeps being delivered from the old one until the new shard has
+    acknowledged every topic of the symbol, only then is it unsubscribed on
+    the old shard. While both shards carry a topic its frames are merged by
+    ts, so the handoff neither drops nor repeats a frame.
+
+    Messages of every shard go through one TopicRouter and on_message, so the
+    pool is used like WebsocketPublicAPIClient. stats() reports the health
+    and throughput of each shard.
+
+        shards(int): number of connections
+        max_imbalance(int): topics the busiest shard may carry above the lightest
+        websocket_url(str): overrides the public endpoint of orderly_testnet
+    """
+
+    def __init__(
+        self,
+        orderly_testnet=False,
+        shards=WEBSOCKET_POOL_SIZE,
+        max_imbalance=WEBSOCKET_POOL_MAX_IMBALANCE,
+        orderly_account_id=None,
+        wss_id=None,
+        timeout=None,
+        debug=False,
+        proxies: Optional[dict] = None,
+        on_message=None,
+        on_close=None,
+        on_error=None,
+        receive_queue_size=WEBSOCKET_RECEIVE_QUEUE_SIZE,
+        overflow_policy=BLOCK,
+        consumers=1,
+        websocket_url=None,
+    ):
+        if shards < 1:
+            raise ParameterValueError([str(shards)])
+        if websocket_url is None:
+            _, websocket_url, _ = get_endpoints(orderly_testnet)
+        self.wss_id = wss_id if wss_id else get_uuid()
+        self.max_imbalance = max_imbalance
+        self.on_message = on_message
+        self.router = TopicRouter()
+        self.logger = orderlyLog(debug=debug)
+        self.shards = [
+            OrderlyWebsocketClient(
+                websocket_url,
+                orderly_account_id=orderly_account_id,
+                wss_id=self.wss_id,
+                async_mode=True,
+                timeout=timeout,
+                debug=debug,
+                proxies=proxies,
+                on_message=functools.partial(self._dispatch_message, index),
+                on_close=on_close,
+                on_error=on_error,
+                receive_queue_size=receive_queue_size,
+                overflow_policy=overflow_policy,
+                consumers=consumers,
+            )
+            for index in range(shards)
+        ]
+        self.json_codec = self.shards[0].json_codec
+        # {shard key: shard index} and {shard key: {topic: subscribe message}}
+        self._owners = {}
+        self._topics = {}
+        # {shard key: (old shard, new shard)} of the moves waiting for acks
+        self._moves = {}
+        # {topic: [old shard, last ts, frames at last ts]} while two shards carry topic
+        self._handoffs = {}
+        self._load = [0] * shards
+        self._received = [0] * shards
+        self._last_message = [None] * shards
+        self._last_stats = [(time.monotonic(), 0)] * shards
+
+    def __len__(self):
+        return len(self.shards)
+
+    @property
+    def is_connected(self) -> bool:
+        return all(shard.is_connected for shard in self.shards)
+
+    async def run(self, timeout=WEBSOCKET_READY_TIMEOUT_IN_SECONDS):
+        """Connect every shard and return once all of them are usable"""
+        await asyncio.gather(*(shard.run(timeout) for shard in self.shards))
+
+    async def ensure_init(self, timeout=WEBSOCKET_READY_TIMEOUT_IN_SECONDS):
+        await asyncio.gather(*(shard.socket_manager.ensure_init(timeout) for shard in self.shards))
+
+    async def stop_async(self):
+        await asyncio.gather(*(shard.stop_async() for shard in self.shards))
+
+    async def _dispatch_message(self, index, manager, message):
+        self._received[index] += 1
+        self._last_message[index] = time.monotonic()
+        if self._moves:
+            self._complete_moves(index)
+        topic = message.get("topic")
+        if self._handoffs and message.get("event") == "unsubscribe":
+            handoff = self._handoffs.get(message.get("data"))
+            if handoff is not None and handoff[0] == index:
+                # the old shard stopped sending the topic
+                del self._handoffs[message["data"]]
+        if topic:
+            handoff = self._handoffs.get(topic)
+            if handoff is not None:
+                if not self._first_delivery(handoff, message):
+                    return
+            elif self._owners.get(shard_key(topic), index) != index:
+                # frame from a shard that no longer carries the symbol
+                return
+            if len(self.router) and await self.router.dispatch(manager, message):
+                return
+        if self.on_message:
+            await self.on_message(manager, message)
+
+    @staticmethod
+    def _first_delivery(handoff, message) -> bool:
+        """False for a frame the other shard of a handoff already delivered"""
+        ts, data = message.get("ts"), message.get("data")
+        if ts is None or handoff[1] is None or ts > handoff[1]:
+            handoff[1], handoff[2] = ts, [data]
+            return True
+        if ts == handoff[1] and data not in handoff[2]:
+            handoff[2].append(data)
+            return True
+        return False
+
+    def on(self, pattern: str, handler):
+        """Register handler for a topic or a wildcard pattern such as *@bbo"""
+        self.router.add(pattern, handler)
+
+    def off(self, pattern: str, handler=None):
+        self.router.remove(pattern, handler)
+
+    def shard_of(self, topic: str) -> int:
+        """Index of the shard carrying topic, or the one a new symbol would hash to"""
+        key = shard_key(topic)
+        owner = self._owners.get(key)
+        if owner is not None:
+            return owner
+        return zlib.crc32(key.encode()) % len(self.shards)
+
+    def _place(self, key: str) -> int:
+        index = zlib.crc32(key.encode()) % len(self.shards)
+        lightest = min(range(len(self.shards)), key=self._load.__getitem__)
+        if self._load[index] - self._load[lightest] >= self.max_imbalance:
+            return lightest
+        return index
+
+    def send(self, message: dict):
+        """Send a request such as request_orderbook on the shard of its symbol"""
+        params = message.get("params") or {}
+        topic = message.get("topic") or params.get("symbol")
+        shard = self.shards[self.shard_of(topic)] if topic else self.shards[0]
+        shard.send(message)
+
+    def send_message_to_server(self, message: dict, handler=None):
+        if message["event"] != "unsubscribe":
+            return self.subscribe(message, handler)
+        return self.unsubscribe(message)
+
+    def subscribe(self, message, handler=None):
+        topic = message["topic"]
+        if handler is not None:
+            self.router.add(topic, handler)
+        key = shard_key(topic)
+        topics = self._topics.setdefault(key, {})
+        if key not in self._owners:
+            self._owners[key] = self._place(key)
+        index = self._owners[key]
+        move = self._moves.get(key)
+        if topic not in topics:
+            topics[topic] = message
+            self._load[index if move is None else move[1]] += 1
+        self.shards[index].subscribe(message)
+        if move is not None:
+            self._handoffs.setdefault(topic, [index, None, []])
+            self.shards[move[1]].subscribe(message)
+        self.rebalance()
+
+    def unsubscribe(self, message):
+        topic = message["topic"]
+        self.router.remove(topic)
+        key = shard_key(topic)
+        topics = self._topics.get(key)
+        if not topics or topic not in topics:
+            return
+        index = self._owners[key]
+        move = self._moves.get(key)
+        del topics[topic]
+        self._handoffs.pop(topic, None)
+        self._load[index if move is None else move[1]] -= 1
+        if not topics:
+            del self._topics[key]
+            del self._owners[key]
+            self._moves.pop(key, None)
+        self.shards[index].unsubscribe(message)
+        if move is not None:
+            self.shards[move[1]].unsubscribe(message)
+
+    def rebalance(self) -> int:
+        """Move symbols until the shards are within max_imbalance topics, returns the symbols moved"""
+        moved = 0
+        while True:
+            heaviest = max(range(len(self.shards)), key=self._load.__getitem__)
+            lightest = min(range(len(self.shards)), key=self._load.__getitem__)
+            gap = self._load[heaviest] - self._load[lightest]
+            if gap <= self.max_imbalance:
+                return moved
+            # the largest symbol whose move narrows the gap
+            candidates = [
+                (len(topics), key)
+                for key, topics in self._topics.items()
+                if key not in self._moves and self._owners[key] == heaviest and len(topics) < gap
+            ]
+            if not candidates:
+                return moved
+            _, key = max(candidates)
+            self._move(key, lightest)
+            moved += 1
+
+    def _move(self, key: str, index: int):
+        """Subscribe key on shard index, the old shard keeps delivering it until the acks"""
+        previous = self._owners[key]
+        self._moves[key] = (previous, index)
+        self._load[previous] -= len(self._topics[key])
+        self._load[index] += len(self._topics[key])
+        for topic, message in self._topics[key].items():
+            self._handoffs[topic] = [previous, None, []]
+            self.shards[index].subscribe(message)
+        self.logger.debug(f"Moving {key} from websocket shard {previous} to {index}")
+
+    def _complete_moves(self, index: int):
+        for key, (previous, target) in list(self._moves.items()):
+            if target != index:
+                continue
+            shard = self.shards[target]
+            states = [shard.subscriptions.state(topic) for topic in self._topics[key]]
+            if FAILED in states:
+                # keep the symbol where it is
+                del self._moves[key]
+                self._load[target] -= len(states)
+                self._load[previous] += len(states)
+                for topic in self._topics[key]:
+                    self._handoffs.pop(topic, None)
+                    shard.unsubscribe({"id": self.wss_id, "event": "unsubscribe", "topic": topic})
+                self.logger.warning(f"Moving {key} to websocket shard {target} failed, it stays on {previous}")
+            elif all(state == ACKED for state in states):
+                del self._moves[key]
+                self._owners[key] = target
+                for topic in self._topics[key]:
+                    self.shards[previous].unsubscribe(
+                        {"id": self.wss_id, "event": "unsubscribe", "topic": topic}
+                    )
+                self.logger.debug(f"Moved {key} from websocket shard {previous} to {target}")
+
+    def stats(self) -> list:
+        """Health and throughput of every shard
+
+        messages_per_s is the rate since the previous call, idle_s the
+        seconds since the last message of the shard.
+        """
+        now = time.monotonic()
+        stats = []
+        for index, shard in enumerate(self.shards):
+            manager = getattr(shard, "socket_manager", None)
+            readiness = getattr(manager, "readiness", None)
+            queue = getattr(manager, "receive_queue", None)
+            since, count = self._last_stats[index]
+            received = self._received[index]
+            elapsed = now - since
+            self._last_stats[index] = (now, received)
+            last_message = self._last_message[index]
+            stats.append({
+                "shard": index,
+                "connected": shard.is_connected,
+                "ready": readiness is not None and readiness.is_ready,
+                "waiting_for": readiness.waiting_for() if readiness is not None else ["connection"],
+                "symbols": sum(1 for owner in self._owners.values() if owner == index),
+                "topics": self._load[index],
+                "subscriptions": shard.subscriptions.states(),
+                "messages": received,
+                "messages_per_s": (received - count) / elapsed if elapsed > 0 else 0.0,
+                "idle_s": now - last_message if last_message is not None else None,
+                "queue": queue.stats() if queue is not None else None,
+            })
+        return stats
+
+    # public websocket
+    from orderly_evm_connector.websocket.websocket_api._stream import request_orderbook
+    from orderly_evm_connector.websocket.websocket_api._stream import get_orderbook
+    from orderly_evm_connector.websocket.websocket_api._stream import (
+        get_orderbookupdate,
+    )
+    from orderly_evm_connector.websocket.websocket_api._stream import get_trade
+    from orderly_evm_connector.websocket.websocket_api._stream import get_24h_ticker
+    from orderly_evm_connector.websocket.websocket_api._stream import get_24h_tickers
+    from orderly_evm_connector.websocket.websocket_api._stream import get_bbo
+    from orderly_evm_connector.websocket.websocket_api._stream import get_bbos
+    from orderly_evm_connector.websocket.websocket_api._stream import get_kline
+    from orderly_evm_connector.websocket.websocket_api._stream import get_index_price
+    from orderly_evm_connector.websocket.websocket_api._stream import get_index_prices
+    from orderly_evm_connector.websocket.websocket_api._stream import get_mark_price
+    from orderly_evm_connector.websocket.websocket_api._stream import get_mark_prices
+    from orderly_evm_connector.websocket.websocket_api._stream import get_open_interest
+    from orderly_evm_connector.websocket.websocket_api._stream import (
+        get_estimated_funding_rate,
+    )
+    from orderly_evm_connector.websocket.websocket_api._stream import (
+        get_liquidation_push,
+    )
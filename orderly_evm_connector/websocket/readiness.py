@@ -0,0 +1,125 @@
+import asyncio
+
+from orderly_evm_connector.error import WebsocketClientError
+from orderly_evm_connector.lib.constants import WEBSOCKET_READY_TIMEOUT_IN_SECONDS
+
+
+class Readiness(object):
+    """Readiness of one websocket connection.
+
+    A connection is ready once it is connected, the login was accepted if one
+    was sent, and every subscription sent on it was answered by the server.
+    The state is reset for every new connection, so a reconnect is ready again
+    once the login and the subscriptions replayed on it are acknowledged.
+
+        connected(asyncio.Event): the socket is open
+        authenticated(asyncio.Event): the server accepted the login
+        pending(dict): {topic: None} of the subscriptions not answered yet
+        failed(dict): {topic: error message} of the rejected subscriptions
+    """
+
+    def __init__(self):
+        self.connected = asyncio.Event()
+        self.authenticated = asyncio.Event()
+        self.auth_required = False
+        self.auth_error = None
+        self.pending = {}
+        self.failed = {}
+        self._changed = asyncio.Event()
+
+    @property
+    def is_ready(self) -> bool:
+        return (
+            self.connected.is_set()
+            and (not self.auth_required or self.authenticated.is_set())
+            and not self.pending
+        )
+
+    def waiting_for(self) -> list:
+        """What the connection is still waiting for, for error messages"""
+        waiting = []
+        if not self.connected.is_set():
+            waiting.append("connection")
+        if self.auth_required and not self.authenticated.is_set():
+            waiting.append("login")
+        waiting.extend(f"{topic} subscription" for topic in self.pending)
+        return waiting
+
+    def _notify(self):
+        self._changed.set()
+
+    def reset(self):
+        """Forget the state of the previous connection"""
+        self.connected.clear()
+        self.authenticated.clear()
+        self.auth_required = False
+        self.auth_error = None
+        self.pending.clear()
+        self.failed.clear()
+        self._notify()
+
+    def set_connected(self):
+        self.connected.set()
+        self._notify()
+
+    def expect_auth(self):
+        """A login was sent, ready waits for its response"""
+        self.auth_required = True
+        self.auth_error = None
+        self.authenticated.clear()
+        self._notify()
+
+    def expect_ack(self, topic: str):
+        """A subscription to topic was sent, ready waits for its response"""
+        self.pending[topic] = None
+        self.failed.pop(topic, None)
+        self._notify()
+
+    def discard(self, topic: str):
+        """Stop waiting for the response to a subscription, e.g. after unsubscribing"""
+        self.pending.pop(topic, None)
+        self.failed.pop(topic, None)
+        self._notify()
+
+    def observe(self, message: dict):
+        """Update the state from an auth or subscribe response"""
+        event = message.get("event")
+        if event == "auth":
+            if message.get("success"):
+                self.authenticated.set()
+            else:
+                self.auth_error = message.get("errorMsg") or "login rejected"
+            self._notify()
+        elif event == "subscribe":
+            topic = message.get("data")
+            if not isinstance(topic, str) or topic not in self.pending:
+                # responses without the topic answer the oldest subscription
+                topic = next(iter(self.pending), None)
+            if topic is None:
+                return
+            del self.pending[topic]
+            if not message.get("success", True):
+                self.failed[topic] = message.get("errorMsg") or "subscription rejected"
+            self._notify()
+
+    async def wait(self, timeout: float = WEBSOCKET_READY_TIMEOUT_IN_SECONDS):
+        """Wait until the connection is ready, None waits forever
+
+        Raises WebsocketClientError when the login is rejected or the
+        connection is not ready in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            if self.auth_error is not None:
+                raise WebsocketClientError(f"Websocket login failed: {self.auth_error}")
+            if self.is_ready:
+                return
+            self._changed.clear()
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                raise WebsocketClientError(
+                    f"Websocket not ready after {timeout}s, waiting for {', '.join(self.waiting_for())}"
+                ) from None
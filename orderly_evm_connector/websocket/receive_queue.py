@@ -0,0 +1,132 @@
+import asyncio
+import zlib
+from collections import OrderedDict
+
+from orderly_evm_connector.error import ParameterArgumentError, ParameterValueError
+from orderly_evm_connector.lib.constants import WEBSOCKET_RECEIVE_QUEUE_SIZE
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+CONFLATE = "conflate"
+
+# Topics whose messages are events or deltas rather than the latest state,
+# they are never replaced by a newer message under the conflate policy.
+NON_CONFLATABLE_TOPICS = (
+    "@orderbookupdate",
+    "@trade",
+    "executionreport",
+    "algoexecutionreport",
+    "wallet",
+    "settle",
+    "liquidation",
+    "notifications",
+)
+
+
+class _KeyedQueue(asyncio.Queue):
+    """asyncio.Queue whose pending items can be replaced by key"""
+
+    def _init(self, maxsize):
+        self._queue = OrderedDict()
+        self._sequence = 0
+
+    def _put(self, item):
+        key, message = item
+        if key is None:
+            self._sequence += 1
+            key = self._sequence
+        self._queue[key] = message
+
+    def _get(self):
+        return self._queue.popitem(last=False)[1]
+
+    def replace(self, key, message) -> bool:
+        if key is None or key not in self._queue:
+            return False
+        self._queue[key] = message
+        return True
+
+
+class ReceiveQueue(object):
+    """Bounded queue between the websocket read loop and the message callbacks.
+
+    Args:
+        maxsize(number): messages held per shard before the overflow policy applies
+        policy(string): block - the reader waits for a free slot
+                        drop_oldest - the oldest pending message is dropped
+                        conflate - a pending message is replaced by a newer one
+                                   on the same topic, then drop_oldest applies
+        non_conflatable(tuple): topic fragments never conflated
+        shards(number): one shard per consumer, all messages of a topic go to
+                        the same shard so they are handled in order
+
+    depth, dropped and conflated are exposed for sizing the queue.
+    """
+
+    def __init__(self, maxsize: int = WEBSOCKET_RECEIVE_QUEUE_SIZE, policy: str = BLOCK,
+                 non_conflatable: tuple = NON_CONFLATABLE_TOPICS, shards: int = 1):
+        if policy not in (BLOCK, DROP_OLDEST, CONFLATE):
+            raise ParameterValueError([policy])
+        if shards < 1:
+            raise ParameterArgumentError("shards must be at least 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.non_conflatable = non_conflatable
+        self.shards = shards
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+        self._queues = [_KeyedQueue(maxsize) for _ in range(shards)]
+
+    def shard(self, message) -> int:
+        """Shard of a message, messages without a topic go to the first one"""
+        topic = message.get("topic") if isinstance(message, dict) else None
+        if self.shards == 1 or not topic:
+            return 0
+        return zlib.crc32(topic.encode()) % self.shards
+
+    def _key(self, message):
+        if self.policy != CONFLATE or not isinstance(message, dict):
+            return None
+        topic = message.get("topic")
+        if not topic or any(fragment in topic for fragment in self.non_conflatable):
+            return None
+        return topic
+
+    async def put(self, message):
+        queue = self._queues[self.shard(message)]
+        key = self._key(message)
+        if key is not None and queue.replace(key, message):
+            self.conflated += 1
+            return
+        if self.policy == BLOCK:
+            await queue.put((key, message))
+        else:
+            if queue.full():
+                queue.get_nowait()
+                queue.task_done()
+                self.dropped += 1
+            queue.put_nowait((key, message))
+        self.max_depth = max(self.max_depth, self.depth)
+
+    async def get(self, shard: int = 0):
+        return await self._queues[shard].get()
+
+    def task_done(self, shard: int = 0):
+        self._queues[shard].task_done()
+
+    async def join(self):
+        for queue in self._queues:
+            await queue.join()
+
+    @property
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+        }
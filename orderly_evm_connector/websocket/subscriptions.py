@@ -0,0 +1,106 @@
+import time
+from collections import Counter
+
+from orderly_evm_connector.lib.utils import orderlyLog
+
+# subscription states
+PENDING = "pending"
+ACKED = "acked"
+FAILED = "failed"
+
+
+class Subscription(object):
+    __slots__ = ("topic", "message", "state", "error", "updated")
+
+    def __init__(self, topic: str, message: dict):
+        self.topic = topic
+        self.message = message
+        self.state = PENDING
+        self.error = None
+        self.updated = time.time()
+
+    def set_state(self, state: str, error=None):
+        self.state = state
+        self.error = error
+        self.updated = time.time()
+
+    def __repr__(self):
+        return f"Subscription({self.topic!r}, {self.state})"
+
+
+class SubscriptionRegistry(object):
+    """Subscriptions of one websocket client keyed by topic.
+
+    Each topic is subscribed once: subscribing to a topic that is pending or
+    acknowledged does not send anything. The state of a topic follows the
+    subscribe responses of the server, a failed topic is sent again on the
+    next subscribe. After a reconnect every topic is pending again and is
+    replayed once.
+    """
+
+    def __init__(self, debug=False):
+        self._subscriptions = {}
+        self.logger = orderlyLog(debug=debug)
+
+    def __contains__(self, topic: str) -> bool:
+        return topic in self._subscriptions
+
+    def __iter__(self):
+        return iter(list(self._subscriptions))
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def get(self, topic: str) -> Subscription:
+        return self._subscriptions.get(topic)
+
+    def state(self, topic: str):
+        subscription = self._subscriptions.get(topic)
+        return subscription.state if subscription is not None else None
+
+    def topics(self, state: str = None) -> list:
+        return [
+            topic
+            for topic, subscription in self._subscriptions.items()
+            if state is None or subscription.state == state
+        ]
+
+    def states(self) -> dict:
+        """{state: number of topics}"""
+        return dict(Counter(subscription.state for subscription in self._subscriptions.values()))
+
+    def add(self, message: dict) -> bool:
+        """Register the subscribe message of a topic, True if it has to be sent"""
+        topic = message["topic"]
+        subscription = self._subscriptions.get(topic)
+        if subscription is not None and subscription.state != FAILED:
+            return False
+        self._subscriptions[topic] = Subscription(topic, message)
+        return True
+
+    def remove(self, topic: str) -> Subscription:
+        return self._subscriptions.pop(topic, None)
+
+    def replay(self) -> list:
+        """Mark every topic pending and return their subscribe messages"""
+        for subscription in self._subscriptions.values():
+            subscription.set_state(PENDING)
+        return [subscription.message for subscription in self._subscriptions.values()]
+
+    def observe(self, message: dict):
+        """Update the state of a topic from a subscribe response"""
+        topic = message.get("data")
+        subscription = self._subscriptions.get(topic) if isinstance(topic, str) else None
+        if subscription is None or subscription.state != PENDING:
+            # responses without the topic answer the oldest pending subscription
+            subscription = next(
+                (s for s in self._subscriptions.values() if s.state == PENDING), None
+            )
+        if subscription is None:
+            return
+        if message.get("success", True):
+            subscription.set_state(ACKED)
+        else:
+            error = message.get("errorMsg") or "subscription rejected"
+            subscription.set_state(FAILED, error)
+            self.logger.warning(f"Subscription to {subscription.topic} failed: {error}")
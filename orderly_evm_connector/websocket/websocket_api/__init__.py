@@ -1,6 +1,8 @@
 from typing import Optional
 from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
 from orderly_evm_connector.lib.utils import get_endpoints
+from orderly_evm_connector.lib.constants import WEBSOCKET_RECEIVE_QUEUE_SIZE
+from orderly_evm_connector.websocket.receive_queue import BLOCK
 
 class WebsocketPublicAPIClient(OrderlyWebsocketClient):
     def __init__(
@@ -18,6 +20,9 @@ class WebsocketPublicAPIClient(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        receive_queue_size=WEBSOCKET_RECEIVE_QUEUE_SIZE,
+        overflow_policy=BLOCK,
+        consumers=1,
     ):
         _, self.orderly_websocket_public_endpoint, _ = get_endpoints(orderly_testnet)
         super().__init__(
@@ -32,7 +37,10 @@ class WebsocketPublicAPIClient(OrderlyWebsocketClient):
             timeout=timeout,
             debug=debug,
             proxies=proxies,
-            async_mode=True
+            async_mode=True,
+            receive_queue_size=receive_queue_size,
+            overflow_policy=overflow_policy,
+            consumers=consumers,
         )
 
     # public websocket
@@ -76,6 +84,10 @@ class WebsocketPrivateAPIClient(OrderlyWebsocketClient):
         on_open=None,
         on_close=None,
         on_error=None,
+        receive_queue_size=WEBSOCKET_RECEIVE_QUEUE_SIZE,
+        overflow_policy=BLOCK,
+        consumers=1,
+        clock_sync=None,
     ):
         _, _, self.orderly_websocket_private_endpoint = get_endpoints(orderly_testnet)
         super().__init__(
@@ -92,7 +104,11 @@ class WebsocketPrivateAPIClient(OrderlyWebsocketClient):
             on_open=on_open,
             on_close=on_close,
             on_error=on_error,
-            async_mode=True
+            async_mode=True,
+            receive_queue_size=receive_queue_size,
+            overflow_policy=overflow_policy,
+            consumers=consumers,
+            clock_sync=clock_sync,
         )
 
     # private websocket
@@ -1,39 +1,39 @@
 from orderly_evm_connector.lib.utils import check_required_parameters
 
 
-def get_account(self):
+def get_account(self, handler=None):
     """Push interval: real-time push
     https://docs-api-evm.orderly.network/#websocket-api-private-account
     """
     _message = {"id": self.wss_id, "topic": "account", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_balance(self):
+def get_balance(self, handler=None):
     """Push interval: real-time push
     https://docs-api-evm.orderly.network/#websocket-api-private-balance
     """
     _message = {"id": self.wss_id, "topic": "balance", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_position(self):
+def get_position(self, handler=None):
     """Push interval: push on update
     https://docs-api-evm.orderly.network/#websocket-api-private-position-push
     """
     _message = {"id": self.wss_id, "topic": "position", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_account_liquidations(self):
+def get_account_liquidations(self, handler=None):
     """Push interval: push on update
     https://docs-api-evm.orderly.network/#websocket-api-private-account-liquidations
     """
     _message = {"id": self.wss_id, "topic": "liquidationsaccount", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_liquidator_liquidations(self):
+def get_liquidator_liquidations(self, handler=None):
     """Push interval: push on addition/removal/update from list within 1s
                       1 user_id can have many liquidation_ids
     https://docs-api-evm.orderly.network/#websocket-api-private-liquidator-liquidations
@@ -43,35 +43,35 @@ def get_liquidator_liquidations(self):
         "topic": "liquidatorliquidations",
         "event": "subscribe",
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_wallet_transactions(self):
+def get_wallet_transactions(self, handler=None):
     """Push interval: real-time push on update
     https://docs-api-evm.orderly.network/#websocket-api-private-wallet-transactions
     """
     _message = {"id": self.wss_id, "topic": "wallet", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_pnl_settlement(self):
+def get_pnl_settlement(self, handler=None):
     """Push interval: real-time push on update
     https://docs-api-evm.orderly.network/#websocket-api-private-pnl-settlement
     """
     _message = {"id": self.wss_id, "topic": "settle", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_notifications(self):
+def get_notifications(self, handler=None):
     """Push interval: real-time push
     https://docs-api-evm.orderly.network/#websocket-api-private-notifications
     """
     _message = {"id": self.wss_id, "topic": "notifications", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
-def get_execution_report(self):
+def get_execution_report(self, handler=None):
     """Push interval: real-time push
     https://docs-api-evm.orderly.network/#websocket-api-private-notifications
     """
     _message = {"id": self.wss_id, "topic": "executionreport", "event": "subscribe"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
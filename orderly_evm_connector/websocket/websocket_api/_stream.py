@@ -14,61 +14,61 @@ def request_orderbook(self, type: str, symbol: str):
     self.send(_message)
 
 
-def get_orderbook(self, topic: str):
+def get_orderbook(self, topic: str, handler=None):
     """{symbol}@orderbook depth 100 push every 1s
 
     https://docs-api-evm.orderly.network/?shell#websocket-api-public-orderbook
     """
     _message = {"id": self.wss_id, "event": "subscribe", "topic": topic}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_orderbookupdate(self, topic: str):
+def get_orderbookupdate(self, topic: str, handler=None):
     """{symbol}@orderbookupdate updated orderbook push every 200ms
 
     https://docs-api-evm.orderly.network/#websocket-api-public-order-book-update
     """
     _message = {"id": self.wss_id, "event": "subscribe", "topic": topic}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_trade(self, topic: str):
+def get_trade(self, topic: str, handler=None):
     """Push interval: real-time push
 
     https://docs-api-evm.orderly.network/#websocket-api-public-trade
     """
     _message = {"id": self.wss_id, "event": "subscribe", "topic": topic}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_24h_ticker(self, topic: str):
+def get_24h_ticker(self, topic: str, handler=None):
     """Push interval: 1s
 
     https://docs-api-evm.orderly.network/#websocket-api-public-24h-ticker
     """
     _message = {"id": self.wss_id, "event": "subscribe", "topic": topic}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_24h_tickers(self):
+def get_24h_tickers(self, handler=None):
     """Push interval: 1s
 
     https://docs-api-evm.orderly.network/#websocket-api-public-24h-tickers
     """
     _message = {"id": self.wss_id, "event": "subscribe", "topic": "tickers"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_bbo(self, topic: str):
+def get_bbo(self, topic: str, handler=None):
     """Push interval: 10ms
 
     https://docs-api-evm.orderly.network/#websocket-api-public-bbo
     """
     _message = {"id": self.wss_id, "event": "subscribe", "topic": topic}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_bbos(self):
+def get_bbos(self, handler=None):
     """Push interval: 1s
     https://docs-api-evm.orderly.network/#websocket-api-public-bbos
     """
@@ -77,10 +77,10 @@ def get_bbos(self):
         "event": "subscribe",
         "topic": "bbos",
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_kline(self, topic: str):
+def get_kline(self, topic: str, handler=None):
     """{time}: 1m/5m/15m/30m/1h/1d/1w/1M
     Push interval: 1s
     Name	Type	Required	Description
@@ -95,10 +95,10 @@ def get_kline(self, topic: str):
         "event": "subscribe",
         "topic": topic,
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_index_price(self, topic: str):
+def get_index_price(self, topic: str, handler=None):
     """Push interval: 1s
     https://docs-api-evm.orderly.network/#websocket-api-public-index-price
     """
@@ -107,10 +107,10 @@ def get_index_price(self, topic: str):
         "event": "subscribe",
         "topic": topic,
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_index_prices(self):
+def get_index_prices(self, handler=None):
     """Push interval: 1s
     https://docs-api-evm.orderly.network/#websocket-api-public-index-prices
     """
@@ -119,10 +119,10 @@ def get_index_prices(self):
         "event": "subscribe",
         "topic": "indexprices",
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_mark_price(self, topic: str):
+def get_mark_price(self, topic: str, handler=None):
     """Push interval: 1s
     https://docs-api-evm.orderly.network/#websocket-api-public-mark-price
     """
@@ -131,10 +131,10 @@ def get_mark_price(self, topic: str):
         "event": "subscribe",
         "topic": topic,
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_mark_prices(self):
+def get_mark_prices(self, handler=None):
     """Push interval: 1s
     https://docs-api-evm.orderly.network/#websocket-api-public-mark-prices
     """
@@ -143,10 +143,10 @@ def get_mark_prices(self):
         "event": "subscribe",
         "topic": "markprices",
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_open_interest(self, topic: str):
+def get_open_interest(self, topic: str, handler=None):
     """Push interval: push every 1 second if open interest change and 10 seconds force update even if no change.
     https://docs-api-evm.orderly.network/#websocket-api-public-open-interest
     """
@@ -155,10 +155,10 @@ def get_open_interest(self, topic: str):
         "event": "subscribe",
         "topic": topic,
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_estimated_funding_rate(self, topic: str):
+def get_estimated_funding_rate(self, topic: str, handler=None):
     """Push interval: 15s.
     https://docs-api-evm.orderly.network/#websocket-api-public-estimated-funding-rate
     """
@@ -167,12 +167,12 @@ def get_estimated_funding_rate(self, topic: str):
         "event": "subscribe",
         "topic": topic,
     }
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
 
 
-def get_liquidation_push(self):
+def get_liquidation_push(self, handler=None):
     """Push interval: push on addition/removal/update from list within 1s.
     https://docs-api-evm.orderly.network/#websocket-api-public-liquidation-push
     """
     _message = {"id": self.wss_id, "event": "subscribe", "topic": "liquidation"}
-    self.send_message_to_server(_message)
+    self.send_message_to_server(_message, handler)
@@ -1,5 +1,5 @@
 import asyncio
-import json
+import inspect
 from typing import Optional
 
 from orderly_evm_connector.lib.utils import (
@@ -8,7 +8,16 @@ from orderly_evm_connector.lib.utils import (
     parse_proxies,
     generate_signature,
 )
+from orderly_evm_connector.lib.constants import (
+    WEBSOCKET_RECEIVE_QUEUE_SIZE,
+    WEBSOCKET_READY_TIMEOUT_IN_SECONDS,
+)
+from orderly_evm_connector.error import WebsocketClientError
+from orderly_evm_connector.lib.json_codec import get_codec
 from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
+from orderly_evm_connector.websocket.dispatch import TopicRouter
+from orderly_evm_connector.websocket.receive_queue import BLOCK
+from orderly_evm_connector.websocket.subscriptions import SubscriptionRegistry
 from orderly_evm_connector.websocket.orderly_socket_manager import OrderlySocketManager
 
 
@@ -29,6 +38,11 @@ class OrderlyWebsocketClient:
         on_open=None,
         on_close=None,
         on_error=None,
+        receive_queue_size=WEBSOCKET_RECEIVE_QUEUE_SIZE,
+        overflow_policy=BLOCK,
+        consumers=1,
+        json_codec=None,
+        clock_sync=None,
     ):
         orderly_account_id = (
             orderly_account_id
@@ -42,14 +56,22 @@ class OrderlyWebsocketClient:
         self.private = private
         self.timeout = timeout
         self.logger = orderlyLog(debug=debug)
-        self.subscriptions = []
+        self.subscriptions = SubscriptionRegistry(debug=debug)
         self._proxy_params = parse_proxies(proxies) if proxies else {}
         self.on_message = on_message
+        self.router = TopicRouter()
         self.on_open = on_open
         self.on_close = on_close
         self.on_error = on_error
         self.debug = debug
+        self.receive_queue_size = receive_queue_size
+        self.overflow_policy = overflow_policy
+        self.consumers = consumers
+        self.json_codec = json_codec if json_codec is not None else get_codec()
+        # lib.clock.ClockSync correcting the login timestamp
+        self.clock_sync = clock_sync
         self.is_connected = False
+        self.async_mode = async_mode
         if not async_mode:
             self._initialize_socket(
                 self.websocket_url,
@@ -67,17 +89,51 @@ class OrderlyWebsocketClient:
         self.logger.debug("Orderly WebSocket Client started.")
 
 
-    async def run(self):
+    async def run(self, timeout=WEBSOCKET_READY_TIMEOUT_IN_SECONDS):
+        """Connect and return once the stream is usable, see AsyncWebsocketManager.ensure_init"""
         manager = AsyncWebsocketManager(
             websocket_url=self.websocket_url,
-            on_message=self.on_message,
+            on_message=self._dispatch_message,
             on_open=self.on_socket_open,
             on_close=self.on_close,
             on_error=self.on_error,
-            debug=self.debug
+            debug=self.debug,
+            receive_queue_size=self.receive_queue_size,
+            overflow_policy=self.overflow_policy,
+            consumers=self.consumers,
+            json_codec=self.json_codec,
+            subscriptions=self.subscriptions,
         )
-        asyncio.create_task(manager.run())
-        await manager.ensure_init()
+        self._run_task = asyncio.create_task(manager.run())
+        ready = asyncio.ensure_future(manager.ensure_init(timeout))
+        await asyncio.wait({self._run_task, ready}, return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            # the connection attempts gave up before the stream was ready
+            ready.cancel()
+            self._run_task.result()
+            raise WebsocketClientError("Websocket connection closed before it was ready")
+        ready.result()
+
+    async def _dispatch_message(self, manager, message):
+        # topics with registered handlers skip on_message
+        if len(self.router) and await self.router.dispatch(manager, message):
+            return
+        if self.on_message:
+            await self.on_message(manager, message)
+
+    def _check_handler(self, handler):
+        if not self.async_mode and inspect.iscoroutinefunction(handler):
+            raise WebsocketClientError(
+                f"Handler {handler} is a coroutine function, it needs async_mode"
+            )
+
+    def on(self, pattern: str, handler):
+        """Register handler for a topic or a wildcard pattern such as *@bbo"""
+        self._check_handler(handler)
+        self.router.add(pattern, handler)
+
+    def off(self, pattern: str, handler=None):
+        self.router.remove(pattern, handler)
 
     def _auth_params(self):
         return {
@@ -113,6 +169,9 @@ class OrderlyWebsocketClient:
             timeout=timeout,
             debug=debug,
             proxies=proxies,
+            json_codec=self.json_codec,
+            subscriptions=self.subscriptions,
+            router=self.router,
         )
 
     def on_socket_open(self, socket_manager):
@@ -123,37 +182,68 @@ class OrderlyWebsocketClient:
         self.is_connected = True
         if self.private:
             self.auth_login()
-        for message in self.subscriptions:
-            self.socket_manager.send_message(json.dumps(message))
+        # every topic is replayed once, in batches from one send task
+        messages = self.subscriptions.replay()
+        for message in messages:
+            self._expect_ack(message)
+        self.socket_manager.send_messages([self.json_codec.dumps(message) for message in messages])
+
+    def _readiness(self):
+        # only the async manager tracks readiness
+        return getattr(self.socket_manager, "readiness", None)
+
+    def _expect_ack(self, message):
+        readiness = self._readiness()
+        if readiness is not None and message.get("topic"):
+            readiness.expect_ack(message["topic"])
 
     def auth_login(self):
         if not self.socket_manager._login:
             if self.orderly_secret:
-                self._timestamp, self._signature = generate_signature(self.orderly_secret)
+                timestamp = (
+                    self.clock_sync.now()
+                    if self.clock_sync is not None and self.clock_sync.apply
+                    else None
+                )
+                self._timestamp, self._signature = generate_signature(self.orderly_secret, timestamp=timestamp)
                 self.auth_params = self._auth_params()
                 self.auth_params['params']['timestamp'] = int(self.auth_params['params']['timestamp'])
-            self.socket_manager.send_message(json.dumps(self.auth_params))
+            readiness = self._readiness()
+            if readiness is not None:
+                readiness.expect_auth()
+            self.socket_manager.send_message(self.json_codec.dumps(self.auth_params))
             self.socket_manager._login = True
 
     def send(self, message: dict):
-        self.socket_manager.send_message(json.dumps(message))
+        self.socket_manager.send_message(self.json_codec.dumps(message))
 
-    def send_message_to_server(self, message: dict):
+    def send_message_to_server(self, message: dict, handler=None):
         if self.private:
             self.auth_login()
         action = message["event"]
         if action and action != "unsubscribe":
-            return self.subscribe(message)
+            return self.subscribe(message, handler)
         else:
             return self.unsubscribe(message)
 
-    def subscribe(self, message):
-        if str(message) not in self.subscriptions:
-            self.subscriptions.append(message)
-        self.socket_manager.send_message(json.dumps(message))
+    def subscribe(self, message, handler=None):
+        if handler is not None:
+            self._check_handler(handler)
+            self.router.add(message["topic"], handler)
+        if message.get("topic") and not self.subscriptions.add(message):
+            # already subscribed or waiting for the response
+            return
+        self._expect_ack(message)
+        self.socket_manager.send_message(self.json_codec.dumps(message))
 
     def unsubscribe(self, message):
-        self.socket_manager.send_message(json.dumps(message))
+        if message.get("topic"):
+            self.router.remove(message["topic"])
+            self.subscriptions.remove(message["topic"])
+            readiness = self._readiness()
+            if readiness is not None:
+                readiness.discard(message["topic"])
+        self.socket_manager.send_message(self.json_codec.dumps(message))
 
     def stop(self, id=None):
         self.socket_manager.close()
@@ -0,0 +1,137 @@
+import asyncio
+
+from aiohttp import web
+from orderly_evm_connector.lib.cache import ResponseCache
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import local_server
+
+
+def counting_fetch(calls, value="data", delay=0):
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return {"value": value, "call": len(calls)}
+
+    return fetch
+
+
+def test_cache_hits_until_ttl_expires():
+    cache = ResponseCache(ttls={"GET /v1/public/token": 0.05})
+    calls = []
+
+    async def run():
+        first = await cache.get_or_fetch("GET", "/v1/public/token", counting_fetch(calls))
+        second = await cache.get_or_fetch("GET", "/v1/public/token", counting_fetch(calls))
+        second.should.be(first)
+        await asyncio.sleep(0.06)
+        await cache.get_or_fetch("GET", "/v1/public/token", counting_fetch(calls))
+
+    asyncio.run(run())
+    len(calls).should.equal(2)
+    cache.stats().should.equal({"hits": 1, "misses": 2, "size": 1})
+
+
+def test_cache_ignores_endpoints_without_ttl():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        for _ in range(3):
+            await cache.get_or_fetch("GET", "/v1/public/system_info", counting_fetch(calls))
+
+    asyncio.run(run())
+    len(calls).should.equal(3)
+    len(cache).should.equal(0)
+
+
+def test_concurrent_misses_share_one_request():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                cache.get_or_fetch("GET", "/v1/public/info", counting_fetch(calls, delay=0.01))
+                for _ in range(20)
+            ]
+        )
+
+    results = asyncio.run(run())
+    len(calls).should.equal(1)
+    set(id(result) for result in results).should.have.length_of(1)
+
+
+def test_failed_fetch_is_not_cached_and_reaches_every_waiter():
+    cache = ResponseCache()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        results = await asyncio.gather(
+            *[cache.get_or_fetch("GET", "/v1/public/info", failing) for _ in range(3)],
+            return_exceptions=True,
+        )
+        [type(r) for r in results].should.equal([ValueError] * 3)
+        await cache.get_or_fetch("GET", "/v1/public/info", counting_fetch(calls))
+
+    asyncio.run(run())
+    len(calls).should.equal(2)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    calls = []
+
+    async def run():
+        for symbol in ["A", "B", "A", "C"]:
+            await cache.get_or_fetch("GET", f"/v1/public/info/{symbol}", counting_fetch(calls))
+        await cache.get_or_fetch("GET", "/v1/public/info/A", counting_fetch(calls))
+        await cache.get_or_fetch("GET", "/v1/public/info/B", counting_fetch(calls))
+
+    asyncio.run(run())
+    len(calls).should.equal(4)
+
+
+def test_invalidate_by_path_and_template():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        for path in ["/v1/public/info/A", "/v1/public/info/B", "/v1/public/token"]:
+            await cache.get_or_fetch("GET", path, counting_fetch(calls))
+        cache.invalidate("/v1/public/info/A")
+        len(cache).should.equal(2)
+        cache.invalidate("/v1/public/info/{symbol}")
+        len(cache).should.equal(1)
+        cache.invalidate()
+        len(cache).should.equal(0)
+
+    asyncio.run(run())
+
+
+def test_client_serves_reference_data_from_cache():
+    hits = []
+
+    async def handler(request):
+        hits.append(request.path)
+        return web.json_response({"success": True, "data": {"rows": []}})
+
+    async def run():
+        async with local_server([web.get("/v1/public/info", handler)]) as url:
+            client = Client(response_cache=ResponseCache())
+            client.orderly_endpoint = url
+            try:
+                first = await client.get_available_symbols()
+                second = await client.get_available_symbols()
+                second.should.equal(first)
+                client.response_cache.invalidate("/v1/public/info")
+                await client.get_available_symbols()
+            finally:
+                await client.close()
+
+    asyncio.run(run())
+    hits.should.equal(["/v1/public/info", "/v1/public/info"])
@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from aiohttp import web
+from orderly_evm_connector.lib.clock import ClockSync
+from orderly_evm_connector.lib.utils import get_timestamp
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+
+def test_offset_is_taken_from_the_shortest_round_trip():
+    clock = ClockSync(apply=False)
+    # server 1000 ms ahead, the slow sample is off by its asymmetric delay
+    clock.observe(10_000 + 1000 + 50, 10.0, 10.1).should.be.true
+    clock.offset_ms.should.be.within(999.99, 1000.01)
+    clock.observe(20_000 + 1000 + 400, 20.0, 20.5)
+    clock.offset_ms.should.be.within(999.99, 1000.01)
+    clock.rtt_ms.should.be.within(99.99, 100.01)
+    clock.jitter_ms.should.be.greater_than(0)
+    clock.stats()["samples"].should.equal(2)
+
+
+def test_estimate_is_smoothed():
+    clock = ClockSync(window=1, alpha=0.5, apply=False)
+    clock.observe(10_000, 10.0, 10.0)
+    clock.observe(20_000 + 100, 20.0, 20.0)
+    clock.offset_ms.should.equal(50)
+
+
+def test_invalid_samples_are_ignored():
+    clock = ClockSync(apply=False)
+    clock.observe(None, 1.0, 1.1).should.be.false
+    clock.observe(1000, 1.1, 1.0).should.be.false
+    clock.observe_response({"success": True}, 1.0, 1.1).should.be.false
+    clock.stats()["samples"].should.equal(0)
+
+
+def test_each_client_keeps_the_offset_of_its_own_clock():
+    orderly_secret, _ = generate_orderly_secret()
+    mainnet, testnet = ClockSync(), ClockSync()
+    mainnet.observe(time.time() * 1000 + 60_000, time.time(), time.time())
+    testnet.observe(time.time() * 1000 - 5_000, time.time(), time.time())
+    clients = [
+        Client(orderly_key=random_str(), orderly_secret=orderly_secret, clock_sync=clock)
+        for clock in (mainnet, testnet, ClockSync(apply=False), None)
+    ]
+    local = time.time() * 1000
+    offsets = [client._server_timestamp() - local for client in clients]
+    offsets[0].should.be.within(59_900, 60_100)
+    offsets[1].should.be.within(-5_100, -4_900)
+    # nothing leaks into the process wide timestamp
+    offsets[2].should.be.within(-100, 100)
+    offsets[3].should.be.within(-100, 100)
+    (get_timestamp() - time.time() * 1000).should.be.within(-100, 100)
+
+
+def test_signed_requests_use_the_server_clock():
+    orderly_secret, _ = generate_orderly_secret()
+    skew = 30_000
+    seen = []
+
+    async def system_info(request):
+        return web.json_response(
+            {"success": True, "data": {"status": 0}, "timestamp": int(time.time() * 1000) + skew}
+        )
+
+    async def orders(request):
+        seen.append(int(request.headers["orderly-timestamp"]))
+        return web.json_response({"success": True, "data": {"rows": []}})
+
+    async def run():
+        routes = [web.get("/v1/public/system_info", system_info), web.get("/v1/orders", orders)]
+        async with local_server(routes) as url:
+            clock = ClockSync()
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                orderly_account_id=random_str(),
+                clock_sync=clock,
+            )
+            client.orderly_endpoint = url
+            try:
+                await clock.sync(client, samples=2)
+                await client.get_orders()
+            finally:
+                await client.close()
+        return clock
+
+    clock = asyncio.run(run())
+    clock.offset_ms.should.be.within(skew - 100, skew + 100)
+    clock.stats()["samples"].should.equal(2)
+    (seen[0] - time.time() * 1000).should.be.within(skew - 1000, skew + 100)
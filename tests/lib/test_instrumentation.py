@@ -0,0 +1,130 @@
+import asyncio
+
+from aiohttp import web
+from orderly_evm_connector.error import ClientError, RateLimitError
+from orderly_evm_connector.lib.instrumentation import (
+    CLIENT,
+    SERVER,
+    InMemoryExporter,
+    Instrumentation,
+    LatencyHistogram,
+)
+from orderly_evm_connector.lib.rate_limit import FAIL_FAST, RateLimiter
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for value in [0.5, 3, 3, 4, 40, 700]:
+        histogram.observe(value)
+    histogram.count.should.equal(6)
+    histogram.quantile(0.5).should.equal(5)
+    histogram.quantile(1).should.equal(700)
+    histogram.min.should.equal(0.5)
+    LatencyHistogram().quantile(0.5).should.be.none
+
+
+def test_requests_are_recorded_per_endpoint():
+    orderly_secret, _ = generate_orderly_secret()
+    metrics = InMemoryExporter()
+    attempts = []
+
+    async def order(request):
+        return web.json_response({"success": True, "data": {"order_id": 1}})
+
+    async def trades(request):
+        return web.json_response({"success": True, "data": {"rows": []}})
+
+    async def cancel(request):
+        attempts.append(1)
+        if len(attempts) == 1:
+            return web.json_response({"code": -1003, "message": "too many"}, status=429)
+        return web.json_response({"code": -1006, "message": "not found"}, status=400)
+
+    async def run():
+        routes = [
+            web.post("/v1/order", order),
+            web.get("/v1/order/{order_id}/trades", trades),
+            web.delete("/v1/order", cancel),
+        ]
+        async with local_server(routes) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                orderly_account_id=random_str(),
+                instrumentation=Instrumentation(metrics),
+            )
+            client.orderly_endpoint = url
+            try:
+                await client.create_order("PERP_BTC_USDC", "MARKET", "BUY", order_quantity=1)
+                await client.get_all_trades_of_order(11)
+                await client.get_all_trades_of_order(12)
+                for _ in range(2):
+                    try:
+                        await client.cancel_order(1, "PERP_BTC_USDC")
+                    except ClientError:
+                        pass
+            finally:
+                await client.close()
+
+    asyncio.run(run())
+    metrics.status_counts("POST /v1/order").should.equal({200: 1})
+    metrics.status_counts("GET /v1/order/{order_id}/trades").should.equal({200: 2})
+    metrics.status_counts("DELETE /v1/order").should.equal({429: 1, 400: 1})
+    metrics.rate_limited[("DELETE /v1/order", SERVER)].should.equal(1)
+
+    first = metrics.records[0]
+    first.connect.should.be.a(float)
+    first.ttfb.should.be.lower_than_or_equal_to(first.total)
+    first.request_bytes.should.be.greater_than(0)
+    first.response_bytes.should.be.greater_than(0)
+    # the second request reuses the pooled connection
+    metrics.records[1].connect.should.be.none
+    metrics.histogram("GET /v1/order/{order_id}/trades").count.should.equal(2)
+
+    snapshot = metrics.snapshot()
+    snapshot["DELETE /v1/order"]["statuses"].should.equal({429: 1, 400: 1})
+    snapshot["POST /v1/order"]["latency_ms"]["total"]["count"].should.equal(1)
+
+
+def test_client_side_rate_limit_rejections_are_counted():
+    orderly_secret, _ = generate_orderly_secret()
+    metrics = InMemoryExporter()
+
+    async def batch_order(request):
+        return web.json_response({"success": True})
+
+    async def run():
+        async with local_server([web.post("/v1/batch-order", batch_order)]) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                rate_limiter=RateLimiter(policy=FAIL_FAST, limits={"POST /v1/batch-order": (1, 60, "key")}),
+                instrumentation=Instrumentation(metrics),
+            )
+            client.orderly_endpoint = url
+            order = {"symbol": "PERP_BTC_USDC", "order_type": "MARKET", "side": "BUY"}
+            try:
+                await client.batch_create_order([order])
+                try:
+                    await client.batch_create_order([order])
+                except RateLimitError:
+                    pass
+            finally:
+                await client.close()
+
+    asyncio.run(run())
+    metrics.rate_limited.should.equal({("POST /v1/batch-order", CLIENT): 1})
+    metrics.status_counts().should.equal({200: 1})
+
+
+def test_uninstrumented_client_attaches_no_trace_config():
+    async def run():
+        client = Client()
+        try:
+            return list(client.session.trace_configs)
+        finally:
+            await client.close()
+
+    asyncio.run(run()).should.equal([])
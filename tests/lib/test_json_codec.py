@@ -0,0 +1,57 @@
+import asyncio
+import base64
+
+from aiohttp import web
+from orderly_evm_connector.error import ParameterValueError
+from orderly_evm_connector.lib.json_codec import ORJSON, STDLIB, get_codec
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+PAYLOAD = {
+    "symbol": "PERP_BTC_USDC",
+    "order_type": "LIMIT",
+    "side": "BUY",
+    "order_price": 60000.1,
+    "order_quantity": 0.5,
+    "client_order_id": "tag/é",
+}
+
+
+def test_default_codec_prefers_orjson():
+    get_codec().name.should.equal(ORJSON)
+    get_codec.when.called_with("simplejson").should.throw(ParameterValueError)
+
+
+def test_codecs_produce_the_same_compact_document():
+    orjson_codec, stdlib_codec = get_codec(ORJSON), get_codec(STDLIB)
+    stdlib_codec.dumps(PAYLOAD).should.equal(orjson_codec.dumps(PAYLOAD))
+    stdlib_codec.dumps_bytes(PAYLOAD).should.equal(orjson_codec.dumps_bytes(PAYLOAD))
+    stdlib_codec.loads(orjson_codec.dumps_bytes(PAYLOAD)).should.equal(PAYLOAD)
+    orjson_codec.loads.when.called_with("{not json").should.throw(ValueError)
+
+
+def test_signed_body_is_the_body_sent_with_every_codec():
+    orderly_secret, public_key = generate_orderly_secret()
+    bodies = []
+
+    async def create_order(request):
+        body = await request.text()
+        message = "{}{}{}{}".format(
+            request.headers["orderly-timestamp"], request.method, request.path, body
+        )
+        public_key.verify(base64.b64decode(request.headers["orderly-signature"]), message.encode())
+        bodies.append(body)
+        return web.json_response({"success": True})
+
+    async def run(codec):
+        async with local_server([web.post("/v1/order", create_order)]) as url:
+            client = Client(orderly_key=random_str(), orderly_secret=orderly_secret, json_codec=codec)
+            client.orderly_endpoint = url
+            try:
+                return await client.create_order(**PAYLOAD)
+            finally:
+                await client.close()
+
+    for name in (ORJSON, STDLIB):
+        asyncio.run(run(get_codec(name))).should.equal({"success": True})
+    bodies[0].should.equal(bodies[1])
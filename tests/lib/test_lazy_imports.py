@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+from orderly_evm_connector.lib.utils import generate_wallet_signature
+
+_CHECK = """
+import sys
+import orderly_evm_connector.rest
+import orderly_evm_connector.websocket.websocket_api
+print(",".join(m for m in ("web3", "eth_account", "eth_utils", "cryptography") if m in sys.modules))
+"""
+
+
+def test_client_import_does_not_load_signing_stack():
+    result = subprocess.run(
+        [sys.executable, "-c", _CHECK], capture_output=True, text=True, check=True
+    )
+    result.stdout.strip().should.equal("")
+
+
+def test_wallet_signature_still_works():
+    message = {
+        "types": {
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+            ],
+            "Ping": [{"name": "value", "type": "uint256"}],
+        },
+        "primaryType": "Ping",
+        "domain": {"name": "Orderly", "version": "1", "chainId": 421614},
+        "message": {"value": 1},
+    }
+    signature = generate_wallet_signature("11" * 32, message=message)
+    signature.should.match(r"^0x[0-9a-f]{130}$")
@@ -0,0 +1,91 @@
+import asyncio
+
+from orderly_evm_connector.lib.pagination import paginate
+
+
+def make_fetch(total, calls, delay=0.01, with_meta=True):
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def fetch(page, size):
+        calls.append(page)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(delay)
+        state["in_flight"] -= 1
+        start = (page - 1) * size
+        rows = list(range(start, min(start + size, total)))
+        data = {"rows": rows}
+        if with_meta:
+            data["meta"] = {"total": total, "records_per_page": size, "current_page": page}
+        return {"success": True, "data": data}
+
+    return fetch, state
+
+
+def collect(iterator, limit=None):
+    async def run():
+        rows = []
+        async for row in iterator:
+            rows.append(row)
+            if limit is not None and len(rows) >= limit:
+                break
+        return rows
+
+    return asyncio.run(run())
+
+
+def test_paginate_yields_all_rows_in_order():
+    calls = []
+    fetch, _ = make_fetch(23, calls)
+    collect(paginate(fetch, size=5)).should.equal(list(range(23)))
+    calls.should.equal([1, 2, 3, 4, 5])
+
+
+def test_paginate_without_meta_stops_on_short_page():
+    calls = []
+    fetch, _ = make_fetch(10, calls, with_meta=False)
+    collect(paginate(fetch, size=5)).should.equal(list(range(10)))
+    calls.should.equal([1, 2, 3])
+
+
+def test_paginate_fetches_pages_in_parallel_once_total_is_known():
+    calls = []
+    fetch, state = make_fetch(100, calls)
+    collect(paginate(fetch, size=5, max_parallel=4)).should.equal(list(range(100)))
+    sorted(calls).should.equal(list(range(1, 21)))
+    state["max_in_flight"].should.equal(4)
+
+
+def test_paginate_prefetches_next_page():
+    calls = []
+    fetch, _ = make_fetch(10, calls)
+
+    async def run():
+        iterator = paginate(fetch, size=5)
+        await iterator.__anext__()
+        await asyncio.sleep(0)
+        await iterator.aclose()
+
+    asyncio.run(run())
+    calls.should.equal([1, 2])
+
+
+def test_paginate_without_prefetch_waits_for_consumer():
+    calls = []
+    fetch, _ = make_fetch(10, calls)
+
+    async def run():
+        iterator = paginate(fetch, size=5, prefetch=False)
+        await iterator.__anext__()
+        await asyncio.sleep(0)
+        await iterator.aclose()
+
+    asyncio.run(run())
+    calls.should.equal([1])
+
+
+def test_paginate_unwraps_show_header_responses():
+    async def fetch(page, size):
+        return {"header": {}, "data": {"data": {"rows": ["a"], "meta": {"total": 1}}}}
+
+    collect(paginate(fetch, size=25)).should.equal(["a"])
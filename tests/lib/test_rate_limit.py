@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from aiohttp import web
+from orderly_evm_connector.error import RateLimitError
+from orderly_evm_connector.lib.rate_limit import (
+    FAIL_FAST,
+    IP_SCOPE,
+    RateLimiter,
+    TokenBucket,
+)
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+
+def test_resolve_endpoint_templates():
+    limiter = RateLimiter()
+    limiter.resolve("GET", "/v1/order/15").should.equal("GET /v1/order/{order_id}")
+    limiter.resolve("GET", "/v1/order/15/trades").should.equal(
+        "GET /v1/order/{order_id}/trades"
+    )
+    limiter.resolve("DELETE", "/v1/order?order_id=1&symbol=PERP_BTC_USDC").should.equal(
+        "DELETE /v1/order"
+    )
+    limiter.resolve("GET", "/v1/unknown").should.be.none
+
+
+def test_token_bucket_refills_over_period():
+    bucket = TokenBucket(10, 1)
+    [bucket.try_acquire() for _ in range(10)].should.equal([True] * 10)
+    bucket.try_acquire().should.be.false
+    bucket.wait_time().should.be.within(0.05, 0.1)
+    bucket.reserve().should.be.within(0.05, 0.1)
+    bucket.level.should.be.lower_than(0)
+
+
+def test_fail_fast_policy():
+    limiter = RateLimiter(policy=FAIL_FAST)
+
+    async def run():
+        await limiter.acquire("POST", "/v1/batch-order", "key-a")
+        # buckets are kept per orderly key
+        await limiter.acquire("POST", "/v1/batch-order", "key-b")
+        await limiter.acquire("POST", "/v1/batch-order", "key-a")
+
+    asyncio.run.when.called_with(run()).should.throw(RateLimitError)
+    limiter.level("POST", "/v1/batch-order", "key-b").should.be.lower_than(1)
+
+
+def test_queue_policy_waits_for_tokens():
+    limiter = RateLimiter(limits={"GET /v1/public/token": (2, 0.2, IP_SCOPE)})
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(
+            *[limiter.acquire("GET", "/v1/public/token") for _ in range(4)]
+        )
+        return time.monotonic() - start
+
+    asyncio.run(run()).should.be.within(0.18, 0.4)
+    list(limiter.levels().keys()).should.equal([("GET /v1/public/token", IP_SCOPE)])
+
+
+def test_client_fails_fast_before_sending():
+    orderly_secret, _ = generate_orderly_secret()
+    sent = []
+
+    async def batch_order(request):
+        sent.append(await request.json())
+        return web.json_response({"success": True})
+
+    async def run():
+        async with local_server([web.post("/v1/batch-order", batch_order)]) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                rate_limiter=RateLimiter(policy=FAIL_FAST),
+            )
+            client.orderly_endpoint = url
+            order = {"symbol": "PERP_BTC_USDC", "order_type": "MARKET", "side": "BUY"}
+            try:
+                await client.batch_create_order([order])
+                await client.batch_create_order([order])
+            finally:
+                await client.close()
+
+    asyncio.run.when.called_with(run()).should.throw(RateLimitError)
+    sent.should.have.length_of(1)
@@ -0,0 +1,141 @@
+import asyncio
+import base64
+import time
+
+from aiohttp import web
+from orderly_evm_connector.error import ClientError, ServerError
+from orderly_evm_connector.lib.retry import (
+    CANCEL,
+    CREATE,
+    OTHER,
+    READ,
+    RetryBudget,
+    RetryPolicy,
+)
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+
+def test_endpoint_classes_and_attempts():
+    policy = RetryPolicy()
+    policy.classify("GET", "/v1/orders?size=500").should.equal(READ)
+    policy.classify("DELETE", "/v1/order?order_id=1").should.equal(CANCEL)
+    policy.classify("POST", "/v1/batch-order").should.equal(CREATE)
+    policy.classify("PUT", "/v1/order").should.equal(OTHER)
+    policy.attempts("GET", "/v1/orders").should.equal(3)
+    policy.attempts("POST", "/v1/order", {"symbol": "PERP_BTC_USDC"}).should.equal(1)
+    policy.attempts("POST", "/v1/order", {"client_order_id": "a"}).should.equal(3)
+    policy.attempts(
+        "POST", "/v1/batch-order", {"orders": [{"client_order_id": "a"}, {"symbol": "x"}]}
+    ).should.equal(1)
+    policy.attempts("POST", "/v1/withdraw_request", {"client_order_id": "a"}).should.equal(1)
+    RetryPolicy.when.called_with(max_attempts={"writes": 2}).should.throw(Exception)
+
+
+def test_retry_after_header():
+    policy = RetryPolicy()
+    policy.retry_after({"Retry-After": "1.5"}).should.equal(1.5)
+    policy.retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}).should.equal(0.0)
+    policy.retry_after({}).should.be.none
+    policy.delay(ClientError(429, -1003, "", {"Retry-After": "60"}), 1).should.be.none
+    policy.delay(ClientError(429, -1003, "", {"Retry-After": "0.5"}), 1).should.equal(0.5)
+    policy.delay(ClientError(401, -1004, "", {}), 1).should.be.none
+    policy.delay(ServerError(502, ""), 1).should.be.within(0, 0.1)
+
+
+def test_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_per_second=0.001, max_tokens=1)
+    budget.withdraw().should.be.true
+    budget.withdraw().should.be.false
+    budget.deposit()
+    budget.deposit()
+    budget.withdraw().should.be.true
+    budget.exhausted.should.equal(1)
+
+
+def run_client(routes, policy, call):
+    orderly_secret, public_key = generate_orderly_secret()
+
+    async def run():
+        async with local_server(routes) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                orderly_account_id=random_str(),
+                retry_policy=policy,
+            )
+            client.orderly_endpoint = url
+            try:
+                return await call(client)
+            finally:
+                await client.close()
+
+    return asyncio.run(run()), public_key
+
+
+def test_signed_get_is_retried_and_signed_again():
+    seen = []
+
+    async def orders(request):
+        seen.append(dict(request.headers))
+        if len(seen) < 3:
+            return web.Response(status=503, text="unavailable")
+        return web.json_response({"success": True, "data": {"rows": []}})
+
+    policy = RetryPolicy(base_delay=0.01)
+    result, public_key = run_client(
+        [web.get("/v1/orders", orders)], policy, lambda client: client.get_orders()
+    )
+    result["success"].should.be.true
+    policy.retries.should.equal(2)
+    signatures = [headers["orderly-signature"] for headers in seen]
+    len(set(signatures)).should.equal(3)
+    for headers in seen:
+        public_key.verify(
+            base64.b64decode(headers["orderly-signature"]),
+            f"{headers['orderly-timestamp']}GET/v1/orders".encode(),
+        )
+
+
+def test_create_is_retried_only_with_client_order_id():
+    attempts = []
+
+    async def order(request):
+        attempts.append((await request.json()).get("client_order_id"))
+        return web.Response(status=502, text="bad gateway")
+
+    async def create(client, **kwargs):
+        try:
+            await client.create_order("PERP_BTC_USDC", "MARKET", "BUY", order_quantity=1, **kwargs)
+        except ServerError as e:
+            return e.status_code
+
+    policy = RetryPolicy(base_delay=0.01)
+    run_client([web.post("/v1/order", order)], policy, create)[0].should.equal(502)
+    attempts.should.equal([None])
+    del attempts[:]
+    run_client(
+        [web.post("/v1/order", order)], policy, lambda client: create(client, client_order_id="c1")
+    )[0].should.equal(502)
+    attempts.should.equal(["c1", "c1", "c1"])
+
+
+def test_429_waits_for_retry_after():
+    hits = []
+
+    async def info(request):
+        hits.append(time.monotonic())
+        if len(hits) == 1:
+            return web.json_response(
+                {"code": -1003, "message": "too many requests"},
+                status=429,
+                headers={"Retry-After": "0.2"},
+            )
+        return web.json_response({"success": True, "data": {"rows": []}})
+
+    policy = RetryPolicy(base_delay=0.01)
+    result, _ = run_client(
+        [web.get("/v1/public/info", info)], policy, lambda client: client.get_available_symbols()
+    )
+    result["success"].should.be.true
+    (hits[1] - hits[0]).should.be.greater_than(0.19)
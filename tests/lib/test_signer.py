@@ -0,0 +1,38 @@
+import base64
+
+from orderly_evm_connector.api import API
+from orderly_evm_connector.lib.signer import OrderlySigner, get_signer
+from orderly_evm_connector.lib.utils import generate_signature
+from tests.utils import generate_orderly_secret
+
+
+def test_signer_is_cached_per_secret():
+    orderly_secret, _ = generate_orderly_secret()
+    get_signer(orderly_secret).should.be(get_signer(orderly_secret))
+
+
+def test_sign_request():
+    orderly_secret, public_key = generate_orderly_secret()
+    signer = OrderlySigner(orderly_secret)
+    timestamp, signature = signer.sign("POST", "/v1/order", '{"a": 1}', 1700000000000)
+    timestamp.should.equal("1700000000000")
+    public_key.verify(
+        base64.b64decode(signature), b'1700000000000POST/v1/order{"a": 1}'
+    ).should.be.none
+
+
+def test_generate_signature_matches_signer():
+    orderly_secret, public_key = generate_orderly_secret()
+    timestamp, signature = generate_signature(orderly_secret, message="GET/v1/orders")
+    public_key.verify(
+        base64.b64decode(signature), f"{timestamp}GET/v1/orders".encode()
+    ).should.be.none
+
+
+def test_api_loads_signer_once():
+    orderly_secret, _ = generate_orderly_secret()
+    client = API.__new__(API)
+    client.set_account_keys("account", orderly_secret, "key")
+    client._signer.should.be(get_signer(orderly_secret))
+    client.set_account_keys("account", "ed25519:invalid", "key")
+    client._signer.should.be.none
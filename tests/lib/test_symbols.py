@@ -0,0 +1,141 @@
+import asyncio
+
+from aiohttp import web
+from orderly_evm_connector.error import ParameterArgumentError
+from orderly_evm_connector.lib.symbols import DOWN, UP, SymbolRegistry
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+ROWS = [
+    {
+        "symbol": "PERP_BTC_USDC",
+        "quote_min": 0,
+        "quote_max": 200000,
+        "quote_tick": 0.1,
+        "base_min": 1e-05,
+        "base_max": 20,
+        "base_tick": 1e-05,
+        "min_notional": 10,
+        "price_range": 0.03,
+    },
+    {
+        "symbol": "PERP_NOT_USDC",
+        "quote_min": 0,
+        "quote_max": 100000,
+        "quote_tick": 1e-06,
+        "base_min": 100,
+        "base_max": 20400000,
+        "base_tick": 100,
+        "min_notional": 10,
+        "price_range": 0.03,
+    },
+]
+
+registry = SymbolRegistry.from_response({"success": True, "data": {"rows": ROWS}})
+
+
+def test_registry_indexes_rows_by_symbol():
+    len(registry).should.equal(2)
+    ("PERP_BTC_USDC" in registry).should.be.true
+    registry["PERP_NOT_USDC"].base_tick.should.equal(100)
+    registry.get.when.called_with("PERP_XYZ_USDC").should.throw(ParameterArgumentError)
+
+
+def test_round_price_and_size_to_ticks():
+    registry.round_price("PERP_BTC_USDC", 60000.16).should.equal(60000.2)
+    registry.round_price("PERP_BTC_USDC", 60000.16, DOWN).should.equal(60000.1)
+    registry.round_price("PERP_BTC_USDC", 0.30000000000000004 * 10, UP).should.equal(3.0)
+    registry.round_size("PERP_BTC_USDC", 0.123456789).should.equal(0.12345)
+    registry.round_size("PERP_NOT_USDC", 1299).should.equal(1200)
+    registry.round_prices("PERP_NOT_USDC", [0.0123456, 0.0123454]).should.equal(
+        [0.012346, 0.012345]
+    )
+    registry.round_sizes("PERP_BTC_USDC", [0.000019, 1.5]).should.equal([0.00001, 1.5])
+
+
+def test_validate_order_reports_every_broken_rule():
+    registry.validate_order(
+        {"symbol": "PERP_BTC_USDC", "side": "BUY", "order_price": 60000.1, "order_quantity": 0.001}
+    )
+    registry.check_min_notional("PERP_BTC_USDC", 60000, 0.0001).should.be.false
+    registry.validate_order.when.called_with(
+        {"symbol": "PERP_BTC_USDC", "side": "BUY", "order_price": 60000.15, "order_quantity": 0.0001}
+    ).should.throw(ParameterArgumentError, "quote_tick")
+    registry.validate_order.when.called_with(
+        {"symbol": "PERP_BTC_USDC", "side": "BUY", "order_price": 60000.1, "order_quantity": 0.0001}
+    ).should.throw(ParameterArgumentError, "min_notional")
+    registry.validate_order.when.called_with(
+        {"symbol": "PERP_BTC_USDC", "side": "BUY", "order_price": 62000, "order_quantity": 0.001},
+        reference_price=60000,
+    ).should.throw(ParameterArgumentError, "price range")
+    registry.validate_order({"symbol": "PERP_BTC_USDC", "side": "SELL", "order_quantity": 0.5})
+
+
+def test_tick_grid_starts_at_zero_when_min_is_off_the_grid():
+    rules = SymbolRegistry(
+        [
+            {
+                "symbol": "PERP_SUI_USDC",
+                "quote_min": 0.05,
+                "quote_max": 1000,
+                "quote_tick": 0.1,
+                "base_min": 0.1,
+                "base_max": 100000,
+                "base_tick": 1,
+                "min_notional": 0,
+            }
+        ]
+    )
+    rules.round_size("PERP_SUI_USDC", 5.0).should.equal(5)
+    rules.round_size("PERP_SUI_USDC", 5.7).should.equal(5)
+    rules.round_size("PERP_SUI_USDC", 5.2, UP).should.equal(6)
+    rules.round_price("PERP_SUI_USDC", 1.26).should.equal(1.3)
+    rules.round_sizes("PERP_SUI_USDC", [10.0, 10.9]).should.equal([10, 10])
+    rules.validate_order({"symbol": "PERP_SUI_USDC", "side": "BUY", "order_price": 1.3, "order_quantity": 10})
+    rules.validate_order.when.called_with(
+        {"symbol": "PERP_SUI_USDC", "side": "BUY", "order_price": 1.35, "order_quantity": 10}
+    ).should.throw(ParameterArgumentError, "quote_tick")
+    rules.validate_order.when.called_with(
+        {"symbol": "PERP_SUI_USDC", "side": "BUY", "order_price": 1.3, "order_quantity": 10.1}
+    ).should.throw(ParameterArgumentError, "base_tick")
+    rules.validate_order.when.called_with(
+        {"symbol": "PERP_SUI_USDC", "side": "BUY", "order_price": 0.0, "order_quantity": 10}
+    ).should.throw(ParameterArgumentError, "outside")
+
+
+def test_create_order_is_rejected_before_sending():
+    requests = []
+    orderly_secret, _ = generate_orderly_secret()
+
+    async def handler(request):
+        requests.append(await request.json())
+        return web.json_response({"success": True, "data": {"order_id": 1}})
+
+    async def run():
+        async with local_server([web.post("/v1/order", handler)]) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                symbol_registry=registry,
+            )
+            client.orderly_endpoint = url
+            try:
+                client.create_order.when.called_with(
+                    symbol="PERP_BTC_USDC",
+                    order_type="LIMIT",
+                    side="BUY",
+                    order_price=60000.1,
+                    order_quantity=0.00001,
+                ).should.throw(ParameterArgumentError)
+                await client.create_order(
+                    symbol="PERP_BTC_USDC",
+                    order_type="LIMIT",
+                    side="BUY",
+                    order_price=60000.1,
+                    order_quantity=0.001,
+                )
+            finally:
+                await client.close()
+
+    asyncio.run(run())
+    len(requests).should.equal(1)
@@ -0,0 +1,81 @@
+import asyncio
+
+from aiohttp import web
+from orderly_evm_connector.api import API
+from orderly_evm_connector.lib.transport import TransportConfig
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import local_server
+
+
+def test_transport_from_api_arguments():
+    client = API(timeout=5, proxies={"https": "http://1.2.3.4:8080"})
+    client.transport.timeout.should.equal(5)
+    client.transport.proxy.should.equal("http://1.2.3.4:8080")
+    API(proxies="aaa").transport.proxy.should.be.none
+
+
+def test_timeout_and_proxies_are_merged_into_a_given_transport():
+    transport = TransportConfig(limit=7, timeout=2)
+    client = API(transport=transport, timeout=5, proxies={"https": "http://1.2.3.4:8080"})
+    (client.transport.limit, client.transport.timeout, client.timeout).should.equal((7, 5, 5))
+    client.transport.proxy.should.equal("http://1.2.3.4:8080")
+    client.proxies.should.equal({"https": "http://1.2.3.4:8080"})
+    # the passed config is left as it is, it may be shared by other clients
+    (transport.timeout, transport.proxies).should.equal((2, None))
+    API(transport=transport).timeout.should.equal(2)
+
+
+def test_default_transport_keeps_aiohttp_timeouts():
+    timeout = TransportConfig().client_timeout()
+    (timeout.total, timeout.sock_connect).should.equal((300, 30))
+    timeout = TransportConfig(timeout=5, connect_timeout=2).client_timeout()
+    (timeout.total, timeout.connect, timeout.sock_connect).should.equal((5, 2, 30))
+
+
+def test_session_uses_transport_settings():
+    transport = TransportConfig(
+        limit=7, limit_per_host=3, ttl_dns_cache=60, keepalive_timeout=45, timeout=2
+    )
+
+    async def run():
+        client = API(transport=transport)
+        session = client.session
+        try:
+            return (
+                session.connector.limit,
+                session.connector.limit_per_host,
+                session.timeout.total,
+                client.session is session,
+            )
+        finally:
+            await client.close()
+
+    asyncio.run(run()).should.equal((7, 3, 2, True))
+
+
+def test_warmup_opens_pooled_connections():
+    peers = []
+
+    async def system_info(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(0.05)
+        return web.json_response({"success": True})
+
+    async def run():
+        async with local_server([web.get("/v1/public/system_info", system_info)]) as url:
+            client = Client()
+            client.orderly_endpoint = url
+            try:
+                warmed = await client.warmup(connections=3)
+                warm_peers = set(peers)
+                await asyncio.gather(
+                    *[client.get_system_maintenance_status() for _ in range(3)]
+                )
+                return warmed, warm_peers, set(peers[3:])
+            finally:
+                await client.close()
+
+    warmed, warm_peers, used_peers = asyncio.run(run())
+    warmed.should.equal(3)
+    len(warm_peers).should.equal(3)
+    used_peers.issubset(warm_peers).should.be.true
@@ -0,0 +1,62 @@
+import copy
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_structured_data
+
+from orderly_evm_connector.lib import eip712
+from orderly_evm_connector.lib.typed_messages import (
+    ADD_ORDERLY_KEY,
+    DELEGATE_ADD_ORDERLY_KEY,
+    DELEGATE_SETTLE_PNL,
+    DELEGATE_SIGNER,
+    DELEGATE_WITHDRAW,
+    REGISTRATION,
+    SETTLE_PNL,
+    WITHDRAW,
+    orderly_domain,
+)
+from orderly_evm_connector.lib.utils import generate_wallet_signature
+
+WALLET_SECRET = "4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318"
+ADDRESS = "0x1563915e194D8CfBA1943570603F7606A3115508"
+LEDGER = "0x1826B75e2ef249173FC735149AE4B8e9ea10abff"
+
+COMMON = {"brokerId": "woofi_pro", "chainId": 421614, "timestamp": 1718000000000}
+MESSAGES = [
+    (REGISTRATION, {**COMMON, "registrationNonce": 194528949540}),
+    (ADD_ORDERLY_KEY, {**COMMON, "orderlyKey": "ed25519:abc", "scope": "read,trading", "expiration": 1719000000000}),
+    (WITHDRAW, {**COMMON, "receiver": ADDRESS, "token": "USDC", "amount": 10**6, "withdrawNonce": 3, "type": "Withdraw"}),
+    (SETTLE_PNL, {**COMMON, "settleNonce": 7, "userAddress": ADDRESS}),
+    (DELEGATE_SIGNER, {**COMMON, "delegateContract": ADDRESS, "registrationNonce": 1, "txHash": bytes.fromhex("ab" * 32)}),
+    (DELEGATE_ADD_ORDERLY_KEY, {**COMMON, "delegateContract": ADDRESS, "orderlyKey": "ed25519:abc", "scope": "trading", "expiration": 1719000000000}),
+    (DELEGATE_WITHDRAW, {**COMMON, "delegateContract": ADDRESS, "receiver": ADDRESS, "token": "USDC", "amount": 5, "withdrawNonce": 2}),
+    (DELEGATE_SETTLE_PNL, {**COMMON, "delegateContract": ADDRESS, "settleNonce": 9}),
+]
+
+
+@pytest.mark.parametrize("schema, values", MESSAGES, ids=[s.primary_type for s, _ in MESSAGES])
+def test_compiled_schema_matches_eth_account(schema, values):
+    message = schema.typed_message(orderly_domain(421614, LEDGER), values)
+    # a copy of the types is not recognised as the schema and goes through eth_account
+    generic = dict(message, types=copy.deepcopy(message["types"]))
+    eip712.struct_hash(message).should.equal(eip712.struct_hash(generic))
+    expected = Account.sign_message(
+        encode_structured_data(generic), private_key=f"0x{WALLET_SECRET}"
+    ).signature.hex()
+    generate_wallet_signature(WALLET_SECRET, message=message).should.equal(expected)
+
+
+def test_schema_rejects_invalid_values():
+    values = dict(MESSAGES[2][1])
+    WITHDRAW.struct_hash.when.called_with(dict(values, amount="1000")).should.throw(TypeError)
+    WITHDRAW.struct_hash.when.called_with(dict(values, receiver="0x1234")).should.throw(TypeError)
+    WITHDRAW.struct_hash.when.called_with(dict(values, withdrawNonce=2**64)).should.throw(TypeError)
+    del values["token"]
+    WITHDRAW.struct_hash.when.called_with(values).should.throw(ValueError)
+
+
+def test_encode_type():
+    SETTLE_PNL.encode_type.should.equal(
+        "SettlePnl(string brokerId,uint256 chainId,uint64 settleNonce,uint64 timestamp)"
+    )
@@ -0,0 +1,84 @@
+from eth_account import Account
+from eth_account.messages import encode_structured_data
+from eth_utils import keccak
+
+from orderly_evm_connector.lib import eip712
+from orderly_evm_connector.lib.signer import WalletSigner, get_wallet_signer
+from orderly_evm_connector.lib.utils import generate_wallet_signature
+
+WALLET_SECRET = "4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318"
+
+
+def withdraw_message(chain_id=421614, nonce=1):
+    return {
+        "domain": {
+            "name": "Orderly",
+            "version": "1",
+            "chainId": chain_id,
+            "verifyingContract": "0x1826B75e2ef249173FC735149AE4B8e9ea10abff",
+        },
+        "message": {
+            "brokerId": "woofi_pro",
+            "chainId": chain_id,
+            "receiver": "0x1563915e194D8CfBA1943570603F7606A3115508",
+            "token": "USDC",
+            "amount": 1000000,
+            "withdrawNonce": nonce,
+            "timestamp": 1718000000000,
+        },
+        "primaryType": "Withdraw",
+        "types": {
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+                {"name": "verifyingContract", "type": "address"},
+            ],
+            "Withdraw": [
+                {"name": "brokerId", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+                {"name": "receiver", "type": "address"},
+                {"name": "token", "type": "string"},
+                {"name": "amount", "type": "uint256"},
+                {"name": "withdrawNonce", "type": "uint64"},
+                {"name": "timestamp", "type": "uint64"},
+            ],
+        },
+    }
+
+
+def reference_signature(message):
+    return Account.sign_message(
+        encode_structured_data(message), private_key=f"0x{WALLET_SECRET}"
+    ).signature.hex()
+
+
+def test_signature_matches_encode_structured_data():
+    for chain_id, nonce in [(421614, 1), (42161, 2), (421614, 3)]:
+        message = withdraw_message(chain_id, nonce)
+        generate_wallet_signature(WALLET_SECRET, message=message).should.equal(
+            reference_signature(message)
+        )
+
+
+def test_typed_data_hash_matches_encode_structured_data():
+    message = withdraw_message()
+    encoded = encode_structured_data(message)
+    eip712.typed_data_hash(message).should.equal(
+        keccak(b"\x19" + encoded.version + encoded.header + encoded.body)
+    )
+
+
+def test_domain_separator_is_computed_once_per_domain():
+    eip712.domain_separator(withdraw_message(chain_id=11155111, nonce=1))
+    before = len(eip712._domain_separators)
+    eip712.domain_separator(withdraw_message(chain_id=11155111, nonce=2))
+    len(eip712._domain_separators).should.equal(before)
+    eip712.domain_separator(withdraw_message(chain_id=10, nonce=2))
+    len(eip712._domain_separators).should.equal(before + 1)
+
+
+def test_wallet_signer_is_cached_per_secret():
+    signer = get_wallet_signer(WALLET_SECRET)
+    signer.should.be(get_wallet_signer(WALLET_SECRET))
+    signer.address.should.equal(WalletSigner(WALLET_SECRET).address)
@@ -0,0 +1,195 @@
+import asyncio
+
+from aiohttp import web
+from orderly_evm_connector.error import ParameterArgumentError
+from orderly_evm_connector.lib.rate_limit import FAIL_FAST, KEY_SCOPE, RateLimiter
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+orderly_secret, _ = generate_orderly_secret()
+
+
+def make_orders(count):
+    return [
+        {
+            "symbol": "PERP_BTC_USDC",
+            "order_type": "LIMIT",
+            "side": "BUY",
+            "order_price": 60000,
+            "order_quantity": 0.01,
+            "client_order_id": f"coid-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def run_bulk(handler, orders, rate_limiter=None):
+    async def run():
+        async with local_server([web.post("/v1/batch-order", handler)]) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                rate_limiter=rate_limiter
+                or RateLimiter(
+                    limits={
+                        "POST /v1/batch-order": (10, 1, KEY_SCOPE),
+                        "POST /v1/order": (100, 1, KEY_SCOPE),
+                    }
+                ),
+            )
+            client.orderly_endpoint = url
+            try:
+                return await client.bulk_create_order(orders)
+            finally:
+                await client.close()
+
+    return asyncio.run(run())
+
+
+def test_bulk_create_order_splits_into_batches():
+    batch_sizes = []
+
+    async def batch_order(request):
+        orders = (await request.json())["orders"]
+        batch_sizes.append(len(orders))
+        rows = [
+            {
+                "order_id": i,
+                "client_order_id": order["client_order_id"],
+                "error_message": "price out of range" if order["client_order_id"] == "coid-7" else "none",
+            }
+            for i, order in enumerate(orders)
+        ]
+        return web.json_response({"success": True, "data": {"rows": rows}})
+
+    results = run_bulk(batch_order, make_orders(25))
+    sorted(batch_sizes).should.equal([5, 10, 10])
+    results.should.have.length_of(25)
+    results["coid-0"]["success"].should.be.true
+    results["coid-7"]["success"].should.be.false
+    results["coid-7"]["error_message"].should.equal("price out of range")
+
+
+def test_bulk_create_order_reports_failed_batches_per_order():
+    async def batch_order(request):
+        orders = (await request.json())["orders"]
+        if orders[0]["client_order_id"] == "coid-10":
+            return web.json_response(
+                {"success": False, "code": -1003, "message": "too many requests"},
+                status=429,
+            )
+        rows = [{"client_order_id": o["client_order_id"]} for o in orders]
+        return web.json_response({"success": True, "data": {"rows": rows}})
+
+    results = run_bulk(batch_order, make_orders(12))
+    [results[f"coid-{i}"]["success"] for i in range(10)].should.equal([True] * 10)
+    results["coid-11"]["success"].should.be.false
+    results["coid-11"]["error_code"].should.equal(-1003)
+    results["coid-11"]["error_message"].should.equal("too many requests")
+
+
+def test_bulk_create_order_matches_rows_by_client_order_id():
+    async def batch_order(request):
+        orders = (await request.json())["orders"]
+        # reordered and missing the last order
+        rows = [
+            {"order_id": int(o["client_order_id"].split("-")[1]), "client_order_id": o["client_order_id"]}
+            for o in reversed(orders[:-1])
+        ]
+        return web.json_response({"success": True, "data": {"rows": rows}})
+
+    results = run_bulk(batch_order, make_orders(4))
+    [results[f"coid-{i}"]["data"]["order_id"] for i in range(3)].should.equal([0, 1, 2])
+    results["coid-3"]["success"].should.be.false
+    results["coid-3"]["error_message"].should.equal("missing from batch response")
+
+
+def test_bulk_create_order_reports_fail_fast_rate_limits_per_order():
+    async def batch_order(request):
+        orders = (await request.json())["orders"]
+        rows = [{"client_order_id": o["client_order_id"]} for o in orders]
+        return web.json_response({"success": True, "data": {"rows": rows}})
+
+    limiter = RateLimiter(
+        policy=FAIL_FAST,
+        limits={
+            "POST /v1/batch-order": (10, 1, KEY_SCOPE),
+            "POST /v1/order": (10, 1, KEY_SCOPE),
+        },
+    )
+    results = run_bulk(batch_order, make_orders(30), rate_limiter=limiter)
+    results.should.have.length_of(30)
+    [result["success"] for result in results.values()].count(True).should.equal(10)
+    failed = [result for result in results.values() if not result["success"]]
+    failed[0]["error_message"].should.contain("rate limit of POST /v1/order exceeded")
+
+
+def test_bulk_create_order_shares_one_batch_bucket_per_client():
+    client = Client(orderly_key=random_str(), orderly_secret=orderly_secret)
+    sent = []
+
+    async def batch_create_order(batch):
+        sent.append(asyncio.get_running_loop().time())
+        return {"success": True, "data": {"rows": [{"client_order_id": o["client_order_id"]} for o in batch]}}
+
+    client.batch_create_order = batch_create_order
+
+    async def run():
+        orders = make_orders(20)
+        await asyncio.gather(client.bulk_create_order(orders[:10]), client.bulk_create_order(orders[10:]))
+
+    asyncio.run(run())
+    # the second call waits for the 1 per second batch order budget of the first
+    (max(sent) - min(sent)).should.be.greater_than(0.9)
+
+
+def test_batch_create_order_rejects_more_than_ten_orders():
+    client = Client(orderly_key=random_str(), orderly_secret=orderly_secret)
+    client.batch_create_order.when.called_with(make_orders(11)).should.throw(
+        ParameterArgumentError
+    )
+
+
+def test_bulk_create_order_rejects_orders_breaking_symbol_rules():
+    from orderly_evm_connector.lib.symbols import SymbolRegistry
+
+    sent = []
+
+    async def handler(request):
+        orders = (await request.json())["orders"]
+        sent.extend(order["client_order_id"] for order in orders)
+        rows = [{"order_id": i, "client_order_id": o["client_order_id"]} for i, o in enumerate(orders)]
+        return web.json_response({"success": True, "data": {"rows": rows}})
+
+    orders = make_orders(3)
+    orders[1]["order_quantity"] = 0.0001
+
+    async def run():
+        async with local_server([web.post("/v1/batch-order", handler)]) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                rate_limiter=RateLimiter(limits={"POST /v1/batch-order": (10, 1, KEY_SCOPE)}),
+                symbol_registry=SymbolRegistry(
+                    [
+                        {
+                            "symbol": "PERP_BTC_USDC",
+                            "quote_tick": 0.1,
+                            "base_min": 0.00001,
+                            "base_tick": 0.00001,
+                            "min_notional": 10,
+                        }
+                    ]
+                ),
+            )
+            client.orderly_endpoint = url
+            try:
+                return await client.bulk_create_order(orders)
+            finally:
+                await client.close()
+
+    results = asyncio.run(run())
+    sent.should.equal(["coid-0", "coid-2"])
+    results["coid-1"]["success"].should.be.false
+    results["coid-1"]["error_message"].should.contain("min_notional")
+    results["coid-0"]["success"].should.be.true
@@ -0,0 +1,43 @@
+import asyncio
+
+from aiohttp import web
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+orderly_secret, _ = generate_orderly_secret()
+
+
+def test_iter_orders_forwards_filters_and_pages():
+    queries = []
+
+    async def handler(request):
+        queries.append(dict(request.query))
+        page, size = int(request.query["page"]), int(request.query["size"])
+        rows = [{"order_id": i} for i in range((page - 1) * size, min(page * size, 7))]
+        return web.json_response(
+            {
+                "success": True,
+                "data": {
+                    "meta": {"total": 7, "records_per_page": size, "current_page": page},
+                    "rows": rows,
+                },
+            }
+        )
+
+    async def run():
+        async with local_server([web.get("/v1/orders", handler)]) as url:
+            client = Client(orderly_key=random_str(), orderly_secret=orderly_secret)
+            client.orderly_endpoint = url
+            try:
+                return [
+                    order["order_id"]
+                    async for order in client.iter_orders(
+                        symbol="PERP_BTC_USDC", size=3, max_parallel=2
+                    )
+                ]
+            finally:
+                await client.close()
+
+    asyncio.run(run()).should.equal(list(range(7)))
+    sorted(int(q["page"]) for q in queries).should.equal([1, 2, 3])
+    set(q["symbol"] for q in queries).should.equal({"PERP_BTC_USDC"})
@@ -0,0 +1,1154 @@
+"""In-process stand-in for the Orderly REST and websocket endpoints.
+
+The simulator serves the REST endpoints used by rest/_trade.py, _market.py,
+_account.py and the reference data of _general.py, and the public and private
+websocket streams, from one aiohttp application on a local port. Signed
+requests are verified with the Ed25519 key of the account, websocket logins
+with the same key, and registration/orderly key requests with the EIP-712
+wallet signature. Latency and errors can be injected per endpoint.
+
+    async with ExchangeSimulator() as exchange:
+        account = exchange.add_account()
+        client = Rest(
+            orderly_key=account.orderly_key,
+            orderly_secret=account.orderly_secret,
+            orderly_account_id=account.account_id,
+        )
+        client.orderly_endpoint = exchange.rest_url
+        exchange.inject("POST /v1/order", status=503, times=2)
+
+Websocket clients connect to exchange.public_ws_url and
+exchange.private_ws_url, the client appends the account id as usual.
+Market data is pushed with publish(topic, data).
+"""
+import asyncio
+import base64
+import fnmatch
+import json
+import random
+import time
+from collections import Counter
+
+import base58
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+
+from orderly_evm_connector.lib.rate_limit import FAIL_FAST, RateLimiter
+from orderly_evm_connector.error import RateLimitError
+from orderly_evm_connector.lib.utils import encode_key
+
+DEFAULT_SYMBOLS = {
+    "PERP_BTC_USDC": {"mark_price": 60000.0, "quote_tick": 0.1, "base_tick": 0.00001, "base_min": 0.00001},
+    "PERP_ETH_USDC": {"mark_price": 3000.0, "quote_tick": 0.01, "base_tick": 0.0001, "base_min": 0.0001},
+    "PERP_SOL_USDC": {"mark_price": 150.0, "quote_tick": 0.001, "base_tick": 0.01, "base_min": 0.01},
+}
+
+PUBLIC_WS_PATH = "/ws/stream"
+PRIVATE_WS_PATH = "/v2/ws/private/stream"
+PRIVATE_TOPICS = (
+    "account",
+    "balance",
+    "position",
+    "executionreport",
+    "liquidationsaccount",
+    "liquidatorliquidations",
+    "wallet",
+    "settle",
+    "notifications",
+)
+
+# error codes of the Orderly REST api
+UNKNOWN = -1000
+INVALID_SIGNATURE = -1001
+UNAUTHORIZED = -1002
+TOO_MANY_REQUESTS = -1003
+INVALID_PARAMETER = -1005
+NOT_FOUND = -1006
+DUPLICATE_REQUEST = -1007
+
+RECV_WINDOW_MS = 300_000
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class ExchangeError(Exception):
+    def __init__(self, status, code, message):
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+class Fault(object):
+    """Latency or an error injected into the requests matching endpoint.
+
+    endpoint is "METHOD /path" and may use shell wildcards, "*" matches
+    every request. status=None only delays the request. times limits how
+    many requests are affected, probability makes the fault random.
+    """
+
+    def __init__(
+        self,
+        endpoint="*",
+        status=None,
+        latency=0.0,
+        jitter=0.0,
+        probability=1.0,
+        times=None,
+        headers=None,
+        code=UNKNOWN,
+        message="injected fault",
+    ):
+        self.endpoint = endpoint
+        self.status = status
+        self.latency = latency
+        self.jitter = jitter
+        self.probability = probability
+        self.times = times
+        self.headers = headers or {}
+        self.code = code
+        self.message = message
+        self.hits = 0
+
+    def matches(self, key: str, rng: random.Random) -> bool:
+        if self.times is not None and self.hits >= self.times:
+            return False
+        if not fnmatch.fnmatchcase(key, self.endpoint):
+            return False
+        return self.probability >= 1 or rng.random() < self.probability
+
+    def delay(self, rng: random.Random) -> float:
+        return self.latency + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+
+class SimAccount(object):
+    """One account with its orderly keys, orders, trades and positions"""
+
+    def __init__(self, account_id, address=None, broker_id="woofi_pro", balance=10000.0):
+        self.account_id = account_id
+        self.address = address
+        self.broker_id = broker_id
+        self.keys = {}
+        self.orderly_key = None
+        self.orderly_secret = None
+        self.orders = {}
+        self.algo_orders = {}
+        self.trades = []
+        self.positions = {}
+        self.holding = {"USDC": balance}
+        self.leverage = 10
+
+    def add_key(self, scope="read,trading", expiration=None):
+        """Create an Ed25519 orderly key, returns (orderly_key, orderly_secret)"""
+        private_key = Ed25519PrivateKey.generate()
+        orderly_secret = encode_key(private_key.private_bytes_raw())
+        orderly_key = encode_key(private_key.public_key().public_bytes_raw())
+        self.keys[orderly_key] = {"scope": scope, "expiration": expiration or now_ms() + 365 * 86400_000}
+        if self.orderly_key is None:
+            self.orderly_key, self.orderly_secret = orderly_key, orderly_secret
+        return orderly_key, orderly_secret
+
+
+# the authenticated account of a signed request
+ACCOUNT = web.RequestKey("account", SimAccount)
+
+
+def _public_key(orderly_key: str) -> Ed25519PublicKey:
+    return Ed25519PublicKey.from_public_bytes(base58.b58decode(orderly_key.split(":")[-1]))
+
+
+def _verify(orderly_key: str, signature: str, message: bytes) -> bool:
+    try:
+        raw = base64.b64decode(signature)
+    except ValueError:
+        try:
+            raw = base64.urlsafe_b64decode(signature)
+        except ValueError:
+            return False
+    try:
+        _public_key(orderly_key).verify(raw, message)
+    except (InvalidSignature, ValueError):
+        return False
+    return True
+
+
+def _as_float(value, name):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ExchangeError(400, INVALID_PARAMETER, f"{name} is invalid")
+
+
+def _page(rows, query, default_size=25, max_size=500):
+    page = max(1, int(query.get("page") or 1))
+    size = min(max_size, max(1, int(query.get("size") or default_size)))
+    start = (page - 1) * size
+    return {
+        "meta": {"total": len(rows), "records_per_page": size, "current_page": page},
+        "rows": rows[start : start + size],
+    }
+
+
+class ExchangeSimulator(object):
+    """Local stand-in for the Orderly REST api and websocket streams.
+
+    Args:
+        symbols(dict): {symbol: {mark_price, quote_tick, base_tick, base_min}}
+        latency(float): seconds added to every REST request
+        rate_limits(bool): reject requests over the documented limits with 429
+        ping_interval(float): seconds between the websocket pings of the server
+        seed(int): seed of the random numbers used for faults and market data
+    """
+
+    def __init__(self, symbols=None, latency=0.0, rate_limits=False, ping_interval=10.0, seed=7):
+        self.symbols = {symbol: dict(info) for symbol, info in (symbols or DEFAULT_SYMBOLS).items()}
+        self.latency = latency
+        self.ping_interval = ping_interval
+        self.rng = random.Random(seed)
+        self.rate_limiter = RateLimiter(policy=FAIL_FAST) if rate_limits else None
+        self.accounts = {}
+        self.faults = []
+        self.requests = Counter()
+        self.rejected_signatures = 0
+        self.connections = []
+        self._registration_nonces = set()
+        self._next_order_id = 1_000_000
+        self._next_trade_id = 5_000_000
+        self._server = None
+        self.app = web.Application(middlewares=[self._middleware])
+        self._private_routes = set()
+        self._add_routes()
+
+    # lifecycle
+
+    async def start(self):
+        self._server = TestServer(self.app)
+        await self._server.start_server()
+        return self
+
+    async def close(self):
+        for connection in list(self.connections):
+            await connection.close()
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def rest_url(self) -> str:
+        return str(self._server.make_url("")).rstrip("/")
+
+    @property
+    def public_ws_url(self) -> str:
+        return self.rest_url.replace("http", "ws", 1) + PUBLIC_WS_PATH
+
+    @property
+    def private_ws_url(self) -> str:
+        return self.rest_url.replace("http", "ws", 1) + PRIVATE_WS_PATH
+
+    # accounts and faults
+
+    def add_account(self, address=None, broker_id="woofi_pro", balance=10000.0) -> SimAccount:
+        """Create an account with one orderly key, see SimAccount"""
+        account_id = f"0x{self.rng.getrandbits(256):064x}"
+        account = self.accounts[account_id] = SimAccount(account_id, address, broker_id, balance)
+        account.add_key()
+        return account
+
+    def inject(self, endpoint="*", **kwargs) -> Fault:
+        """Add a Fault, see Fault for the arguments"""
+        fault = Fault(endpoint, **kwargs)
+        self.faults.append(fault)
+        return fault
+
+    def clear_faults(self):
+        self.faults = []
+
+    def set_mark_price(self, symbol, price):
+        self.symbols[symbol]["mark_price"] = float(price)
+
+    # REST plumbing
+
+    def _route(self, method, path, handler, private=True):
+        self.app.router.add_route(method, path, handler)
+        if private:
+            self._private_routes.add((method, path))
+
+    def _add_routes(self):
+        route = self._route
+        # general
+        route("GET", "/v1/public/system_info", self.system_info, private=False)
+        route("GET", "/v1/public/info", self.exchange_info, private=False)
+        route("GET", "/v1/public/info/{symbol}", self.exchange_info, private=False)
+        route("GET", "/v1/public/token", self.empty_rows, private=False)
+        route("GET", "/v1/public/config", self.empty_object, private=False)
+        # account
+        route("GET", "/v1/registration_nonce", self.registration_nonce, private=False)
+        route("GET", "/v1/public/account", self.account_details, private=False)
+        route("GET", "/v1/get_account", self.get_account, private=False)
+        route("POST", "/v1/register_account", self.register_account, private=False)
+        route("GET", "/v1/get_orderly_key", self.get_orderly_key, private=False)
+        route("POST", "/v1/orderly_key", self.add_orderly_key, private=False)
+        route("POST", "/v1/client/leverage", self.update_leverage)
+        route("GET", "/v1/client/holding", self.holding)
+        route("GET", "/v1/client/info", self.account_info)
+        route("GET", "/v1/client/key_info", self.key_info)
+        route("GET", "/v1/client/statistics", self.empty_object)
+        for path in (
+            "/v1/client/statistics/daily",
+            "/v1/volume/user/daily",
+        ):
+            route("GET", path, self.empty_rows)
+        route("GET", "/v1/volume/user/stats", self.empty_object)
+        route("GET", "/v1/client/orderly_key_ip_restriction", self.empty_object)
+        for path in (
+            "/v1/client/maintenance_config",
+            "/v1/client/set_orderly_key_ip_restriction",
+            "/v1/client/reset_orderly_key_ip_restriction",
+        ):
+            route("POST", path, self.empty_object)
+        # trade
+        route("POST", "/v1/order", self.create_order)
+        route("POST", "/v1/algo/order", self.create_algo_order)
+        route("POST", "/v1/batch-order", self.batch_create_order)
+        route("PUT", "/v1/order", self.edit_order)
+        route("PUT", "/v1/algo/order", self.edit_algo_order)
+        route("DELETE", "/v1/order", self.cancel_order)
+        route("DELETE", "/v1/client/order", self.cancel_order)
+        route("DELETE", "/v1/algo/order", self.cancel_algo_order)
+        route("DELETE", "/v1/algo/client/order", self.cancel_algo_order)
+        route("DELETE", "/v1/orders", self.cancel_orders)
+        route("DELETE", "/v1/algo/orders", self.cancel_algo_orders)
+        route("DELETE", "/v1/batch-order", self.batch_cancel_orders)
+        route("DELETE", "/v1/client/batch-order", self.batch_cancel_orders)
+        route("GET", "/v1/order/{order_id}", self.get_order)
+        route("GET", "/v1/client/order/{client_order_id}", self.get_order)
+        route("GET", "/v1/algo/order/{order_id}", self.get_algo_order)
+        route("GET", "/v1/algo/client/order/{client_order_id}", self.get_algo_order)
+        route("GET", "/v1/orders", self.get_orders)
+        route("GET", "/v1/algo/orders", self.get_algo_orders)
+        route("GET", "/v1/order/{order_id}/trades", self.get_order_trades)
+        route("GET", "/v1/trades", self.get_trades)
+        route("GET", "/v1/trade/{trade_id}", self.get_trade)
+        route("GET", "/v1/positions", self.get_positions)
+        route("GET", "/v1/position/{symbol}", self.get_position)
+        route("GET", "/v1/funding_fee/history", self.empty_page)
+        # market
+        route("GET", "/v1/public/market_trades", self.market_trades, private=False)
+        route("GET", "/v1/public/volume/stats", self.volume_stats, private=False)
+        route("GET", "/v1/public/funding_rates", self.funding_rates, private=False)
+        route("GET", "/v1/public/funding_rate/{symbol}", self.funding_rates, private=False)
+        route("GET", "/v1/public/funding_rate_history", self.empty_page, private=False)
+        route("GET", "/v1/public/futures", self.futures, private=False)
+        route("GET", "/v1/public/futures/{symbol}", self.futures, private=False)
+        route("GET", "/v1/tv/config", self.tv_config, private=False)
+        route("GET", "/v1/tv/history", self.tv_history, private=False)
+        route("GET", "/v1/tv/symbol_info", self.tv_symbol_info, private=False)
+        route("GET", "/v1/orderbook/{symbol}", self.orderbook)
+        route("GET", "/v1/kline", self.kline)
+        # streams
+        self.app.router.add_get(PUBLIC_WS_PATH + "/{account_id}", self.public_stream)
+        self.app.router.add_get(PRIVATE_WS_PATH + "/{account_id}", self.private_stream)
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await handler(request)
+        resource = request.match_info.route.resource
+        template = resource.canonical if resource is not None else request.path
+        key = f"{request.method} {template}"
+        self.requests[key] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for fault in self.faults:
+            if fault.matches(key, self.rng):
+                fault.hits += 1
+                delay = fault.delay(self.rng)
+                if delay:
+                    await asyncio.sleep(delay)
+                if fault.status is not None:
+                    return self._error(fault.status, fault.code, fault.message, fault.headers)
+        try:
+            account = None
+            if (request.method, template) in self._private_routes:
+                account = await self._authenticate(request)
+            if self.rate_limiter is not None:
+                try:
+                    await self.rate_limiter.acquire(
+                        request.method, request.path, request.headers.get("orderly-key")
+                    )
+                except RateLimitError as e:
+                    return self._error(
+                        429,
+                        TOO_MANY_REQUESTS,
+                        str(e),
+                        {"Retry-After": f"{e.retry_after:.3f}"},
+                    )
+            request[ACCOUNT] = account
+            data = await handler(request)
+        except ExchangeError as e:
+            return self._error(e.status, e.code, e.message)
+        if isinstance(data, web.StreamResponse):
+            return data
+        return web.json_response({"success": True, "data": data, "timestamp": now_ms()})
+
+    @staticmethod
+    def _error(status, code, message, headers=None):
+        return web.json_response(
+            {"success": False, "code": code, "message": message},
+            status=status,
+            headers=headers,
+        )
+
+    async def _authenticate(self, request) -> SimAccount:
+        headers = request.headers
+        account = self.accounts.get(headers.get("orderly-account-id"))
+        orderly_key = headers.get("orderly-key")
+        if account is None or orderly_key not in account.keys:
+            raise ExchangeError(401, UNAUTHORIZED, "orderly key is not registered for the account")
+        timestamp = headers.get("orderly-timestamp", "")
+        if not timestamp.isdigit() or abs(now_ms() - int(timestamp)) > RECV_WINDOW_MS:
+            self.rejected_signatures += 1
+            raise ExchangeError(401, INVALID_SIGNATURE, "timestamp is outside the receive window")
+        body = await request.read()
+        message = f"{timestamp}{request.method}{request.raw_path}".encode() + body
+        if not _verify(orderly_key, headers.get("orderly-signature", ""), message):
+            self.rejected_signatures += 1
+            raise ExchangeError(401, INVALID_SIGNATURE, "signature verification failed")
+        return account
+
+    async def _json(self, request) -> dict:
+        try:
+            return await request.json()
+        except ValueError:
+            raise ExchangeError(400, INVALID_PARAMETER, "body is not valid json")
+
+    def _symbol(self, symbol):
+        if symbol not in self.symbols:
+            raise ExchangeError(400, INVALID_PARAMETER, f"symbol {symbol} is not supported")
+        return self.symbols[symbol]
+
+    # general
+
+    async def system_info(self, request):
+        return {"status": 0, "msg": "System is functioning properly."}
+
+    def _info_row(self, symbol):
+        info = self.symbols[symbol]
+        return {
+            "symbol": symbol,
+            "quote_min": 0,
+            "quote_max": info["mark_price"] * 10,
+            "quote_tick": info["quote_tick"],
+            "base_min": info["base_min"],
+            "base_max": 10_000,
+            "base_tick": info["base_tick"],
+            "min_notional": 10,
+            "price_range": 0.02,
+            "price_scope": 0.4,
+            "created_time": 1684140107326,
+            "updated_time": 1685345968053,
+        }
+
+    async def exchange_info(self, request):
+        symbol = request.match_info.get("symbol")
+        if symbol is not None:
+            self._symbol(symbol)
+            return self._info_row(symbol)
+        return {"rows": [self._info_row(symbol) for symbol in self.symbols]}
+
+    # account
+
+    async def registration_nonce(self, request):
+        nonce = str(self.rng.getrandbits(40))
+        self._registration_nonces.add(nonce)
+        return {"registration_nonce": nonce}
+
+    def _account_by_address(self, address, broker_id):
+        for account in self.accounts.values():
+            if account.address and account.address.lower() == (address or "").lower() and account.broker_id == broker_id:
+                return account
+        return None
+
+    async def account_details(self, request):
+        account = self.accounts.get(request.query.get("account_id"))
+        if account is None:
+            raise ExchangeError(400, NOT_FOUND, "account not found")
+        return {"address": account.address, "broker_id": account.broker_id, "user_account_type": "Main"}
+
+    async def get_account(self, request):
+        account = self._account_by_address(request.query.get("address"), request.query.get("broker_id"))
+        if account is None:
+            raise ExchangeError(400, NOT_FOUND, "account not found")
+        return {"user_id": 1, "account_id": account.account_id}
+
+    @staticmethod
+    def _recover(schema, message, signature):
+        from eth_account import Account
+        from eth_account.messages import encode_structured_data
+        from orderly_evm_connector.lib.typed_messages import orderly_domain
+
+        typed = schema.typed_message(orderly_domain(message["chainId"]), message)
+        try:
+            return Account.recover_message(encode_structured_data(typed), signature=signature)
+        except Exception:
+            raise ExchangeError(400, INVALID_SIGNATURE, "wallet signature is invalid")
+
+    async def register_account(self, request):
+        from eth_utils import keccak, to_canonical_address
+        from orderly_evm_connector.lib.typed_messages import REGISTRATION
+
+        payload = await self._json(request)
+        message = payload.get("message") or {}
+        address = payload.get("userAddress")
+        if str(message.get("registrationNonce")) not in self._registration_nonces:
+            raise ExchangeError(400, INVALID_PARAMETER, "registration nonce is invalid")
+        if self._recover(REGISTRATION, message, payload.get("signature")).lower() != (address or "").lower():
+            raise ExchangeError(400, INVALID_SIGNATURE, "wallet signature does not match userAddress")
+        self._registration_nonces.discard(str(message["registrationNonce"]))
+        broker_id = message["brokerId"]
+        if self._account_by_address(address, broker_id) is not None:
+            raise ExchangeError(400, DUPLICATE_REQUEST, "account already registered")
+        account_id = "0x" + keccak(
+            to_canonical_address(address).rjust(32, b"\0") + keccak(broker_id.encode())
+        ).hex()
+        self.accounts[account_id] = SimAccount(account_id, address, broker_id)
+        return {"account_id": account_id}
+
+    async def get_orderly_key(self, request):
+        account = self.accounts.get(request.query.get("account_id"))
+        key = account.keys.get(request.query.get("orderly_key")) if account else None
+        if key is None:
+            raise ExchangeError(400, NOT_FOUND, "orderly key not found")
+        return {"orderly_key": request.query["orderly_key"], **key}
+
+    async def add_orderly_key(self, request):
+        from orderly_evm_connector.lib.typed_messages import ADD_ORDERLY_KEY
+
+        payload = await self._json(request)
+        message = payload.get("message") or {}
+        address = payload.get("userAddress")
+        account = self._account_by_address(address, message.get("brokerId"))
+        if account is None:
+            raise ExchangeError(400, NOT_FOUND, "account not found")
+        if self._recover(ADD_ORDERLY_KEY, message, payload.get("signature")).lower() != address.lower():
+            raise ExchangeError(400, INVALID_SIGNATURE, "wallet signature does not match userAddress")
+        account.keys[message["orderlyKey"]] = {"scope": message["scope"], "expiration": message["expiration"]}
+        return {"id": len(account.keys), "orderly_key": message["orderlyKey"]}
+
+    async def update_leverage(self, request):
+        request[ACCOUNT].leverage = int((await self._json(request)).get("leverage") or 1)
+        return {}
+
+    async def holding(self, request):
+        return {
+            "holding": [
+                {"token": token, "holding": amount, "frozen": 0, "pending_short": 0, "updated_time": now_ms()}
+                for token, amount in request[ACCOUNT].holding.items()
+            ]
+        }
+
+    async def account_info(self, request):
+        account = request[ACCOUNT]
+        return {
+            "account_id": account.account_id,
+            "email": "",
+            "account_mode": "FUTURES",
+            "max_leverage": account.leverage,
+            "taker_fee_rate": 6,
+            "maker_fee_rate": 3,
+            "futures_taker_fee_rate": 6,
+            "futures_maker_fee_rate": 3,
+            "maintenance_cancel_orders": False,
+            "imr_factor": {symbol: 0.0002 for symbol in self.symbols},
+        }
+
+    async def key_info(self, request):
+        account = request[ACCOUNT]
+        return {"rows": [{"orderly_key": key, "key_status": "ACTIVE", **info} for key, info in account.keys.items()]}
+
+    async def empty_rows(self, request):
+        return {"rows": []}
+
+    async def empty_object(self, request):
+        return {}
+
+    async def empty_page(self, request):
+        return _page([], request.query)
+
+    # trade
+
+    def _new_order(self, account, payload, algo=False):
+        symbol = payload.get("symbol")
+        info = self._symbol(symbol)
+        side = payload.get("side")
+        if side not in ("BUY", "SELL"):
+            raise ExchangeError(400, INVALID_PARAMETER, "side is invalid")
+        order_type = payload.get("order_type") or payload.get("type") or payload.get("algo_type")
+        quantity = payload.get("order_quantity", payload.get("quantity"))
+        if quantity is None and payload.get("order_amount") is not None:
+            quantity = _as_float(payload["order_amount"], "order_amount") / info["mark_price"]
+        quantity = _as_float(quantity, "order_quantity")
+        if quantity <= 0:
+            raise ExchangeError(400, INVALID_PARAMETER, "order_quantity must be positive")
+        price = payload.get("order_price", payload.get("price"))
+        if order_type in ("LIMIT", "IOC", "FOK", "POST_ONLY"):
+            price = _as_float(price, "order_price")
+        client_order_id = payload.get("client_order_id")
+        orders = account.algo_orders if algo else account.orders
+        if client_order_id and any(
+            order["client_order_id"] == client_order_id and order["status"] in ("NEW", "PARTIAL_FILLED")
+            for order in orders.values()
+        ):
+            raise ExchangeError(400, DUPLICATE_REQUEST, "client_order_id is already in use")
+        self._next_order_id += 1
+        created = now_ms()
+        order = {
+            "order_id": self._next_order_id,
+            "user_id": 1,
+            "price": price,
+            "type": order_type,
+            "quantity": quantity,
+            "amount": payload.get("order_amount"),
+            "executed": 0,
+            "visible": payload.get("visible_quantity", quantity),
+            "symbol": symbol,
+            "side": side,
+            "status": "NEW",
+            "total_fee": 0,
+            "fee_asset": "USDC",
+            "client_order_id": client_order_id,
+            "average_executed_price": None,
+            "created_time": created,
+            "updated_time": created,
+            "reduce_only": bool(payload.get("reduce_only")),
+        }
+        if algo:
+            order["algo_type"] = payload.get("algo_type")
+            order["trigger_price"] = payload.get("trigger_price")
+        orders[order["order_id"]] = order
+        if not algo:
+            self._match(account, order)
+        return order
+
+    def _match(self, account, order):
+        mark = self.symbols[order["symbol"]]["mark_price"]
+        crosses = order["price"] is None or (
+            order["price"] >= mark if order["side"] == "BUY" else order["price"] <= mark
+        )
+        if order["type"] == "POST_ONLY" and crosses:
+            order["status"] = "REJECTED"
+        elif crosses:
+            self._fill(account, order, order["price"] if order["price"] is not None else mark)
+        elif order["type"] in ("IOC", "FOK", "MARKET", "ASK", "BID"):
+            order["status"] = "CANCELLED"
+        self._push_execution(account, order)
+
+    def _fill(self, account, order, price):
+        quantity = order["quantity"] - order["executed"]
+        fee = round(price * quantity * 0.0006, 6)
+        self._next_trade_id += 1
+        trade = {
+            "id": self._next_trade_id,
+            "symbol": order["symbol"],
+            "fee": fee,
+            "fee_asset": "USDC",
+            "side": order["side"],
+            "order_id": order["order_id"],
+            "executed_price": price,
+            "executed_quantity": quantity,
+            "executed_timestamp": now_ms(),
+            "is_maker": 0,
+        }
+        account.trades.append(trade)
+        order.update(
+            executed=order["quantity"],
+            average_executed_price=price,
+            total_fee=order["total_fee"] + fee,
+            status="FILLED",
+            updated_time=trade["executed_timestamp"],
+        )
+        position = account.positions.setdefault(
+            order["symbol"], {"symbol": order["symbol"], "position_qty": 0.0, "cost_position": 0.0}
+        )
+        signed = quantity if order["side"] == "BUY" else -quantity
+        position["position_qty"] += signed
+        position["cost_position"] += signed * price
+        account.holding["USDC"] -= fee
+        return trade
+
+    def _push_execution(self, account, order):
+        trade = account.trades[-1] if order["status"] == "FILLED" and account.trades else None
+        self.push_private(
+            account.account_id,
+            "executionreport",
+            {
+                "symbol": order["symbol"],
+                "clientOrderId": order["client_order_id"] or "",
+                "orderId": order["order_id"],
+                "type": order["type"],
+                "side": order["side"],
+                "quantity": order["quantity"],
+                "price": order["price"],
+                "tradeId": trade["id"] if trade else 0,
+                "executedPrice": trade["executed_price"] if trade else 0,
+                "executedQuantity": trade["executed_quantity"] if trade else 0,
+                "fee": trade["fee"] if trade else 0,
+                "feeAsset": "USDC",
+                "totalExecutedQuantity": order["executed"],
+                "avgPrice": order["average_executed_price"] or 0,
+                "status": order["status"],
+                "reason": "",
+                "timestamp": order["updated_time"],
+            },
+        )
+
+    @staticmethod
+    def _order_response(order):
+        return {
+            "order_id": order["order_id"],
+            "client_order_id": order["client_order_id"],
+            "order_type": order["type"],
+            "order_price": order["price"],
+            "order_quantity": order["quantity"],
+            "order_amount": order["amount"],
+        }
+
+    async def create_order(self, request):
+        order = self._new_order(request[ACCOUNT], await self._json(request))
+        if order["status"] == "REJECTED":
+            raise ExchangeError(400, INVALID_PARAMETER, "post only order would take liquidity")
+        return self._order_response(order)
+
+    async def create_algo_order(self, request):
+        order = self._new_order(request[ACCOUNT], await self._json(request), algo=True)
+        return {"rows": [{"order_id": order["order_id"], "client_order_id": order["client_order_id"], "algo_type": order["algo_type"]}]}
+
+    async def batch_create_order(self, request):
+        orders = (await self._json(request)).get("orders") or []
+        if len(orders) > 10:
+            raise ExchangeError(400, INVALID_PARAMETER, "at most 10 orders per batch")
+        return {"rows": [self._order_response(self._new_order(request[ACCOUNT], order)) for order in orders]}
+
+    def _find(self, orders, order_id=None, client_order_id=None):
+        for order in orders.values():
+            if order_id is not None and str(order["order_id"]) == str(order_id):
+                return order
+            if client_order_id is not None and order["client_order_id"] == client_order_id:
+                return order
+        raise ExchangeError(400, NOT_FOUND, "order not found")
+
+    async def edit_order(self, request):
+        payload = await self._json(request)
+        order = self._find(request[ACCOUNT].orders, payload.get("order_id"))
+        if order["status"] not in ("NEW", "PARTIAL_FILLED"):
+            raise ExchangeError(400, INVALID_PARAMETER, "order is not open")
+        order.update(
+            price=_as_float(payload.get("order_price", order["price"]), "order_price"),
+            quantity=_as_float(payload.get("order_quantity", order["quantity"]), "order_quantity"),
+            updated_time=now_ms(),
+        )
+        self._match(request[ACCOUNT], order)
+        return {"status": "EDIT_SENT"}
+
+    async def edit_algo_order(self, request):
+        payload = await self._json(request)
+        order = self._find(request[ACCOUNT].algo_orders, payload.get("order_id"))
+        order.update({k: v for k, v in payload.items() if k in ("price", "quantity", "trigger_price")})
+        return {"status": "EDIT_SENT"}
+
+    def _cancel(self, account, order):
+        if order["status"] not in ("NEW", "PARTIAL_FILLED"):
+            raise ExchangeError(400, INVALID_PARAMETER, "order is not open")
+        order.update(status="CANCELLED", updated_time=now_ms())
+        self._push_execution(account, order)
+
+    async def cancel_order(self, request):
+        query = request.query
+        order = self._find(request[ACCOUNT].orders, query.get("order_id"), query.get("client_order_id"))
+        self._cancel(request[ACCOUNT], order)
+        return {"status": "CANCEL_SENT"}
+
+    async def cancel_algo_order(self, request):
+        query = request.query
+        order = self._find(request[ACCOUNT].algo_orders, query.get("order_id"), query.get("client_order_id"))
+        order.update(status="CANCELLED", updated_time=now_ms())
+        return {"status": "CANCEL_SENT"}
+
+    def _cancel_all(self, account, orders, symbol):
+        for order in orders.values():
+            if order["status"] in ("NEW", "PARTIAL_FILLED") and (not symbol or order["symbol"] == symbol):
+                order.update(status="CANCELLED", updated_time=now_ms())
+
+    async def cancel_orders(self, request):
+        self._cancel_all(request[ACCOUNT], request[ACCOUNT].orders, request.query.get("symbol"))
+        return {"status": "CANCEL_ALL_SENT"}
+
+    async def cancel_algo_orders(self, request):
+        self._cancel_all(request[ACCOUNT], request[ACCOUNT].algo_orders, request.query.get("symbol"))
+        return {"status": "CANCEL_ALL_SENT"}
+
+    async def batch_cancel_orders(self, request):
+        account = request[ACCOUNT]
+        if "order_ids" in request.query:
+            ids = [{"order_id": i} for i in request.query["order_ids"].split(",") if i]
+        else:
+            ids = [{"client_order_id": i} for i in request.query.get("client_order_ids", "").split(",") if i]
+        for key in ids:
+            self._cancel(account, self._find(account.orders, **key))
+        return {"status": "CANCEL_ALL_SENT"}
+
+    async def get_order(self, request):
+        return self._find(
+            request[ACCOUNT].orders,
+            request.match_info.get("order_id"),
+            request.match_info.get("client_order_id"),
+        )
+
+    async def get_algo_order(self, request):
+        return self._find(
+            request[ACCOUNT].algo_orders,
+            request.match_info.get("order_id"),
+            request.match_info.get("client_order_id"),
+        )
+
+    @staticmethod
+    def _filter_orders(orders, query):
+        status = query.get("status")
+        rows = []
+        for order in orders.values():
+            if query.get("symbol") and order["symbol"] != query["symbol"]:
+                continue
+            if query.get("side") and order["side"] != query["side"]:
+                continue
+            if status == "INCOMPLETE" and order["status"] not in ("NEW", "PARTIAL_FILLED"):
+                continue
+            if status == "COMPLETED" and order["status"] in ("NEW", "PARTIAL_FILLED"):
+                continue
+            if status not in (None, "INCOMPLETE", "COMPLETED") and order["status"] != status:
+                continue
+            rows.append(order)
+        return rows
+
+    async def get_orders(self, request):
+        return _page(self._filter_orders(request[ACCOUNT].orders, request.query), request.query)
+
+    async def get_algo_orders(self, request):
+        return _page(self._filter_orders(request[ACCOUNT].algo_orders, request.query), request.query)
+
+    async def get_order_trades(self, request):
+        order_id = request.match_info["order_id"]
+        return {"rows": [t for t in request[ACCOUNT].trades if str(t["order_id"]) == order_id]}
+
+    async def get_trades(self, request):
+        trades = request[ACCOUNT].trades
+        symbol = request.query.get("symbol")
+        return _page([t for t in trades if not symbol or t["symbol"] == symbol], request.query)
+
+    async def get_trade(self, request):
+        for trade in request[ACCOUNT].trades:
+            if str(trade["id"]) == request.match_info["trade_id"]:
+                return trade
+        raise ExchangeError(400, NOT_FOUND, "trade not found")
+
+    def _position_row(self, position):
+        qty = position["position_qty"]
+        mark = self.symbols[position["symbol"]]["mark_price"]
+        average = position["cost_position"] / qty if qty else 0
+        return {
+            "symbol": position["symbol"],
+            "position_qty": qty,
+            "cost_position": position["cost_position"],
+            "average_open_price": average,
+            "mark_price": mark,
+            "unsettled_pnl": qty * mark - position["cost_position"],
+            "timestamp": now_ms(),
+        }
+
+    async def get_positions(self, request):
+        rows = [self._position_row(p) for p in request[ACCOUNT].positions.values()]
+        return {"current_margin_ratio_with_orders": 1, "free_collateral": request[ACCOUNT].holding["USDC"], "rows": rows}
+
+    async def get_position(self, request):
+        symbol = request.match_info["symbol"]
+        self._symbol(symbol)
+        position = request[ACCOUNT].positions.get(
+            symbol, {"symbol": symbol, "position_qty": 0.0, "cost_position": 0.0}
+        )
+        return self._position_row(position)
+
+    # market
+
+    def book(self, symbol, levels=100):
+        """Synthetic order book around the mark price: (asks, bids) of [price, quantity]"""
+        info = self._symbol(symbol)
+        mark, tick = info["mark_price"], info["quote_tick"]
+        rng = random.Random(f"{symbol}{mark}")
+        asks = [[round(mark + tick * (i + 1), 8), round(rng.uniform(0.01, 5), 4)] for i in range(levels)]
+        bids = [[round(mark - tick * (i + 1), 8), round(rng.uniform(0.01, 5), 4)] for i in range(levels)]
+        return asks, bids
+
+    async def orderbook(self, request):
+        asks, bids = self.book(request.match_info["symbol"], int(request.query.get("max_level") or 100))
+        return {
+            "asks": [{"price": p, "quantity": q} for p, q in asks],
+            "bids": [{"price": p, "quantity": q} for p, q in bids],
+            "timestamp": now_ms(),
+        }
+
+    async def market_trades(self, request):
+        symbol = request.query.get("symbol")
+        mark = self._symbol(symbol)["mark_price"]
+        limit = int(request.query.get("limit") or 10)
+        return {
+            "rows": [
+                {
+                    "symbol": symbol,
+                    "side": self.rng.choice(["BUY", "SELL"]),
+                    "executed_price": mark,
+                    "executed_quantity": round(self.rng.uniform(0.01, 1), 4),
+                    "executed_timestamp": now_ms() - i * 1000,
+                }
+                for i in range(limit)
+            ]
+        }
+
+    async def volume_stats(self, request):
+        return {"perp_volume_last_24h": 1.0e9, "perp_volume_last_7_days": 7.0e9, "perp_volume_ltd": 1.0e11}
+
+    async def funding_rates(self, request):
+        symbol = request.match_info.get("symbol")
+        symbols = [symbol] if symbol else list(self.symbols)
+        rows = [
+            {
+                "symbol": s,
+                "est_funding_rate": 0.0001,
+                "est_funding_rate_timestamp": now_ms(),
+                "last_funding_rate": 0.0001,
+                "last_funding_rate_timestamp": now_ms() - 8 * 3600_000,
+                "next_funding_time": now_ms() + 8 * 3600_000,
+                "sum_unitary_funding": 0.5,
+            }
+            for s in symbols
+        ]
+        if symbol:
+            self._symbol(symbol)
+            return rows[0]
+        return {"rows": rows}
+
+    def _futures_row(self, symbol):
+        mark = self.symbols[symbol]["mark_price"]
+        return {
+            "symbol": symbol,
+            "index_price": mark,
+            "mark_price": mark,
+            "sum_unitary_funding": 0.5,
+            "est_funding_rate": 0.0001,
+            "last_funding_rate": 0.0001,
+            "next_funding_time": now_ms() + 8 * 3600_000,
+            "open_interest": 1000,
+            "24h_open": mark,
+            "24h_close": mark,
+            "24h_high": mark,
+            "24h_low": mark,
+            "24h_volume": 1000,
+            "24h_amount": 1000 * mark,
+        }
+
+    async def futures(self, request):
+        symbol = request.match_info.get("symbol")
+        if symbol is not None:
+            self._symbol(symbol)
+            return self._futures_row(symbol)
+        return {"rows": [self._futures_row(symbol) for symbol in self.symbols]}
+
+    async def tv_config(self, request):
+        return {"resolutions": ["1", "5", "15", "30", "60", "1D"], "supported_resolutions": ["1", "5", "15", "30", "60", "1D"]}
+
+    async def tv_history(self, request):
+        return web.json_response({"s": "no_data"})
+
+    async def tv_symbol_info(self, request):
+        return {"symbol": request.query.get("group"), "rows": [self._info_row(s) for s in self.symbols]}
+
+    async def kline(self, request):
+        symbol = request.query.get("symbol")
+        mark = self._symbol(symbol)["mark_price"]
+        limit = int(request.query.get("limit") or 100)
+        start = now_ms() // 60_000 * 60_000
+        return {
+            "rows": [
+                {
+                    "open": mark,
+                    "close": mark,
+                    "low": mark,
+                    "high": mark,
+                    "volume": 1.0,
+                    "amount": mark,
+                    "symbol": symbol,
+                    "type": request.query.get("type", "1m"),
+                    "start_timestamp": start - i * 60_000,
+                    "end_timestamp": start - (i - 1) * 60_000,
+                }
+                for i in range(limit)
+            ]
+        }
+
+    # streams
+
+    async def public_stream(self, request):
+        return await self._stream(request, private=False)
+
+    async def private_stream(self, request):
+        return await self._stream(request, private=True)
+
+    async def _stream(self, request, private):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        connection = StreamConnection(self, ws, request.match_info["account_id"], private)
+        self.connections.append(connection)
+        try:
+            await connection.serve()
+        finally:
+            self.connections.remove(connection)
+        return ws
+
+    def subscribers(self, topic):
+        return [c for c in self.connections if topic in c.topics]
+
+    async def publish(self, topic, data, ts=None):
+        """Push {topic, ts, data} to every public subscriber of topic"""
+        frame = json.dumps({"topic": topic, "ts": ts or now_ms(), "data": data})
+        await self.publish_raw(topic, frame)
+
+    async def publish_raw(self, topic, frame: str):
+        """Push an already serialized frame to every subscriber of topic"""
+        for connection in self.subscribers(topic):
+            await connection.send_str(frame)
+
+    def push_private(self, account_id, topic, data):
+        frame = json.dumps({"topic": topic, "ts": now_ms(), "data": data})
+        for connection in self.connections:
+            if connection.private and connection.account_id == account_id and topic in connection.topics:
+                connection.send_nowait(frame)
+
+    async def disconnect_all(self, code=1011):
+        """Close every websocket connection, e.g. to exercise reconnects"""
+        for connection in list(self.connections):
+            await connection.close(code)
+
+
+class StreamConnection(object):
+    """Server side of one websocket connection"""
+
+    def __init__(self, exchange: ExchangeSimulator, ws, account_id, private):
+        self.exchange = exchange
+        self.ws = ws
+        self.account_id = account_id
+        self.private = private
+        self.authenticated = False
+        self.topics = set()
+        self.received = []
+        self.pongs = 0
+        self._pending = set()
+
+    async def send_str(self, frame: str):
+        if not self.ws.closed:
+            await self.ws.send_str(frame)
+
+    def send_nowait(self, frame: str):
+        task = asyncio.ensure_future(self.send_str(frame))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def send_json(self, message: dict):
+        await self.send_str(json.dumps(message))
+
+    async def close(self, code=1000):
+        await self.ws.close(code=code)
+
+    async def _ping(self):
+        while not self.ws.closed:
+            await asyncio.sleep(self.exchange.ping_interval)
+            await self.send_json({"event": "ping", "ts": now_ms()})
+
+    async def serve(self):
+        pinger = asyncio.ensure_future(self._ping())
+        try:
+            async for msg in self.ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    message = json.loads(msg.data)
+                except ValueError:
+                    continue
+                self.received.append(message)
+                await self.handle(message)
+        finally:
+            pinger.cancel()
+
+    def _reply(self, message, success=True, **extra):
+        reply = {"id": message.get("id"), "event": message.get("event"), "success": success, "ts": now_ms()}
+        reply.update(extra)
+        return self.send_json(reply)
+
+    async def handle(self, message):
+        event = message.get("event")
+        if event == "pong":
+            self.pongs += 1
+        elif event == "ping":
+            await self.send_json({"event": "pong", "ts": now_ms()})
+        elif event == "auth":
+            await self._auth(message)
+        elif event == "subscribe":
+            await self._subscribe(message)
+        elif event == "unsubscribe":
+            self.topics.discard(message.get("topic"))
+            await self._reply(message, data=message.get("topic"))
+        elif event == "request":
+            await self._request(message)
+        else:
+            await self._reply(message, success=False, errorMsg="unknown event")
+
+    async def _auth(self, message):
+        params = message.get("params") or {}
+        account = self.exchange.accounts.get(self.account_id)
+        orderly_key = params.get("orderly_key")
+        ok = (
+            self.private
+            and account is not None
+            and orderly_key in account.keys
+            and _verify(orderly_key, params.get("sign", ""), str(params.get("timestamp")).encode())
+        )
+        self.authenticated = bool(ok)
+        if ok:
+            await self._reply(message)
+        else:
+            await self._reply(message, success=False, errorMsg="authentication failed")
+
+    async def _subscribe(self, message):
+        topic = message.get("topic")
+        if not topic:
+            return await self._reply(message, success=False, errorMsg="topic is required")
+        if topic in PRIVATE_TOPICS and not self.authenticated:
+            return await self._reply(message, success=False, errorMsg="not authenticated", data=topic)
+        self.topics.add(topic)
+        await self._reply(message, data=topic)
+
+    async def _request(self, message):
+        params = message.get("params") or {}
+        if params.get("type") != "orderbook" or params.get("symbol") not in self.exchange.symbols:
+            return await self._reply(message, success=False, errorMsg="invalid request")
+        asks, bids = self.exchange.book(params["symbol"])
+        await self._reply(message, data={"symbol": params["symbol"], "ts": now_ms(), "asks": asks, "bids": bids})
@@ -0,0 +1,169 @@
+import asyncio
+import base64
+
+from aiohttp import web
+from orderly_evm_connector.rest import Rest as Client
+from tests.utils import generate_orderly_secret, local_server, random_str
+
+
+def test_concurrent_signed_requests_carry_their_own_headers():
+    orderly_secret, public_key = generate_orderly_secret()
+    seen = []
+
+    async def create_order(request):
+        body = await request.text()
+        message = "{}{}{}{}".format(
+            request.headers["orderly-timestamp"], request.method, request.path, body
+        )
+        public_key.verify(
+            base64.b64decode(request.headers["orderly-signature"]), message.encode()
+        )
+        seen.append((await request.json())["client_order_id"])
+        return web.json_response({"success": True})
+
+    async def run():
+        async with local_server([web.post("/v1/order", create_order)]) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                orderly_account_id=random_str(),
+            )
+            client.orderly_endpoint = url
+            try:
+                return await asyncio.gather(
+                    *[
+                        client.create_order(
+                            "PERP_BTC_USDC",
+                            "LIMIT",
+                            "BUY",
+                            client_order_id=str(i),
+                            order_price=1,
+                            order_quantity=1,
+                        )
+                        for i in range(50)
+                    ]
+                )
+            finally:
+                await client.close()
+
+    responses = asyncio.run(run())
+    responses.should.have.length_of(50)
+    sorted(seen, key=int).should.equal([str(i) for i in range(50)])
+
+
+def test_signed_headers_do_not_leak_into_session():
+    orderly_secret, _ = generate_orderly_secret()
+
+    async def info(request):
+        return web.json_response({"headers": dict(request.headers)})
+
+    async def run():
+        async with local_server([web.get("/v1/client/info", info)]) as url:
+            client = Client(orderly_key=random_str(), orderly_secret=orderly_secret)
+            client.orderly_endpoint = url
+            try:
+                response = await client.get_account_information()
+                return response, dict(client.session.headers)
+            finally:
+                await client.close()
+
+    response, session_headers = asyncio.run(run())
+    response["headers"].should.have.key("orderly-signature")
+    session_headers.shouldnt.have.key("orderly-signature")
+    session_headers.shouldnt.have.key("orderly-timestamp")
+
+
+def test_signed_body_is_serialized_once_and_sent_as_is():
+    from orderly_evm_connector.lib.json_codec import JsonCodec, get_codec
+
+    orderly_secret, public_key = generate_orderly_secret()
+    codec = get_codec()
+    serialized = []
+
+    def dumps_bytes(obj):
+        serialized.append(obj)
+        return codec.dumps_bytes(obj)
+
+    counting_codec = JsonCodec("counting", codec.dumps, dumps_bytes, codec.loads)
+    received = []
+
+    async def create_order(request):
+        body = await request.read()
+        message = "{}{}{}".format(
+            request.headers["orderly-timestamp"], request.method, request.path
+        ).encode() + body
+        public_key.verify(base64.b64decode(request.headers["orderly-signature"]), message)
+        received.append((request.headers["Content-Type"], body))
+        return web.json_response({"success": True})
+
+    async def run():
+        async with local_server([web.post("/v1/order", create_order)]) as url:
+            client = Client(
+                orderly_key=random_str(),
+                orderly_secret=orderly_secret,
+                json_codec=counting_codec,
+            )
+            client.orderly_endpoint = url
+            try:
+                await client.create_order(
+                    "PERP_BTC_USDC", "LIMIT", "BUY", order_price=1, order_quantity=1
+                )
+            finally:
+                await client.close()
+
+    asyncio.run(run())
+    len(serialized).should.equal(1)
+    received.should.equal([("application/json", codec.dumps_bytes(serialized[0]))])
+
+
+def test_response_is_decoded_once_and_logged_only_at_debug(monkeypatch):
+    import logging
+
+    from aiohttp import ClientResponse
+    from orderly_evm_connector.lib.json_codec import JsonCodec, get_codec
+
+    codec = get_codec()
+    decoded = []
+
+    def loads(data):
+        decoded.append(data)
+        return codec.loads(data)
+
+    async def no_text(self, *args, **kwargs):
+        raise AssertionError("response.text() should not be called")
+
+    monkeypatch.setattr(ClientResponse, "text", no_text)
+    counting_codec = JsonCodec("counting", codec.dumps, codec.dumps_bytes, loads)
+    logged = []
+
+    class Handler(logging.Handler):
+        def emit(self, record):
+            logged.append(record.getMessage())
+
+    async def info(request):
+        return web.json_response({"success": True, "data": {"rows": [1, 2, 3]}})
+
+    async def run(client):
+        async with local_server([web.get("/v1/public/info", info)]) as url:
+            client.orderly_endpoint = url
+            try:
+                return await client.get_available_symbols()
+            finally:
+                await client.close()
+
+    client = Client(json_codec=counting_codec)
+    handler = Handler()
+    client.logger.addHandler(handler)
+    level = client.logger.level
+    try:
+        client.logger.setLevel(logging.INFO)
+        asyncio.run(run(client))["data"]["rows"].should.equal([1, 2, 3])
+        len(decoded).should.equal(1)
+        logged.should.equal([])
+
+        client.logger.setLevel(logging.DEBUG)
+        asyncio.run(run(client))
+        [m for m in logged if m.startswith("raw response")].should.have.length_of(1)
+    finally:
+        client.logger.removeHandler(handler)
+        client.logger.setLevel(level)
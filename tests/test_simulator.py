@@ -0,0 +1,192 @@
+import asyncio
+import time
+
+import pytest
+
+from orderly_evm_connector.error import ClientError, ServerError
+from orderly_evm_connector.lib.retry import RetryPolicy
+from orderly_evm_connector.lib.signer import get_wallet_signer
+from orderly_evm_connector.rest import Rest
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+from tests.simulator import ExchangeSimulator
+from tests.utils import generate_orderly_secret, random_str
+
+
+def _client(exchange, account, **kwargs):
+    client = Rest(
+        orderly_key=account.orderly_key,
+        orderly_secret=account.orderly_secret,
+        orderly_account_id=account.account_id,
+        **kwargs,
+    )
+    client.orderly_endpoint = exchange.rest_url
+    return client
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def test_orders_are_created_queried_and_cancelled():
+    async def run():
+        async with ExchangeSimulator() as exchange:
+            account = exchange.add_account()
+            client = _client(exchange, account)
+            client_order_id = random_str()[:32]
+            try:
+                created = await client.create_order(
+                    "PERP_BTC_USDC", "LIMIT", "BUY", order_price=50000, order_quantity=0.01,
+                    client_order_id=client_order_id,
+                )
+                order = await client.get_order(created["data"]["order_id"])
+                cancelled = await client.cancel_order_by_client_order_id(client_order_id, "PERP_BTC_USDC")
+                filled = await client.create_order("PERP_ETH_USDC", "MARKET", "SELL", order_quantity=1)
+                position = await client.get_one_position_info("PERP_ETH_USDC")
+            finally:
+                await client.close()
+            return order["data"], cancelled["data"], filled["data"], position["data"], account
+
+    order, cancelled, filled, position, account = asyncio.run(run())
+    order["status"].should.equal("NEW")
+    order["price"].should.equal(50000)
+    cancelled.should.equal({"status": "CANCEL_SENT"})
+    account.orders[order["order_id"]]["status"].should.equal("CANCELLED")
+    account.orders[filled["order_id"]]["status"].should.equal("FILLED")
+    position["position_qty"].should.equal(-1)
+
+
+def test_requests_signed_with_an_unknown_key_are_rejected():
+    async def run():
+        async with ExchangeSimulator() as exchange:
+            account = exchange.add_account()
+            other_secret, _ = generate_orderly_secret()
+            client = _client(exchange, account)
+            client.set_account_keys(account.account_id, other_secret, account.orderly_key)
+            try:
+                with pytest.raises(ClientError) as error:
+                    await client.get_all_positions_info()
+            finally:
+                await client.close()
+            return error.value, exchange.rejected_signatures
+
+    error, rejected = asyncio.run(run())
+    error.status_code.should.equal(401)
+    error.error_code.should.equal(-1001)
+    rejected.should.equal(1)
+
+
+def test_injected_errors_are_retried_and_latency_is_added():
+    async def run():
+        async with ExchangeSimulator() as exchange:
+            account = exchange.add_account()
+            policy = RetryPolicy(base_delay=0.001)
+            client = _client(exchange, account, retry_policy=policy)
+            exchange.inject("GET /v1/positions", status=503, times=2, headers={"Retry-After": "0"})
+            exchange.inject("GET /v1/public/futures", latency=0.2)
+            try:
+                positions = await client.get_all_positions_info()
+                started = time.perf_counter()
+                await client.get_futures_info_for_all_markets()
+                elapsed = time.perf_counter() - started
+                exchange.inject("GET /v1/client/holding", status=500)
+                with pytest.raises(ServerError):
+                    await client.get_current_holdings()
+            finally:
+                await client.close()
+            return positions["data"], policy.retries, elapsed, exchange.requests
+
+    positions, retries, elapsed, requests = asyncio.run(run())
+    positions["rows"].should.equal([])
+    retries.should.equal(4)
+    elapsed.should.be.greater_than(0.19)
+    requests["GET /v1/positions"].should.equal(3)
+    requests["GET /v1/client/holding"].should.equal(3)
+
+
+def test_public_stream_pushes_subscribed_topics():
+    async def run():
+        async with ExchangeSimulator(ping_interval=0.05) as exchange:
+            received = []
+
+            async def on_message(_, message):
+                received.append(message)
+
+            client = OrderlyWebsocketClient(exchange.public_ws_url, async_mode=True, on_message=on_message)
+            await asyncio.wait_for(client.run(), 5)
+            client.subscribe({"id": client.wss_id, "event": "subscribe", "topic": "PERP_BTC_USDC@bbo"})
+            await _wait_for(lambda: exchange.subscribers("PERP_BTC_USDC@bbo"))
+            await exchange.publish("PERP_BTC_USDC@bbo", {"symbol": "PERP_BTC_USDC", "ask": 1, "bid": 0.9})
+            await exchange.publish("PERP_ETH_USDC@bbo", {"symbol": "PERP_ETH_USDC", "ask": 1, "bid": 0.9})
+            await _wait_for(lambda: any("topic" in m for m in received))
+            await client.stop_async()
+            return received
+
+    received = asyncio.run(run())
+    acks = [m for m in received if m.get("event") == "subscribe"]
+    acks[0]["data"].should.equal("PERP_BTC_USDC@bbo")
+    acks[0]["success"].should.be.true
+    [m["topic"] for m in received if "topic" in m].should.equal(["PERP_BTC_USDC@bbo"])
+
+
+def test_private_stream_authenticates_and_reports_executions():
+    async def run():
+        async with ExchangeSimulator() as exchange:
+            account = exchange.add_account()
+            reports = []
+            client = OrderlyWebsocketClient(
+                exchange.private_ws_url,
+                orderly_account_id=account.account_id,
+                orderly_key=account.orderly_key,
+                orderly_secret=account.orderly_secret,
+                private=True,
+                async_mode=True,
+                on_message=lambda _, message: asyncio.sleep(0),
+            )
+            client.on("executionreport", lambda _, message: reports.append(message["data"]))
+            await asyncio.wait_for(client.run(), 5)
+            client.subscribe({"id": client.wss_id, "event": "subscribe", "topic": "executionreport"})
+            await _wait_for(lambda: exchange.subscribers("executionreport"))
+            rest = _client(exchange, account)
+            try:
+                await rest.create_order("PERP_BTC_USDC", "MARKET", "BUY", order_quantity=0.1)
+            finally:
+                await rest.close()
+            await _wait_for(lambda: reports)
+            await client.stop_async()
+            return reports
+
+    reports = asyncio.run(run())
+    reports[0]["status"].should.equal("FILLED")
+    reports[0]["side"].should.equal("BUY")
+    reports[0]["executedQuantity"].should.equal(0.1)
+
+
+def test_accounts_are_registered_with_a_wallet_signature():
+    wallet_secret = "0x" + "11" * 32
+
+    async def run():
+        async with ExchangeSimulator() as exchange:
+            client = Rest(wallet_secret=wallet_secret)
+            client.orderly_endpoint = exchange.rest_url
+            address = get_wallet_signer(wallet_secret).address
+            try:
+                nonce = await client.get_registration_nonce()
+                registered = await client.register_account(
+                    "woofi_pro", 421614, int(nonce["data"]["registration_nonce"]), address
+                )
+                account = await client.get_account(address, "woofi_pro")
+                replayed = await client.register_account(
+                    "woofi_pro", 421614, int(nonce["data"]["registration_nonce"]), address
+                )
+            finally:
+                await client.close()
+            return registered["data"], account["data"], replayed
+
+    registered, account, replayed = asyncio.run(run())
+    account["account_id"].should.equal(registered["account_id"])
+    replayed["success"].should.be.false
+    replayed["code"].should.equal(-1005)
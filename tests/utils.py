@@ -4,6 +4,9 @@ import uuid
 import time
 import random
 import responses
+from contextlib import asynccontextmanager
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 
 def mock_http_response(
@@ -47,4 +50,25 @@ def current_timestamp() -> int:
 
 
 def timestamp(in_future: int = 0) -> int:
-    return current_timestamp() + in_future
\ No newline at end of file
+    return current_timestamp() + in_future
+
+def generate_orderly_secret():
+    """Return an (orderly_secret, public_key) pair usable for signing in tests"""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    from orderly_evm_connector.lib.utils import encode_key
+
+    private_key = Ed25519PrivateKey.generate()
+    return encode_key(private_key.private_bytes_raw()), private_key.public_key()
+
+
+@asynccontextmanager
+async def local_server(routes):
+    """Run an in-process aiohttp server and yield its base url"""
+    app = web.Application()
+    app.add_routes(routes)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield str(server.make_url("")).rstrip("/")
+    finally:
+        await server.close()
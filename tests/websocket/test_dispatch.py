@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from orderly_evm_connector.error import WebsocketClientError
+from orderly_evm_connector.lib.json_codec import JsonCodec, get_codec
+from orderly_evm_connector.websocket.dispatch import TopicRouter
+from orderly_evm_connector.websocket.websocket_api import WebsocketPublicAPIClient
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+from tests.simulator import ExchangeSimulator
+
+
+def test_router_matches_exact_and_wildcard_patterns():
+    router = TopicRouter()
+    exact, bbo, btc, everything = object(), object(), object(), object()
+    router.add("PERP_BTC_USDC@bbo", exact)
+    router.add("*@bbo", bbo)
+    router.add("PERP_BTC_USDC@*", btc)
+    router.handlers("PERP_BTC_USDC@bbo").should.equal((exact, bbo, btc))
+    router.handlers("PERP_ETH_USDC@bbo").should.equal((bbo,))
+    router.handlers("PERP_ETH_USDC@kline_1m").should.equal(())
+    router.handlers("executionreport").should.equal(())
+    router.add("*", everything)
+    router.handlers("executionreport").should.equal((everything,))
+    router.remove("*@bbo", bbo)
+    router.handlers("PERP_ETH_USDC@bbo").should.equal((everything,))
+
+
+def test_router_dispatches_to_sync_and_async_handlers():
+    router = TopicRouter()
+    received = []
+
+    async def async_handler(_, message):
+        received.append(("async", message["topic"]))
+
+    router.add("*@kline_1m", async_handler)
+    router.add("PERP_BTC_USDC@kline_1m", lambda _, message: received.append(("sync", message["topic"])))
+
+    async def run():
+        handled = await router.dispatch(None, {"topic": "PERP_BTC_USDC@kline_1m"})
+        unhandled = await router.dispatch(None, {"event": "subscribe"})
+        return handled, unhandled
+
+    asyncio.run(run()).should.equal((True, False))
+    received.should.equal([("sync", "PERP_BTC_USDC@kline_1m"), ("async", "PERP_BTC_USDC@kline_1m")])
+
+
+def test_client_routes_subscribed_topics_and_falls_back_to_on_message():
+    class FakeSocketManager(object):
+        def __init__(self):
+            self.sent = []
+
+        def send_message(self, message):
+            self.sent.append(message)
+
+    fallback, bbos = [], []
+
+    async def on_message(_, message):
+        fallback.append(message)
+
+    async def on_bbo(_, message):
+        bbos.append(message["topic"])
+
+    client = WebsocketPublicAPIClient(on_message=on_message)
+    client.socket_manager = FakeSocketManager()
+    client.get_bbo("PERP_BTC_USDC@bbo", handler=on_bbo)
+    client.get_trade("PERP_BTC_USDC@trade")
+
+    async def run():
+        await client._dispatch_message(None, {"topic": "PERP_BTC_USDC@bbo"})
+        await client._dispatch_message(None, {"topic": "PERP_BTC_USDC@trade"})
+        client.unsubscribe({"id": client.wss_id, "event": "unsubscribe", "topic": "PERP_BTC_USDC@bbo"})
+        await client._dispatch_message(None, {"topic": "PERP_BTC_USDC@bbo"})
+
+    asyncio.run(run())
+    bbos.should.equal(["PERP_BTC_USDC@bbo"])
+    [m["topic"] for m in fallback].should.equal(["PERP_BTC_USDC@trade", "PERP_BTC_USDC@bbo"])
+    len(client.socket_manager.sent).should.equal(3)
+
+
+def test_sync_client_routes_subscribed_topics_through_handlers():
+    loop = asyncio.new_event_loop()
+    exchange = ExchangeSimulator(ping_interval=3600)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(exchange.start(), loop).result(5)
+    fallback, bbos, decoded = [], [], []
+    codec = get_codec()
+
+    def loads(data):
+        decoded.append(data if isinstance(data, bytes) else data.encode())
+        return codec.loads(data)
+
+    async def on_trade(_, message):
+        pass
+
+    try:
+        client = OrderlyWebsocketClient(
+            exchange.public_ws_url,
+            on_message=lambda _, data: fallback.append(data),
+            json_codec=JsonCodec(codec.name, codec.dumps, codec.dumps_bytes, loads),
+        )
+        with pytest.raises(WebsocketClientError):
+            client.on("*@trade", on_trade)
+        client.subscribe(
+            {"id": client.wss_id, "event": "subscribe", "topic": "PERP_BTC_USDC@bbo"},
+            handler=lambda _, message: bbos.append(message["data"]),
+        )
+        deadline = time.monotonic() + 5
+        while not exchange.subscribers("PERP_BTC_USDC@bbo") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        asyncio.run_coroutine_threadsafe(
+            exchange.publish("PERP_BTC_USDC@bbo", {"ask": 1.0}), loop
+        ).result(5)
+        while not bbos and time.monotonic() < deadline:
+            time.sleep(0.01)
+        client.stop()
+    finally:
+        asyncio.run_coroutine_threadsafe(exchange.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+
+    bbos.should.equal([{"ask": 1.0}])
+    # the subscribe response has no handler and reaches on_message as the raw frame
+    fallback.should.have.length_of(1)
+    fallback[0].should.contain('"subscribe"')
+    # the read loop decodes each frame once, the router reuses the result
+    len(decoded).should.equal(len(set(decoded)))
@@ -0,0 +1,95 @@
+import asyncio
+
+from orderly_evm_connector.websocket.orderbook import OrderBook, OrderBookManager, PriceLevels
+
+
+def test_price_levels_keep_best_first_and_bounded():
+    bids = PriceLevels(descending=True, max_levels=3)
+    for price in [100.0, 102.0, 101.0, 99.0]:
+        bids.update(price, 1.0)
+    bids.top(5).should.equal([(102.0, 1.0), (101.0, 1.0), (100.0, 1.0)])
+    bids.update(101.0, 0)
+    bids.top(5).should.equal([(102.0, 1.0), (100.0, 1.0)])
+    bids.cumulative_quantity(100.0).should.equal(2.0)
+    bids.quantity_at(99.0).should.equal(0.0)
+
+
+def test_order_book_applies_updates_in_sequence():
+    book = OrderBook("PERP_BTC_USDC")
+    book.apply_snapshot([[101, 1], [102, 2]], [{"price": 100, "quantity": 3}], ts=10)
+    book.apply_update([[101, 0]], [[100.5, 1]], ts=9, prev_ts=8).should.be.true
+    book.apply_update([[101, 0]], [[100.5, 1]], ts=12, prev_ts=9).should.be.true
+    book.apply_update([[103, 1]], [], ts=14, prev_ts=12).should.be.true
+    book.best_ask().should.equal((102.0, 2.0))
+    book.best_bid().should.equal((100.5, 1.0))
+    book.spread().should.equal(1.5)
+    book.top(2)["asks"].should.equal([(102.0, 2.0), (103.0, 1.0)])
+
+
+def test_order_book_detects_gap_and_replays_after_snapshot():
+    book = OrderBook("PERP_BTC_USDC")
+    book.apply_snapshot([[101, 1]], [[100, 1]], ts=10)
+    book.apply_update([], [[100, 2]], ts=12, prev_ts=10).should.be.true
+    book.apply_update([], [[99, 1]], ts=16, prev_ts=14).should.be.false
+    book.synced.should.be.false
+    book.gaps.should.equal(1)
+    book.apply_update([], [[98, 1]], ts=18, prev_ts=16).should.be.false
+    book.apply_snapshot([[101, 1]], [[100, 5]], ts=15)
+    book.synced.should.be.true
+    book.ts.should.equal(18)
+    [price for price, _ in book.bids.top(3)].should.equal([100.0, 99.0, 98.0])
+
+
+def test_manager_resyncs_through_request_orderbook():
+    class FakeClient(object):
+        def __init__(self):
+            self.sent = []
+            self.on_message = None
+
+        def get_orderbookupdate(self, topic):
+            self.sent.append(("subscribe", topic))
+
+        def request_orderbook(self, type, symbol):
+            self.sent.append(("request", symbol))
+
+    forwarded = []
+
+    async def on_message(_, message):
+        forwarded.append(message)
+
+    client = FakeClient()
+    client.on_message = on_message
+    books = OrderBookManager()
+    books.attach(client)
+    books.subscribe("PERP_BTC_USDC")
+
+    def update(ts, prev_ts, bids):
+        return {
+            "topic": "PERP_BTC_USDC@orderbookupdate",
+            "ts": ts,
+            "data": {"symbol": "PERP_BTC_USDC", "prevTs": prev_ts, "asks": [], "bids": bids},
+        }
+
+    async def run():
+        await client.on_message(None, update(11, 9, [[100, 2]]))
+        await client.on_message(
+            None,
+            {
+                "event": "request",
+                "success": True,
+                "data": {"symbol": "PERP_BTC_USDC", "ts": 10, "asks": [{"price": 101, "quantity": 1}], "bids": [{"price": 100, "quantity": 1}]},
+            },
+        )
+        await client.on_message(None, update(13, 12, [[99, 1]]))
+        await client.on_message(None, {"topic": "PERP_BTC_USDC@bbo", "data": {}})
+
+    asyncio.run(run())
+    client.sent.should.equal(
+        [
+            ("subscribe", "PERP_BTC_USDC@orderbookupdate"),
+            ("request", "PERP_BTC_USDC"),
+            ("request", "PERP_BTC_USDC"),
+        ]
+    )
+    books.book("PERP_BTC_USDC").bids.top(1).should.equal([(100.0, 2.0)])
+    [m["topic"] for m in forwarded].should.equal(["PERP_BTC_USDC@bbo"])
@@ -0,0 +1,181 @@
+import asyncio
+import time
+
+from orderly_evm_connector.websocket.pool import WebsocketPublicPoolClient, shard_key
+from tests.simulator import ExchangeSimulator
+
+STREAMS = ("bbo", "trade", "orderbookupdate")
+
+
+class FakeSocketManager(object):
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, message):
+        self.sent.append(message)
+
+
+def _fake_pool(**kwargs):
+    pool = WebsocketPublicPoolClient(**kwargs)
+    for shard in pool.shards:
+        shard.socket_manager = FakeSocketManager()
+    return pool
+
+
+def _sent(pool, shard):
+    return [(m["event"], m["topic"]) for m in map(pool.json_codec.loads, shard.socket_manager.sent)]
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def test_pool_keeps_the_topics_of_a_symbol_on_one_balanced_shard():
+    pool = _fake_pool(shards=4, max_imbalance=6)
+    symbols = [f"PERP_TOKEN{i}_USDC" for i in range(40)]
+    for symbol in symbols:
+        for stream in STREAMS:
+            pool.subscribe({"id": pool.wss_id, "event": "subscribe", "topic": f"{symbol}@{stream}"})
+    pool.get_bbo(f"{symbols[0]}@bbo")
+    pool.get_bbos()
+
+    subscribed = [set(topic for _, topic in _sent(pool, shard)) for shard in pool.shards]
+    for symbol in symbols:
+        owners = [i for i, topics in enumerate(subscribed) if f"{symbol}@bbo" in topics]
+        owners.should.equal([pool.shard_of(f"{symbol}@trade")])
+        subscribed[owners[0]].should.contain(f"{symbol}@orderbookupdate")
+    sum(len(shard.socket_manager.sent) for shard in pool.shards).should.equal(121)
+    topics = [stats["topics"] for stats in pool.stats()]
+    sum(topics).should.equal(121)
+    (max(topics) - min(topics)).should.be.lower_than_or_equal_to(6)
+    shard_key("bbos").should.equal("bbos")
+
+
+def test_pool_rebalances_symbols_when_topics_are_added():
+    pool = _fake_pool(shards=2, max_imbalance=2)
+    symbols = [f"PERP_TOKEN{i}_USDC" for i in range(12)]
+    for symbol in symbols:
+        pool.get_bbo(f"{symbol}@bbo")
+    # empty shard 0, the next subscribe moves symbols back onto it
+    for symbol in symbols:
+        if pool.shard_of(symbol) == 0:
+            pool.unsubscribe({"id": pool.wss_id, "event": "unsubscribe", "topic": f"{symbol}@bbo"})
+    [stats["topics"] for stats in pool.stats()][0].should.equal(0)
+    pool.get_bbo("PERP_NEW_USDC@bbo")
+
+    topics = [stats["topics"] for stats in pool.stats()]
+    (max(topics) - min(topics)).should.be.lower_than_or_equal_to(2)
+    moved = [symbol for symbol in symbols if symbol in pool._moves]
+    moved.should_not.be.empty
+    for symbol in moved:
+        _sent(pool, pool.shards[0]).should.contain(("subscribe", f"{symbol}@bbo"))
+    # the old shard keeps the symbols until the new one acknowledged them
+    [event for event, _ in _sent(pool, pool.shards[1])].should_not.contain("unsubscribe")
+    [pool.shard_of(symbol) for symbol in moved].should.equal([1] * len(moved))
+
+    async def acknowledge():
+        for symbol in moved:
+            pool.shards[0].subscriptions.observe({"event": "subscribe", "success": True, "data": f"{symbol}@bbo"})
+        await pool._dispatch_message(0, None, {"event": "subscribe", "success": True})
+
+    asyncio.run(acknowledge())
+    for symbol in moved:
+        pool.shard_of(symbol).should.equal(0)
+        _sent(pool, pool.shards[1]).should.contain(("unsubscribe", f"{symbol}@bbo"))
+        f"{symbol}@bbo".should_not.be.within(pool.shards[1].subscriptions)
+
+
+def test_pool_keeps_frames_flowing_while_a_symbol_moves():
+    async def run():
+        received = {}
+
+        async def on_bbo(_, message):
+            received.setdefault(message["topic"], []).append(message["data"]["n"])
+
+        async with ExchangeSimulator(ping_interval=3600) as exchange:
+            pool = WebsocketPublicPoolClient(websocket_url=exchange.public_ws_url, shards=2, max_imbalance=100)
+            await pool.run(timeout=5)
+            pool.on("*@bbo", on_bbo)
+            candidates = (f"PERP_TOKEN{i}_USDC" for i in range(1000))
+            symbols = [symbol for symbol in candidates if pool.shard_of(symbol) == 1][:5]
+            topics = [f"{symbol}@bbo" for symbol in symbols[:4]]
+            for topic in topics:
+                pool.get_bbo(topic)
+            await pool.ensure_init(5)
+            published = []
+            stop = asyncio.Event()
+
+            async def publish():
+                n = 0
+                while not stop.is_set():
+                    n += 1
+                    for topic in topics:
+                        await exchange.publish(topic, {"n": n}, ts=n)
+                    published.append(n)
+                    await asyncio.sleep(0.002)
+
+            publisher = asyncio.create_task(publish())
+            await _wait_for(lambda: len(published) > 20)
+            pool.max_imbalance = 1
+            pool.get_bbo(f"{symbols[4]}@bbo")
+            moving = dict(pool._moves)
+            await _wait_for(lambda: not pool._moves and not pool._handoffs)
+            moved_at = len(published)
+            await _wait_for(lambda: len(published) > moved_at + 20)
+            stop.set()
+            await publisher
+            await _wait_for(lambda: all(len(received.get(t, ())) >= len(published) for t in topics))
+            owners = [pool.shard_of(topic) for topic in topics]
+            await pool.stop_async()
+            return moving, owners, received, published, topics
+
+    moving, owners, received, published, topics = asyncio.run(run())
+    len(moving).should.equal(1)
+    owners.count(0).should.equal(1)
+    for topic in topics:
+        received[topic].should.equal(published)
+
+
+def test_pool_merges_the_shards_into_one_dispatch_surface():
+    async def run():
+        received, responses = [], []
+
+        async def on_bbo(_, message):
+            received.append(message["topic"])
+
+        async def on_message(_, message):
+            responses.append(message)
+
+        symbols = [f"PERP_TOKEN{i}_USDC" for i in range(9)]
+        async with ExchangeSimulator(ping_interval=3600) as exchange:
+            pool = WebsocketPublicPoolClient(
+                websocket_url=exchange.public_ws_url, shards=3, max_imbalance=2, on_message=on_message
+            )
+            await pool.run(timeout=5)
+            pool.on("*@bbo", on_bbo)
+            for symbol in symbols:
+                pool.get_bbo(f"{symbol}@bbo")
+            await pool.ensure_init(5)
+            connections = len(exchange.connections)
+            for symbol in symbols:
+                await exchange.publish(f"{symbol}@bbo", {"symbol": symbol, "ask": 1.0, "bid": 0.9})
+            await _wait_for(lambda: len(received) == len(symbols))
+            stats = pool.stats()
+            await pool.stop_async()
+            return connections, received, responses, stats
+
+    connections, received, responses, stats = asyncio.run(run())
+    connections.should.equal(3)
+    sorted(received).should.equal(sorted(f"PERP_TOKEN{i}_USDC@bbo" for i in range(9)))
+    len(responses).should.equal(9)
+    [s["ready"] for s in stats].should.equal([True, True, True])
+    sum(s["topics"] for s in stats).should.equal(9)
+    # 9 subscribe responses and 9 bbo frames
+    sum(s["messages"] for s in stats).should.equal(18)
+    for s in stats:
+        s["subscriptions"].should.equal({"acked": s["topics"]})
+        s["messages_per_s"].should.be.greater_than(0)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+
+from orderly_evm_connector.error import WebsocketClientError
+from orderly_evm_connector.websocket.readiness import Readiness
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+from tests.simulator import ExchangeSimulator
+from tests.utils import generate_orderly_secret
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def test_readiness_waits_for_login_and_subscription_responses():
+    async def run():
+        readiness = Readiness()
+        readiness.set_connected()
+        readiness.expect_auth()
+        readiness.expect_ack("PERP_BTC_USDC@bbo")
+        readiness.expect_ack("PERP_ETH_USDC@bbo")
+        waiter = asyncio.ensure_future(readiness.wait(1))
+        await asyncio.sleep(0)
+        states = [readiness.waiting_for()]
+        readiness.observe({"event": "auth", "success": True})
+        readiness.observe({"event": "subscribe", "success": True, "data": "PERP_ETH_USDC@bbo"})
+        await asyncio.sleep(0)
+        states.append((waiter.done(), readiness.waiting_for()))
+        # responses without the topic answer the oldest subscription
+        readiness.observe({"event": "subscribe", "success": False, "errorMsg": "invalid topic"})
+        await asyncio.wait_for(waiter, 1)
+        return states, readiness.failed
+
+    states, failed = asyncio.run(run())
+    states[0].should.equal(["login", "PERP_BTC_USDC@bbo subscription", "PERP_ETH_USDC@bbo subscription"])
+    states[1].should.equal((False, ["PERP_BTC_USDC@bbo subscription"]))
+    failed.should.equal({"PERP_BTC_USDC@bbo": "invalid topic"})
+
+
+def test_readiness_raises_on_timeout_and_rejected_login():
+    async def run():
+        readiness = Readiness()
+        with pytest.raises(WebsocketClientError) as timeout:
+            await readiness.wait(0.05)
+        readiness.set_connected()
+        readiness.expect_auth()
+        readiness.observe({"event": "auth", "success": False, "errorMsg": "bad signature"})
+        with pytest.raises(WebsocketClientError) as rejected:
+            await readiness.wait(1)
+        return str(timeout.value), str(rejected.value)
+
+    timeout, rejected = asyncio.run(run())
+    timeout.should.equal("Websocket not ready after 0.05s, waiting for connection")
+    rejected.should.equal("Websocket login failed: bad signature")
+
+
+def test_run_returns_once_connected_without_waiting_for_a_message():
+    async def run():
+        # no server pings, the previous polling needed a first message
+        async with ExchangeSimulator(ping_interval=3600) as exchange:
+            client = OrderlyWebsocketClient(exchange.public_ws_url, async_mode=True)
+            started = time.perf_counter()
+            await client.run(timeout=5)
+            elapsed = time.perf_counter() - started
+            await client.stop_async()
+            return elapsed
+
+    asyncio.run(run()).should.be.lower_than(0.5)
+
+
+def test_private_run_waits_for_the_login_and_fails_on_rejection():
+    async def run():
+        async with ExchangeSimulator(ping_interval=3600) as exchange:
+            account = exchange.add_account()
+
+            def client(orderly_secret):
+                return OrderlyWebsocketClient(
+                    exchange.private_ws_url,
+                    orderly_account_id=account.account_id,
+                    orderly_key=account.orderly_key,
+                    orderly_secret=orderly_secret,
+                    private=True,
+                    async_mode=True,
+                )
+
+            accepted = client(account.orderly_secret)
+            await accepted.run(timeout=5)
+            authenticated = accepted.socket_manager.readiness.authenticated.is_set()
+            await accepted.stop_async()
+            rejected = client(generate_orderly_secret()[0])
+            with pytest.raises(WebsocketClientError) as error:
+                await rejected.run(timeout=5)
+            await rejected.stop_async()
+            return authenticated, str(error.value)
+
+    authenticated, error = asyncio.run(run())
+    authenticated.should.be.true
+    error.should.equal("Websocket login failed: authentication failed")
+
+
+def test_reconnect_is_ready_once_replayed_subscriptions_are_acknowledged():
+    async def run():
+        async with ExchangeSimulator(ping_interval=3600) as exchange:
+            client = OrderlyWebsocketClient(exchange.public_ws_url, async_mode=True)
+            await client.run(timeout=5)
+            client.subscribe({"id": client.wss_id, "event": "subscribe", "topic": "PERP_BTC_USDC@bbo"})
+            await client.socket_manager.ensure_init(5)
+            first = exchange.subscribers("PERP_BTC_USDC@bbo")
+            await exchange.disconnect_all()
+            await _wait_for(lambda: exchange.connections and exchange.connections[0] is not first[0])
+            await client.socket_manager.ensure_init(5)
+            second = exchange.subscribers("PERP_BTC_USDC@bbo")
+            await client.stop_async()
+            return first, second
+
+    first, second = asyncio.run(run())
+    len(first).should.equal(1)
+    len(second).should.equal(1)
+    second[0].should_not.be(first[0])
@@ -0,0 +1,166 @@
+import asyncio
+import json
+
+import websockets
+from orderly_evm_connector.error import ParameterArgumentError, ParameterValueError
+from orderly_evm_connector.websocket.async_websocket_manager import AsyncWebsocketManager
+from orderly_evm_connector.websocket.receive_queue import (
+    CONFLATE,
+    DROP_OLDEST,
+    ReceiveQueue,
+)
+
+
+def drain(queue):
+    messages = []
+    while queue.depth:
+        messages.append(queue._queues[0].get_nowait())
+    return messages
+
+
+def test_unknown_policy_is_rejected():
+    ReceiveQueue.when.called_with(10, "spill").should.throw(ParameterValueError)
+
+
+def test_drop_oldest_keeps_newest_messages():
+    async def run():
+        queue = ReceiveQueue(3, DROP_OLDEST)
+        for i in range(5):
+            await queue.put({"topic": "PERP_BTC_USDC@bbo", "i": i})
+        return queue
+
+    queue = asyncio.run(run())
+    queue.stats().should.equal({"depth": 3, "max_depth": 3, "dropped": 2, "conflated": 0})
+    [m["i"] for m in drain(queue)].should.equal([2, 3, 4])
+
+
+def test_conflate_replaces_pending_state_but_not_deltas():
+    async def run():
+        queue = ReceiveQueue(10, CONFLATE)
+        await queue.put({"topic": "PERP_BTC_USDC@bbo", "i": 0})
+        await queue.put({"topic": "PERP_BTC_USDC@orderbookupdate", "i": 1})
+        await queue.put({"topic": "PERP_ETH_USDC@bbo", "i": 2})
+        await queue.put({"topic": "PERP_BTC_USDC@bbo", "i": 3})
+        await queue.put({"topic": "PERP_BTC_USDC@orderbookupdate", "i": 4})
+        await queue.put({"event": "subscribe", "i": 5})
+        return queue
+
+    queue = asyncio.run(run())
+    queue.conflated.should.equal(1)
+    [m["i"] for m in drain(queue)].should.equal([3, 1, 2, 4, 5])
+
+
+def test_shards_keep_each_topic_on_one_consumer():
+    async def run():
+        queue = ReceiveQueue(30, DROP_OLDEST, shards=4)
+        topics = [f"PERP_{coin}_USDC@orderbookupdate" for coin in ("BTC", "ETH", "SOL", "SUI", "WOO", "ARB")]
+        for i in range(24):
+            await queue.put({"topic": topics[i % len(topics)], "i": i})
+        await queue.put({"event": "subscribe", "i": 24})
+        shards = {}
+        for shard in range(4):
+            while queue._queues[shard].qsize():
+                message = await queue.get(shard)
+                queue.task_done(shard)
+                shards.setdefault(message.get("topic"), set()).add(shard)
+        return queue, topics, shards
+
+    queue, topics, shards = asyncio.run(run())
+    queue.depth.should.equal(0)
+    queue.max_depth.should.equal(25)
+    for topic in topics:
+        shards[topic].should.equal({queue.shard({"topic": topic})})
+    shards[None].should.equal({0})
+    len(set().union(*shards.values())).should.be.greater_than(1)
+    ReceiveQueue.when.called_with(10, DROP_OLDEST, shards=0).should.throw(ParameterArgumentError)
+
+
+def test_several_consumers_keep_the_order_within_a_topic():
+    topics = [f"PERP_{coin}_USDC@orderbookupdate" for coin in ("BTC", "ETH", "SOL", "SUI", "WOO", "ARB")]
+    handled, in_flight, peak = {}, [], []
+
+    async def server(ws):
+        for i in range(60):
+            await ws.send(json.dumps({"topic": topics[i % len(topics)], "i": i}))
+        await ws.wait_closed()
+
+    async def on_message(_, message):
+        in_flight.append(message["topic"])
+        peak.append(len(in_flight))
+        # earlier messages sleep longer, two of a topic handled at once would swap
+        await asyncio.sleep((60 - message["i"]) / 10000)
+        handled.setdefault(message["topic"], []).append(message["i"])
+        in_flight.remove(message["topic"])
+
+    async def run():
+        async with websockets.serve(server, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            manager = AsyncWebsocketManager(f"ws://127.0.0.1:{port}", on_message=on_message, consumers=4)
+            task = asyncio.create_task(manager.run())
+            while sum(len(i) for i in handled.values()) < 60:
+                await asyncio.sleep(0.01)
+            await manager.close()
+            await task
+
+    asyncio.run(run())
+    for offset, topic in enumerate(topics):
+        handled[topic].should.equal(list(range(offset, 60, len(topics))))
+    max(peak).should.be.greater_than(1)
+
+
+def test_slow_callback_does_not_delay_pong():
+    events = []
+
+    async def server(ws):
+        for i in range(5):
+            await ws.send(json.dumps({"topic": "PERP_BTC_USDC@bbo", "i": i}))
+        await ws.send(json.dumps({"event": "ping"}))
+        events.append(("pong", json.loads(await ws.recv())["event"]))
+        await ws.wait_closed()
+
+    async def on_message(_, message):
+        await asyncio.sleep(0.05)
+        events.append(("message", message["i"]))
+
+    async def run():
+        async with websockets.serve(server, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            manager = AsyncWebsocketManager(f"ws://127.0.0.1:{port}", on_message=on_message)
+            task = asyncio.create_task(manager.run())
+            while len(events) < 6:
+                await asyncio.sleep(0.01)
+            await manager.close()
+            await task
+
+    asyncio.run(run())
+    events[0].should.equal(("pong", "pong"))
+    [i for kind, i in events[1:]].should.equal([0, 1, 2, 3, 4])
+
+
+def test_close_stops_consumers_when_the_peer_closed_first():
+    connections = []
+
+    async def refuse_reconnects(path, headers):
+        connections.append(path)
+        if len(connections) > 1:
+            return 403, [], b""
+
+    async def server(ws):
+        await ws.send(json.dumps({"topic": "PERP_BTC_USDC@bbo"}))
+        await ws.close(1011)
+
+    async def run():
+        async with websockets.serve(server, "127.0.0.1", 0, process_request=refuse_reconnects) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            manager = AsyncWebsocketManager(f"ws://127.0.0.1:{port}", max_retries=0)
+            await manager.run()
+            await manager.close()
+            await asyncio.sleep(0)
+            consumers = [
+                task for task in asyncio.all_tasks() if task.get_coro().__qualname__.endswith("_consume")
+            ]
+            return manager.ws.closed, consumers
+
+    closed, consumers = asyncio.run(run())
+    closed.should.be.true
+    consumers.should.be.empty
@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+from orderly_evm_connector.websocket.subscriptions import ACKED, FAILED, PENDING, SubscriptionRegistry
+from orderly_evm_connector.websocket.websocket_api import WebsocketPublicAPIClient
+from orderly_evm_connector.websocket.websocket_client import OrderlyWebsocketClient
+from tests.simulator import ExchangeSimulator
+
+
+def _subscribe(topic):
+    return {"id": "1", "event": "subscribe", "topic": topic}
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+def test_registry_tracks_topic_states_from_subscribe_responses():
+    registry = SubscriptionRegistry()
+    registry.add(_subscribe("PERP_BTC_USDC@bbo")).should.be.true
+    registry.add(_subscribe("PERP_ETH_USDC@bbo")).should.be.true
+    registry.add(_subscribe("PERP_BTC_USDC@bbo")).should.be.false
+    registry.observe({"event": "subscribe", "success": True, "data": "PERP_ETH_USDC@bbo"})
+    # responses without the topic answer the oldest pending subscription
+    registry.observe({"event": "subscribe", "success": False, "errorMsg": "invalid topic"})
+    registry.state("PERP_BTC_USDC@bbo").should.equal(FAILED)
+    registry.get("PERP_BTC_USDC@bbo").error.should.equal("invalid topic")
+    registry.topics(ACKED).should.equal(["PERP_ETH_USDC@bbo"])
+    registry.add(_subscribe("PERP_ETH_USDC@bbo")).should.be.false
+    # a failed topic is sent again
+    registry.add(_subscribe("PERP_BTC_USDC@bbo")).should.be.true
+    registry.states().should.equal({PENDING: 1, ACKED: 1})
+    registry.replay().should.equal([_subscribe("PERP_BTC_USDC@bbo"), _subscribe("PERP_ETH_USDC@bbo")])
+    registry.states().should.equal({PENDING: 2})
+    registry.remove("PERP_ETH_USDC@bbo")
+    list(registry).should.equal(["PERP_BTC_USDC@bbo"])
+
+
+def test_client_sends_each_topic_once_and_replays_in_one_batch():
+    class FakeSocketManager(object):
+        def __init__(self):
+            self.sent, self.batches = [], []
+
+        def send_message(self, message):
+            self.sent.append(message)
+
+        def send_messages(self, messages):
+            self.batches.append(messages)
+
+    client = WebsocketPublicAPIClient()
+    client.socket_manager = FakeSocketManager()
+    client.get_bbo("PERP_BTC_USDC@bbo")
+    client.get_bbo("PERP_BTC_USDC@bbo")
+    client.get_trade("PERP_BTC_USDC@trade")
+    client.get_trade("PERP_BTC_USDC@trade")
+    client.unsubscribe({"id": "2", "event": "unsubscribe", "topic": "PERP_BTC_USDC@bbo"})
+    len(client.socket_manager.sent).should.equal(3)
+    list(client.subscriptions).should.equal(["PERP_BTC_USDC@trade"])
+    client.on_socket_open(client.socket_manager)
+    len(client.socket_manager.batches).should.equal(1)
+    [client.json_codec.loads(m)["topic"] for m in client.socket_manager.batches[0]].should.equal(
+        ["PERP_BTC_USDC@trade"]
+    )
+
+
+def test_reconnect_replays_each_topic_once_and_records_rejections():
+    async def run():
+        responses = []
+
+        async def on_message(_, message):
+            if message.get("event") == "subscribe":
+                responses.append(message)
+
+        async with ExchangeSimulator(ping_interval=3600) as exchange:
+            client = OrderlyWebsocketClient(exchange.public_ws_url, on_message=on_message, async_mode=True)
+            await client.run(timeout=5)
+            for _ in range(3):
+                for topic in ("PERP_BTC_USDC@bbo", "PERP_ETH_USDC@trade", "executionreport"):
+                    client.subscribe({"id": client.wss_id, "event": "subscribe", "topic": topic})
+            await _wait_for(lambda: len(responses) == 3)
+            states = dict(client.subscriptions.states())
+            first = exchange.connections[0]
+            await exchange.disconnect_all()
+            await _wait_for(lambda: exchange.connections and exchange.connections[0] is not first)
+            await _wait_for(lambda: len(responses) == 6)
+            replayed = [len(exchange.subscribers(t)) for t in ("PERP_BTC_USDC@bbo", "PERP_ETH_USDC@trade")]
+            failed = client.subscriptions.get("executionreport").error
+            await client.stop_async()
+            return states, replayed, failed
+
+    states, replayed, failed = asyncio.run(run())
+    states.should.equal({ACKED: 2, FAILED: 1})
+    replayed.should.equal([1, 1])
+    failed.should.equal("not authenticated")
+
+
+def test_subscribe_responses_are_observed_ahead_of_a_lossy_receive_queue():
+    async def run():
+        blocked = asyncio.Event()
+
+        async def on_message(_, message):
+            # holds the only consumer, later frames are dropped from the queue
+            await blocked.wait()
+
+        async with ExchangeSimulator(ping_interval=3600) as exchange:
+            client = OrderlyWebsocketClient(
+                exchange.public_ws_url,
+                on_message=on_message,
+                async_mode=True,
+                receive_queue_size=1,
+                overflow_policy="drop_oldest",
+            )
+            await client.run(timeout=5)
+            for symbol in ("PERP_BTC_USDC", "PERP_ETH_USDC", "PERP_SOL_USDC"):
+                for stream in ("bbo", "trade"):
+                    client.subscribe({"id": client.wss_id, "event": "subscribe", "topic": f"{symbol}@{stream}"})
+            await client.socket_manager.ensure_init(5)
+            states = client.subscriptions.states()
+            dropped = client.socket_manager.receive_queue.dropped
+            blocked.set()
+            await client.stop_async()
+            return states, dropped
+
+    states, dropped = asyncio.run(run())
+    dropped.should.be.greater_than(0)
+    states.should.equal({ACKED: 6})